@@ -0,0 +1,87 @@
+"""
+Benchmark of the filters that are applied along an axis (LowPassFilter, GradientFilter, and ShiftFilter).
+
+The present implementation in lys is compared with the previous one, which called the scipy/numpy function for each 1D line by dask.array.apply_along_axis.
+The results of both implementations are checked to be identical for a small cube before the timings are measured.
+
+Usage::
+
+    python benchmarks/filters_along_axis.py            # 512x512x512 float64 cube
+    python benchmarks/filters_along_axis.py --size 256
+
+The computation is done by the default (threaded) scheduler of dask. Each result is reduced by sum() so that it is not kept in memory.
+"""
+
+import time
+import argparse
+
+import numpy as np
+import dask
+import dask.array as da
+from scipy import signal, ndimage
+
+from lys import DaskWave, filters
+
+
+def _previousLowPass(wave, order, cutoff, axis):
+    b, a = signal.butter(order, cutoff)
+    data = wave.data
+    return da.apply_along_axis(lambda x, b, a: signal.filtfilt(b, a, x), axis, data, b, a, dtype=data.dtype, shape=(data.shape[axis],))
+
+
+def _previousGradient(wave, axis):
+    def f(d, x):
+        if len(d) == 1:
+            return x
+        return np.gradient(d, x)
+    return da.apply_along_axis(f, axis, wave.data, wave.getAxis(axis))
+
+
+def _previousShift(wave, shift):
+    data = wave.data
+    for ax, s in enumerate(shift):
+        data = da.apply_along_axis(ndimage.shift, ax, data.astype(float), s, dtype=float, shape=(data.shape[ax],), order=1, cval=0)
+    return data
+
+
+def _cases(axis, ndim):
+    shift = [0] * ndim
+    shift[axis] = 1.5
+    return [
+        ("LowPassFilter(3, 0.1)", lambda w: _previousLowPass(w, 3, 0.1, axis), filters.LowPassFilter(3, 0.1, [axis])),
+        ("GradientFilter", lambda w: _previousGradient(w, axis), filters.GradientFilter([axis])),
+        ("ShiftFilter(1.5)", lambda w: _previousShift(w, shift), filters.ShiftFilter(shift)),
+    ]
+
+
+def _check(size=32):
+    data = np.random.rand(size, size, size)
+    for name, previous, f in _cases(2, 3):
+        old = previous(DaskWave(data)).compute()
+        new = f.execute(DaskWave(data)).data.compute()
+        np.testing.assert_allclose(new, old, atol=1e-12, err_msg=name)
+
+
+def _measure(func):
+    start = time.perf_counter()
+    func().sum().compute()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=512, help="The length of each side of the cube.")
+    args = parser.parse_args()
+
+    _check()
+    data = np.random.rand(args.size, args.size, args.size)
+    print("{0}^3 float64 cube, filtered along the last axis, dask scheduler: {1}".format(args.size, dask.config.get("scheduler", "threads")))
+    print("{0:<24}{1:>12}{2:>12}".format("filter", "previous(s)", "present(s)"))
+    for name, previous, f in _cases(2, 3):
+        told = _measure(lambda: previous(DaskWave(data)))
+        tnew = _measure(lambda: f.execute(DaskWave(data)).data)
+        print("{0:<24}{1:>12.2f}{2:>12.2f}".format(name, told, tnew))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,8 @@ from . import Qt
 from . import resources
 from . import errors
 from .functions import home, load, edit, display, append, registerFileLoader, loadableFiles, registerFittingFunction, frontCanvas, multicut, lysPath
-from .core import SettingDict, Wave, DaskWave
+from .core import SettingDict, Wave, DaskWave, LinearAxis
+from . import cluster
 
 from . import filters
 from .filters import filtersGUI
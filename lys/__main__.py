@@ -41,6 +41,8 @@ loadWindow.setPixmap(splash["start"])
 parser = argparse.ArgumentParser(prog='lys', usage="python -m lys (options)", add_help=True)
 # Launch local cluster
 parser.add_argument("-n", "--ncore", help="Launch local cluster with NCORE", type=int, required=False)
+parser.add_argument("--memory", help="Memory limit of each worker of local cluster such as 4GB", required=False)
+parser.add_argument("--adaptive", help="Change the number of workers of local cluster (up to NCORE) according to the load", action="store_true")
 # Plugins
 parser.add_argument("-p", "--plugin", help="Import plugins", nargs="*", required=False)
 # NoPlugins
@@ -58,7 +60,12 @@ if args.clean:
 # Launch local cluster
 if args.ncore is not None:
     loadWindow.setPixmap(splash["dask"])
-    lys.DaskWave.initWorkers(args.ncore)
+    try:
+        lys.cluster.start(n_workers=args.ncore, memory_limit="auto" if args.memory is None else args.memory)
+        if args.adaptive:
+            lys.cluster.adapt(maximum=args.ncore)
+    except Exception:
+        print("[cluster] failed to initialize local cluster for parallel computing.")
 
 # Create main window
 lys.glb.createMainWindow(show=False)
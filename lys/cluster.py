@@ -0,0 +1,179 @@
+"""
+Local dask cluster for parallel computing.
+
+When the cluster is started by :func:`start`, dask computations in lys (such as filters and MultiCut) are executed by the workers of the cluster.
+The cluster can be started, stopped, and resized at runtime from the shell or from the Cluster tab of the main window.
+
+The memory used by each worker is limited by *memory_limit*. When a worker uses more memory than the thresholds given by :func:`start`,
+the data held by the worker is spilled to disk, new tasks are paused, and finally the worker is restarted.
+Therefore lys can share a workstation with other jobs without being killed by the operating system.
+
+When :func:`adapt` is called, the number of workers is automatically changed according to the load of the cluster.
+
+Example::
+
+    from lys import cluster
+
+    cluster.start(n_workers=2, memory_limit="4GB")
+    cluster.resize(4)                       # add two workers
+    cluster.adapt(minimum=1, maximum=8)     # the number of workers follows the load
+    print(cluster.status())
+    cluster.stop()
+"""
+
+import os
+import atexit
+
+import dask
+
+from lys import home
+
+_cluster = None
+_client = None
+_adaptive = None
+_atexit = False
+
+
+def start(n_workers=None, threads_per_worker=1, processes=True, memory_limit="auto", directory=None, target=0.6, spill=0.7, pause=0.8, terminate=0.95):
+    """
+    Start local cluster. If the cluster is running, it is stopped and started again.
+
+    The thresholds *target*, *spill*, *pause*, and *terminate* are fractions of *memory_limit* (see the documentation of dask.distributed).
+    Each of them can be False to disable the corresponding action.
+
+    Args:
+        n_workers(int): The number of workers. If it is None, it is determined by dask from the number of cores.
+        threads_per_worker(int): The number of threads of each worker.
+        processes(bool): If True, workers are launched as processes. Otherwise workers are threads in the lys process.
+        memory_limit(str or int or float): The memory limit of each worker such as "4GB". The float value between 0 and 1 is the fraction of the system memory. "auto" means system memory / n_workers.
+        directory(str): The directory to which workers spill data. If it is None, home()/.lys/dask is used.
+        target(float): Data is spilled to disk when the managed memory of a worker exceeds this fraction.
+        spill(float): Data is spilled to disk when the process memory of a worker exceeds this fraction.
+        pause(float): Worker stops executing new tasks when the process memory exceeds this fraction.
+        terminate(float): Worker is restarted when the process memory exceeds this fraction.
+
+    Returns:
+        dask.distributed.Client: The client connected to the cluster.
+    """
+    global _cluster, _client, _atexit
+    from dask.distributed import Client, LocalCluster
+    stop()
+    if directory is None:
+        directory = home() + "/.lys/dask"
+    os.makedirs(directory, exist_ok=True)
+    # set globally so that workers added later by resize and adapt use the same thresholds
+    dask.config.set({"distributed.worker.memory.target": target, "distributed.worker.memory.spill": spill, "distributed.worker.memory.pause": pause, "distributed.worker.memory.terminate": terminate})
+    _cluster = LocalCluster(n_workers=n_workers, threads_per_worker=threads_per_worker, processes=processes, memory_limit=memory_limit, local_directory=directory)
+    _client = Client(_cluster)
+    if not _atexit:
+        atexit.register(stop)
+        _atexit = True
+    print("[cluster] Local cluster launched:", _client)
+    return _client
+
+
+def stop():
+    """
+    Stop local cluster. Nothing is done if the cluster is not running.
+    """
+    global _cluster, _client
+    if _client is None:
+        return
+    print("[cluster] Closing local cluster...")
+    _stopAdaptive()
+    _client.close()
+    _cluster.close()
+    _cluster = _client = None
+    print("[cluster] Closing local cluster finished")
+
+
+def resize(n_workers):
+    """
+    Change the number of workers. Adaptive scaling by :func:`adapt` is disabled.
+
+    Args:
+        n_workers(int): The number of workers.
+    """
+    _checkRunning()
+    _stopAdaptive()
+    _cluster.scale(n_workers)
+
+
+def adapt(minimum=1, maximum=None):
+    """
+    Change the number of workers automatically according to the load of the cluster.
+
+    Workers are added when many tasks are waiting, and removed when they are idle. Data held by removed workers is moved to the other workers.
+    Call :func:`resize` to stop adaptive scaling.
+
+    Args:
+        minimum(int): The minimum number of workers.
+        maximum(int): The maximum number of workers. If it is None, the number of cores is used.
+    """
+    global _adaptive
+    _checkRunning()
+    _stopAdaptive()
+    if maximum is None:
+        maximum = os.cpu_count()
+    _adaptive = _cluster.adapt(minimum=minimum, maximum=maximum)
+
+
+def isRunning():
+    """
+    Check if the local cluster is running.
+
+    Returns:
+        bool: True if the cluster is running.
+    """
+    return _client is not None
+
+
+def isAdaptive():
+    """
+    Check if the number of workers is changed by :func:`adapt`.
+
+    Returns:
+        bool: True if adaptive scaling is enabled.
+    """
+    return _adaptive is not None
+
+
+def client():
+    """
+    Returns the client connected to the local cluster.
+
+    Returns:
+        dask.distributed.Client: The client. None is returned if the cluster is not running.
+    """
+    return _client
+
+
+def status():
+    """
+    Returns the status of the local cluster.
+
+    Returns:
+        dict: The number of workers and threads, memory usage and limit in bytes, whether the scaling is adaptive, and the link to the dashboard. None is returned if the cluster is not running.
+    """
+    if _client is None:
+        return None
+    workers = _client.scheduler_info()["workers"].values()
+    return {
+        "workers": len(workers),
+        "threads": sum(w["nthreads"] for w in workers),
+        "memory": sum(w["metrics"]["memory"] for w in workers),
+        "memory_limit": sum(w["memory_limit"] for w in workers),
+        "adaptive": isAdaptive(),
+        "dashboard": _client.dashboard_link}
+
+
+def _checkRunning():
+    if _client is None:
+        raise RuntimeError("Local cluster is not running. Call cluster.start() first.")
+
+
+def _stopAdaptive():
+    global _adaptive
+    if _adaptive is not None:
+        _adaptive.stop()
+        _adaptive = None
@@ -1,11 +1,15 @@
 import os
 import io
+import struct
+import zipfile
 import weakref
-import atexit
+import contextvars
 
 import numpy as np
 import dask.array as da
+from numpy.lib.mixins import NDArrayOperatorsMixin
 
+from lys import serialization
 from lys.Qt import QtCore
 
 
@@ -37,10 +41,7 @@ class SettingDict(dict):
         if file is None:
             return
         if os.path.exists(file):
-            with open(file, 'r') as f:
-                data = eval(f.read())
-            for key, item in data.items():
-                self[key] = item
+            self.update(serialization.load(file))
 
     def __setitem__(self, key, value):
         super().__setitem__(key, value)
@@ -60,10 +61,7 @@ class SettingDict(dict):
             file = self.__file
         if file is None:
             return
-        file = os.path.abspath(file)
-        os.makedirs(os.path.dirname(file), exist_ok=True)
-        with open(file, 'w') as f:
-            f.write(str(self))
+        serialization.dump(dict(self), file)
 
 
 class _WaveDataDescriptor:
@@ -83,14 +81,13 @@ class _WaveDataDescriptor:
 
         w.data = [2,3,4]
         print(w.data)     # [2,3,4]
+
+    The assigned value is always copied. Use :meth:`Wave.setData` with *copy* = False to wrap an existing array without copying.
     """
 
     def __set__(self, instance, value):
         """set data and update axes"""
-        instance._data = np.array(value)
-        if hasattr(instance, "axes"):
-            instance.axes._update(instance._data)
-        instance.update()
+        instance.setData(value)
 
     def __get__(self, instance, objtype=None):
         return instance._data
@@ -134,6 +131,117 @@ class _WaveAxesDescriptor:
         return instance._axes
 
 
+class LinearAxis(NDArrayOperatorsMixin):
+    """
+    Evenly spaced axis that stores only *start*, *step*, and the number of points *n*.
+
+    *LinearAxis* behaves as read-only 1D numpy array of start + step * np.arange(n), which is materialized only when required.
+    Slicing and integer indexing return the values without materialization, and numpy functions and operators are applied to the materialized array.
+
+    Default axes of :class:`Wave` and :class:`DaskWave` are *LinearAxis*. Set a new axis to change the values, instead of modifying the axis in place.
+    Note that *LinearAxis* is not a subclass of numpy.ndarray, so isinstance(w.x, np.ndarray) is False for default axes. Use np.asarray(w.x) when numpy.ndarray is required.
+
+    Args:
+        start (float): The first value of the axis.
+        step (float): The interval of the axis.
+        n (int): The number of points.
+
+    Example::
+
+        from lys import Wave
+        from lys.core import LinearAxis
+
+        w = Wave(np.ones([3, 4]), LinearAxis(1, 0.5, 3))
+        print(repr(w.x))        # LinearAxis(start=1.0, step=0.5, n=3)
+        print(repr(w.x[1:]))    # LinearAxis(start=1.5, step=0.5, n=2), slicing does not materialize the axis
+        print(w.y * 2)          # [0, 2, 4, 6], operators return numpy array
+    """
+
+    def __init__(self, start, step, n):
+        self.start = float(start)
+        self.step = float(step)
+        self.n = int(n)
+
+    @property
+    def shape(self):
+        return (self.n,)
+
+    @property
+    def ndim(self):
+        return 1
+
+    @property
+    def size(self):
+        return self.n
+
+    @property
+    def dtype(self):
+        return np.dtype(float)
+
+    @property
+    def flags(self):
+        res = np.asarray(self)
+        res.flags.writeable = False
+        return res.flags
+
+    def __len__(self):
+        return self.n
+
+    def __array__(self, dtype=None, copy=None):
+        res = self.start + self.step * np.arange(self.n)
+        return res if dtype is None else res.astype(dtype)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        inputs = [np.asarray(x) if isinstance(x, LinearAxis) else x for x in inputs]
+        return getattr(ufunc, method)(*inputs, **kwargs)
+
+    def __array_function__(self, func, types, args, kwargs):
+        def conv(x):
+            if isinstance(x, LinearAxis):
+                return np.asarray(x)
+            if isinstance(x, tuple):
+                return tuple(conv(item) for item in x)
+            if isinstance(x, list):  # including subclasses such as WaveAxes
+                return [conv(item) for item in x]
+            return x
+        return func(*conv(args), **{k: conv(v) for k, v in kwargs.items()})
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            r = range(self.n)[key]
+            return LinearAxis(self.start + self.step * r.start, self.step * r.step, len(r))
+        if isinstance(key, (int, np.integer)):
+            return np.float64(self.start + self.step * range(self.n)[key])
+        if isinstance(key, (list, np.ndarray)):
+            key = np.asarray(key)
+            if key.dtype.kind in "iu":
+                if ((key < -self.n) | (key >= self.n)).any():
+                    raise IndexError("index out of bounds for axis with size " + str(self.n))
+                return self.start + self.step * np.where(key < 0, key + self.n, key)
+        return np.asarray(self)[key]
+
+    def __setitem__(self, key, value):
+        raise ValueError("LinearAxis is read-only. Set a new axis instead.")
+
+    def __iter__(self):
+        return iter(np.asarray(self))
+
+    def __getattr__(self, key):
+        # ndarray methods such as astype, min, and tolist are applied to the materialized array.
+        if key.startswith("__"):
+            raise AttributeError(key)
+        return getattr(np.asarray(self), key)
+
+    def __reduce__(self):
+        return LinearAxis, (self.start, self.step, self.n)
+
+    def __str__(self):
+        return str(np.asarray(self))
+
+    def __repr__(self):
+        return "LinearAxis(start={0}, step={1}, n={2})".format(self.start, self.step, self.n)
+
+
 class WaveAxes(list):
     """Axes in :class:`Wave` and :class:`DaskWave` class
 
@@ -152,6 +260,7 @@ class WaveAxes(list):
     def __init__(self, parent, axes, force=False):
         super().__init__()
         self._parent = weakref.ref(parent)
+        self._lookup = {}
         for d in range(parent.data.ndim):
             if force:
                 self.append(axes[d])
@@ -179,10 +288,12 @@ class WaveAxes(list):
         return self[dim]
 
     def __createValidAxis(self, val, dim):
-        val = np.array(val)
         data = self._parent().data
+        if isinstance(val, LinearAxis) and len(val) == data.shape[dim]:
+            return val
+        val = np.array(val)
         if val.ndim == 0:
-            return np.arange(data.shape[dim]).astype(float)
+            return LinearAxis(0, 1, data.shape[dim])
         else:
             if data.shape[dim] == val.shape[0]:
                 return val
@@ -203,12 +314,15 @@ class WaveAxes(list):
         if *axis* is not None, then pos is interpreted as position in axis-th dimension.
         When *axis* = 1, *pos* = (y1, y2, y3, ...) is translated to indice (n1, n2, n3, ...)
 
+        Monotonic axes are searched by bisection (evenly spaced axes by arithmetic), and numpy array *pos* is translated at once.
+        Axes that are modified in place should be set again (e.g. w.x = w.x) to refresh the cached properties.
+
         Args:
             pos (numpy.ndarray or float): The position that is translted to indice.
             axis (None or int): see above description
 
         Returns:
-            tuple or int: The indice corresponding to pos.
+            tuple or int or numpy.ndarray: The indice corresponding to pos. numpy.ndarray is returned if *pos* is numpy.ndarray and *axis* is specified.
 
         Example::
 
@@ -219,14 +333,23 @@ class WaveAxes(list):
             w.posToPoint((2,4))             # (1,1), position (x,y)=(2,4) corresponds index (1,1)
             w.posToPoint((1,2,3), axis=0)   # (0,1,2), position (x1, x2, x3 = 1,2,3) in the 0th dimension correspoinds index (0,1,2)
             w.posToPoint(2, axis=0)         # 1, position x = 2  correspoinds index 1 in 0th dimension
+            w.posToPoint(np.array([1, 3]), axis=0)    # array([0, 2]), numpy array is translated at once
         """
         if axis is None:
-            axes = [self.getAxis(d) for d in range(len(self))]
-            return tuple(np.abs(ax - val).argmin() for val, ax in zip(pos, axes))
-        else:
-            if hasattr(pos, "__iter__"):
-                return tuple(self.posToPoint(p, axis) for p in pos)
-            return int(np.abs(self.getAxis(axis) - pos).argmin())
+            return tuple(self.posToPoint(val, d) for d, val in enumerate(pos))
+        ind = self.__nearest(axis, np.asarray(pos, dtype=float))
+        if isinstance(pos, np.ndarray):
+            return ind
+        elif hasattr(pos, "__iter__"):
+            return tuple(int(i) for i in ind)
+        return int(ind)
+
+    def __nearest(self, axis, pos):
+        # Axis properties are cached for each axis object. Replacing the axis invalidates the cache.
+        ax = self.getAxis(axis)
+        if self._lookup.get(axis, (None,))[0] is not ax:
+            self._lookup[axis] = (ax, _axisLookup(ax))
+        return _nearestIndex(ax, self._lookup[axis][1], pos)
 
     def pointToPos(self, indice, axis=None):
         """
@@ -302,6 +425,47 @@ class WaveAxes(list):
         self[2] = value
 
 
+def _axisLookup(ax):
+    """Classify axis as "even", "ascending", "descending" or None (arbitrary) for posToPoint."""
+    if isinstance(ax, LinearAxis) and len(ax) > 1 and ax.step != 0:
+        return "even", ax.start, ax.step
+    if ax.ndim != 1 or len(ax) < 2 or not np.isrealobj(ax):
+        return None
+    diff = np.diff(ax)
+    if (diff > 0).all():
+        order = "ascending"
+    elif (diff < 0).all():
+        order = "descending"
+    else:
+        return None
+    step = (ax[-1] - ax[0]) / (len(ax) - 1)
+    if np.abs(ax - (ax[0] + step * np.arange(len(ax)))).max() < abs(step) * 1e-6:
+        return "even", ax[0], step
+    return (order,)
+
+
+def _nearestIndex(ax, lookup, pos):
+    """Return indices of *ax* nearest to *pos*, equivalent to np.abs(ax - p).argmin() for each p in *pos*."""
+    if lookup is None:
+        return np.array([np.abs(ax - p).argmin() for p in pos.ravel()], dtype=int).reshape(pos.shape)
+    n = len(ax)
+    if lookup[0] == "even":
+        ind = np.ceil((pos - lookup[1]) / lookup[2] - 0.5)
+    elif lookup[0] == "ascending":
+        ind = np.searchsorted(ax, pos)
+    else:
+        ind = n - np.searchsorted(ax[::-1], pos, side="right")
+    ind = np.clip(np.nan_to_num(ind), 1, n - 1).astype(int)
+    # The nearest point is ind - 1 or ind (or ind + 1 when ind is estimated arithmetically with rounding error).
+    # Ties are resolved to the smaller index, as argmin does.
+    res = ind
+    if lookup[0] == "even":
+        hi = np.minimum(ind + 1, n - 1)
+        res = np.where(np.abs(ax[hi] - pos) < np.abs(ax[ind] - pos), hi, ind)
+    res = np.where(np.abs(ax[ind - 1] - pos) <= np.abs(ax[res] - pos), ind - 1, res)
+    return np.where(np.isnan(pos), 0, res)
+
+
 class _WaveNoteDescriptor:
     """
     Metadata of :class:`Wave` and :class:`DaskWave` implemented as :class:`WaveNote` class.
@@ -373,11 +537,243 @@ class WaveNote(dict):
         self["name"] = value
 
 
+def _npzAxes(axes):
+    """Returns the axes to be saved in npz file. LinearAxis is saved as (start, step, n) in linearAxes without materialization."""
+    res = np.empty(len(axes), dtype=object)
+    linear = np.full((len(axes), 3), np.nan)
+    for i, ax in enumerate(axes):
+        if isinstance(ax, LinearAxis):
+            linear[i] = ax.start, ax.step, ax.n
+        else:
+            res[i] = ax
+    return res, linear
+
+
+def _exportNpzBlocks(file, data, axes, note):
+    """
+    Save dask array *data* to uncompressed npz *file* in the format of :meth:`Wave.export`.
+
+    The data is calculated and written block by block along the first axis, so that it is not materialized in memory and can be memory-mapped when it is loaded.
+    """
+    header = {"descr": np.lib.format.dtype_to_descr(data.dtype), "fortran_order": False, "shape": data.shape}
+    rows = data.reshape((1,) + data.shape) if data.ndim == 0 else data
+    rows = rows.rechunk({d: ("auto" if d == 0 else -1) for d in range(rows.ndim)})  # blocks are contiguous in C order
+    axes, linear = _npzAxes(axes)
+    with zipfile.ZipFile(file, "w", zipfile.ZIP_STORED, allowZip64=True) as z:
+        with z.open("data.npy", "w", force_zip64=True) as f:
+            np.lib.format.write_array_header_2_0(f, header)
+            for i in range(rows.numblocks[0]):
+                f.write(np.ascontiguousarray(rows.blocks[i].compute()).tobytes())
+        for key, value in [("axes", axes), ("linearAxes", linear), ("note", dict(note))]:
+            with z.open(key + ".npy", "w", force_zip64=True) as f:
+                np.lib.format.write_array(f, np.asanyarray(value), allow_pickle=True)
+
+
+def _memmapNpz(file, key):
+    """
+    Memory-map the array *key* stored without compression in npz *file*.
+
+    Returns None if the array is compressed or cannot be memory-mapped.
+    """
+    with zipfile.ZipFile(file) as z:
+        if key + ".npy" not in z.namelist():
+            return None
+        info = z.getinfo(key + ".npy")
+    if info.compress_type != zipfile.ZIP_STORED:
+        return None
+    with open(file, "rb") as f:
+        f.seek(info.header_offset)
+        header = f.read(30)
+        name_len, extra_len = struct.unpack("<HH", header[26:30])
+        f.seek(info.header_offset + 30 + name_len + extra_len)
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+        elif version == (2, 0):
+            shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+        else:
+            return None
+        offset = f.tell()
+    if dtype.hasobject or np.prod(shape) == 0:
+        return None
+    return np.memmap(file, dtype=dtype, mode="r", offset=offset, shape=shape, order="F" if fortran else "C")
+
+
+_textBlockSize = 2**20
+"""Approximate number of elements in a block of text file"""
+
+
+def _saveText(file, data, delimiter, progress=None):
+    """Write *data* to text file block by block."""
+    if isinstance(file, str):
+        with open(file, "w") as f:
+            return _saveText(f, data, delimiter, progress)
+    if data.ndim > 2:
+        file.write("# shape = " + str(tuple(data.shape)) + "\n")
+    slices = data.reshape(-1, *data.shape[-2:]) if data.ndim > 1 else data.reshape(1, -1, 1)
+    if np.issubdtype(data.dtype, np.complexfloating):
+        fmt = "%.17g%+.17gj"
+        slices = slices.astype(complex)
+    elif np.issubdtype(data.dtype, np.integer) or data.dtype == bool:
+        fmt = "%d"
+    else:
+        fmt = "%.17g"
+    line = delimiter.join([fmt] * slices.shape[2]) + "\n"
+    block = max(1, _textBlockSize // max(1, slices.shape[2]))
+    for i, table in enumerate(slices):
+        if data.ndim > 2:
+            file.write("# index = " + str(tuple(int(n) for n in np.unravel_index(i, data.shape[:-2]))) + "\n")
+        for start in range(0, len(table), block):
+            b = np.ascontiguousarray(table[start:start + block])
+            if fmt == "%.17g%+.17gj":
+                b = b.view(float)
+            file.write((line * len(b)) % tuple(b.ravel().tolist()))
+            if progress is not None:
+                progress((i * len(table) + start + len(b)) / (len(slices) * len(table)))
+
+
+def _loadText(file, delimiter, dtype=None, progress=None):
+    """Read text file block by block."""
+    if dtype is None:
+        dtype = float
+    shape, blocks = None, []
+    with open(file, "r") as f:
+        size = max(os.fstat(f.fileno()).st_size, 1)
+        first = f.readline()
+        if first.startswith("# shape = "):
+            shape = tuple(int(n) for n in first[10:].strip(" ()\n").split(",") if n.strip() != "")
+        else:
+            f.seek(0)
+        while True:
+            lines = f.readlines(_textBlockSize * 8)
+            if len(lines) == 0:
+                break
+            b = np.loadtxt(lines, delimiter=delimiter, dtype=dtype, ndmin=2)
+            if b.size > 0:
+                blocks.append(b)
+            if progress is not None:
+                progress(f.tell() / size)
+    if len(blocks) == 0:
+        data = np.empty((0,), dtype=dtype)
+    else:
+        data = np.concatenate(blocks) if len(blocks) > 1 else blocks[0]
+    if shape is not None:
+        return data.reshape(shape)
+    return data.squeeze()
+
+
+_ownAttributes = ("_data", "_axes", "_note", "data", "axes", "note")
+_waveAttributes = _ownAttributes + ("modified", "_signals", "_batchLevel", "_pending", "_updateInterval")
+_delegation = {}
+
+
+def _delegate(members, key):
+    """
+    Return the first object in *members* (data, axes, and note) that has attribute *key*, or None if not found.
+
+    Attributes are looked up in the classes of the members, so the result is resolved once and cached for each combination of their types.
+    """
+    types = tuple(map(type, members))
+    index = _delegation.get((types, key))
+    if index is None:
+        index = next((i for i, (m, t) in enumerate(zip(members, types)) if m is not None and hasattr(t, key)), -1)
+        _delegation[(types, key)] = index
+    if index >= 0:
+        return members[index]
+
+
+class _Delegate:
+    """
+    Non-data descriptor that forwards attribute *key* to the member *owner* (_data, _axes, or _note) of Wave and DaskWave.
+
+    Attribute access through the descriptor avoids the failed lookup and __getattr__ call for every access.
+    If the member does not have the attribute, AttributeError makes Python fall back to __getattr__.
+    """
+    __slots__ = ("owner", "key")
+
+    def __init__(self, owner, key):
+        self.owner = owner
+        self.key = key
+
+    def __get__(self, instance, objtype=None):
+        if instance is None:
+            return self
+        return getattr(getattr(instance, self.owner), self.key)
+
+
+def _installDelegates(cls, members):
+    """Install :class:`_Delegate` for public attributes of *members* [(owner, type), ...] that are not defined in *cls*, in the order of priority."""
+    defined = set(dir(cls))
+    for owner, t in members:
+        for key in dir(t):
+            if not key.startswith("_") and key not in defined:
+                setattr(cls, key, _Delegate(owner, key))
+                defined.add(key)
+
+
+class _WaveSignals(QtCore.QObject):
+    """
+    Qt part of :class:`Wave`.
+
+    It is created when the *modified* signal of the wave is accessed for the first time, so that waves that are not connected to GUI do not construct QObject.
+    """
+    modified = QtCore.pyqtSignal(object)
+
+    def __init__(self, wave):
+        super().__init__()
+        self._wave = weakref.ref(wave)
+        self._timer = None
+
+    def emitLater(self, msec):
+        """Emit *modified* after *msec* milliseconds unless it is already scheduled."""
+        if self._timer is None:
+            self._timer = QtCore.QTimer(self)
+            self._timer.setSingleShot(True)
+            self._timer.timeout.connect(self.__emit)
+        if not self._timer.isActive():
+            self._timer.start(msec)
+
+    def __emit(self):
+        wave = self._wave()
+        if wave is not None:
+            self.modified.emit(wave)
+
+
+class _WaveSignalDescriptor:
+    """
+    *modified* is a pyqtSignal, which is emitted when *Wave* is changed.
+
+    Example::
+
+        from lys import Wave
+
+        w = Wave([1,2,3], name="wave1")
+        w.modified.connect(lambda w: print("modified", w.name))
+        w.data = [2,3,4] # modified wave1
+    """
+
+    def __get__(self, instance, objtype=None):
+        if instance is None:
+            return self
+        return _waveSignals(instance).modified
+
+
+def _waveSignals(wave):
+    """Returns :class:`_WaveSignals` of *wave*, which is created if it does not exist."""
+    if wave._signals is None:
+        wave._signals = _WaveSignals(wave)
+    return wave._signals
+
+
 def _produceWave(data, axes, note):
-    return Wave(data, *axes, **note)
+    return Wave(data, *axes, copy=False, **note)
 
 
-class Wave(QtCore.QObject):
+def _produceDaskWave(data, axes, note):
+    return DaskWave(data, *axes, chunks="NoRechunk", **note)
+
+
+class Wave:
     """
     Wave class is a central data class in lys, which is composed of :attr:`data`, :attr:`axes`, and :attr:`note`.
 
@@ -391,6 +787,7 @@ class Wave(QtCore.QObject):
     Args:
         data (array_like or str): The data of any dimension, or filename to be loaded
         axes (list of array_like): The axes of data
+        copy (bool): If False, *data* is wrapped without copying whenever possible (e.g. numpy.ndarray or numpy.memmap).
         note (dict): metadata for Wave.
 
     Basic initialization without axes and note::
@@ -420,6 +817,14 @@ class Wave(QtCore.QObject):
         print(w2.data)       # [[1 2 3], [1 2 3]]
         print(w2.x, w2.y)    # [7,8], [4,5,6]
 
+    Wrap existing array without copying::
+
+        from lys import Wave
+
+        arr = np.zeros((100, 100))
+        w = Wave(arr, copy=False)
+        print(np.shares_memory(w.data, arr))  # True
+
     Save & load numpy npz file::
 
         from lys import Wave
@@ -430,6 +835,16 @@ class Wave(QtCore.QObject):
         w2 = Wave("wave.npz")
         print(w2.data)       # [1 2 3]
 
+    Large data can be saved as uncompressed npz file, which is memory-mapped (read-only) when it is loaded::
+
+        from lys import Wave
+
+        w = Wave(np.random.rand(100, 100, 100))
+        w.export("wave.npz", type="npz_uncompressed")
+
+        w2 = Wave("wave.npz")  # Data is not read until it is accessed
+        print(type(w2.data))   # <class 'numpy.memmap'>
+
     Direct access numpy array methods::
 
         from lys import Wave
@@ -440,36 +855,34 @@ class Wave(QtCore.QObject):
     See also:
         :attr:`data`, :attr:`axes`, :attr:`note`
     """
-    modified = QtCore.pyqtSignal(object)
-    """
-    *modified* is a pyqtSignal, which is emitted when *Wave* is changed.
-
-    Example::
-
-        from lys import Wave
-
-        w = Wave([1,2,3], name="wave1")
-        w.modified.connect(lambda w: print("modified", w.name))
-        w.data = [2,3,4] # modified wave1
-    """
+    # Wave is a plain data container. QObject for the modified signal is created only when the signal or other QObject methods are used.
+    __slots__ = ("_data", "_axes", "_note", "_signals", "_batchLevel", "_pending", "_updateInterval", "__weakref__", "__dict__")
+    modified = _WaveSignalDescriptor()
     data = _WaveDataDescriptor()
     axes = _WaveAxesDescriptor()
     note = _WaveNoteDescriptor()
 
-    def __init__(self, data=None, *axes, **note):
-        super().__init__()
+    def __init__(self, data=None, *axes, copy=True, **note):
+        self._signals = None
+        self._batchLevel = 0
+        self._pending = False
+        self._updateInterval = 0
         if type(data) == str or type(data) == io.BytesIO:
             self.__loadData(data)
         else:
-            self.__setData(data, *axes, **note)
+            self.__setData(data, *axes, copy=copy, **note)
 
     def __loadData(self, file):
         """Load data from file"""
+        data = None
         if isinstance(file, str):
             tmp = np.load(file, allow_pickle=True)
+            data = _memmapNpz(file, "data")
         elif isinstance(file, io.BytesIO):
             tmp = np.load(io.BytesIO(file.getvalue()), allow_pickle=True)
-        self.data = tmp['data']
+        if data is None:
+            data = tmp['data']
+        self.setData(data, copy=False)
         if 'axes' in tmp:
             axes = []
             for axis in tmp['axes']:
@@ -479,25 +892,29 @@ class Wave(QtCore.QObject):
                     axes.append(np.array(None))
                 else:
                     axes.append(np.array(axis, dtype=type(axis[0])))
+            if 'linearAxes' in tmp:
+                for i, (start, step, n) in enumerate(tmp['linearAxes']):
+                    if not np.isnan(n):
+                        axes[i] = LinearAxis(start, step, n)
             self.axes = axes
         else:
             self.axes = []
         if 'note' in tmp:
             self.note = tmp['note'][()]
 
-    def __setData(self, data, *axes, **note):
+    def __setData(self, data, *axes, copy=True, **note):
         """Set data from *data*, *axes*, and *note*"""
         if hasattr(data, "__iter__"):
             if len(data) > 0:
                 if isinstance(data[0], Wave):
                     self.__joinWaves(data, *axes, **note)
                     return
-        self.data = data
+        self.setData(data, copy=copy)
         self.axes = axes
         self.note = note
 
     def __joinWaves(self, waves, *axes, **note):
-        self.data = np.array([w.data for w in waves])
+        self.setData(np.array([w.data for w in waves]), copy=False)
         if len(axes) == 1:
             ax = list(axes)
         else:
@@ -506,41 +923,68 @@ class Wave(QtCore.QObject):
         self.note = note
 
     def __getattr__(self, key):
-        if "_data" in self.__dict__:
-            if hasattr(self.data, key):
-                return getattr(self.data, key)
-        if "_axes" in self.__dict__:
-            if hasattr(self.axes, key):
-                return getattr(self.axes, key)
-        if "_note" in self.__dict__:
-            if hasattr(self.note, key):
-                return getattr(self.note, key)
-        return super().__getattr__(key)
+        if key not in _waveAttributes:
+            owner = _delegate((getattr(self, "_data", None), getattr(self, "_axes", None), getattr(self, "_note", None)), key)
+            if owner is not None:
+                return getattr(owner, key)
+            if not key.startswith("_") and hasattr(QtCore.QObject, key):  # such as objectName and blockSignals
+                return getattr(_waveSignals(self), key)
+        raise AttributeError("'Wave' object has no attribute '" + key + "'")
 
     def __setattr__(self, key, value):
-        if "_axes" in self.__dict__:
-            if hasattr(self.axes, key):
-                return setattr(self.axes, key, value)
-        if "_note" in self.__dict__:
-            if hasattr(self.note, key):
-                return setattr(self.note, key, value)
+        if key not in _waveAttributes:
+            owner = _delegate((getattr(self, "_axes", None), getattr(self, "_note", None)), key)
+            if owner is not None:
+                return setattr(owner, key, value)
         return super().__setattr__(key, value)
 
     def __reduce_ex__(self, proto):
         return _produceWave, (self.data, list(self.axes), self.note)
 
+    def setData(self, data, copy=True):
+        """
+        Set *data* with explicit copy policy.
+
+        Setting :attr:`data` by assignment is equivalent to setData(data, copy=True).
+
+        Args:
+            data (array_like): The new data.
+            copy (bool): If False, *data* is wrapped without copying whenever possible (e.g. numpy.ndarray or numpy.memmap).
+
+        Example::
+
+            from lys import Wave
+
+            arr = np.ones((100, 100))
+            w = Wave()
+            w.setData(arr, copy=False)
+            print(np.shares_memory(w.data, arr))  # True
+        """
+        if copy:
+            self._data = np.array(data)
+        else:
+            self._data = np.asanyarray(data)
+        if hasattr(self, "_axes"):
+            self._axes._update(self._data)
+        self.update()
+
     @ staticmethod
     def SupportedFormats():
         """List of supported file formats to export. see :meth:`export`"""
-        return ["Numpy npz (*.npz)", "Comma-Separated Values (*.csv)", "Text file (*.txt)"]
+        return ["Numpy npz (*.npz)", "Numpy npz, uncompressed (*.npz)", "Comma-Separated Values (*.csv)", "Text file (*.txt)"]
 
-    def export(self, path, type="npz"):
+    def export(self, path, type="npz", progress=None):
         """
         Export *Wave* to file.
 
+        Uncompressed npz file (type='npz_uncompressed') is memory-mapped when it is loaded, which is suitable for large data.
+
+        Text files (csv and txt) are written block by block. If data.ndim > 2, the data is written as successive 2D slices.
+
         Args:
             path (str): File path to be saved.
             type (str): File extension. See :meth:`SupportedFormats`.
+            progress (callable): Called with the fraction of written data when text file is exported.
 
         Exmple::
 
@@ -558,31 +1002,45 @@ class Wave(QtCore.QObject):
             :meth:`importFrom`
         """
         if type in ['Numpy npz (*.npz)', ".npz", "npz"]:
-            if isinstance(path, str):
-                if not path.endswith(".npz"):
-                    path = path + ".npz"
-                path = os.path.abspath(path)
-                os.makedirs(os.path.dirname(path), exist_ok=True)
-            np.savez_compressed(path, data=self.data, axes=np.array(self.axes, dtype=object), note=dict(self.note), allow_pickle=False)
+            self.__exportNpz(path, np.savez_compressed)
+        if type in ['Numpy npz, uncompressed (*.npz)', "npz_uncompressed"]:
+            self.__exportNpz(path, np.savez)
         if type in ["Comma-Separated Values (*.csv)", ".csv", "csv"]:
             if isinstance(path, str):
                 if not path.endswith(".csv"):
                     path = path + ".csv"
-            np.savetxt(path, self.data, delimiter=',')
+            _saveText(path, self.data, ",", progress)
         if type in ["Text file (*.txt)", ".txt", "txt"]:
             if isinstance(path, str):
                 if not path.endswith(".txt"):
                     path = path + ".txt"
-            np.savetxt(path, self.data)
+            _saveText(path, self.data, " ", progress)
+
+    def __exportNpz(self, path, save):
+        axes, linear = _npzAxes(self.axes)
+        if isinstance(path, str):
+            if not path.endswith(".npz"):
+                path = path + ".npz"
+            path = os.path.abspath(path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # data may be memory-mapped from path, so it is not overwritten directly.
+            with open(path + ".tmp", "wb") as f:
+                save(f, data=self.data, axes=axes, linearAxes=linear, note=dict(self.note), allow_pickle=False)
+            os.replace(path + ".tmp", path)
+        else:
+            save(path, data=self.data, axes=axes, linearAxes=linear, note=dict(self.note), allow_pickle=False)
 
     @ staticmethod
-    def importFrom(path):
+    def importFrom(path, dtype=None, progress=None):
         """
         Import *Wave* from file.
 
+        Text files (csv and txt) are read block by block.
+
         Args:
             path (str): File path to be saved.
-            type (str): File extension. See :meth:`SupportedFormats`.
+            dtype (data-type): The data type of text file. If it is None, float is used.
+            progress (callable): Called with the fraction of read data when text file is imported.
 
         See also:
             :meth:`export`
@@ -591,14 +1049,17 @@ class Wave(QtCore.QObject):
         if ext == ".npz":
             return Wave(path)
         elif ext == ".csv":
-            return Wave(np.loadtxt(path, delimiter=","))
+            return Wave(_loadText(path, ",", dtype, progress), copy=False)
         elif ext == ".txt":
-            return Wave(np.loadtxt(path, delimiter=" "))
+            return Wave(_loadText(path, None, dtype, progress), copy=False)
 
     def duplicate(self):
         """
         Create duplicated *Wave*
 
+        The data is copied unless it is read-only (e.g. memory-mapped from uncompressed npz file).
+        Read-only data is shared by the original and duplicated waves, and copied when the duplicated wave is modified by :meth:`__setitem__` (copy-on-write).
+
         Return:
             Wave: Duplicated wave.
 
@@ -609,8 +1070,12 @@ class Wave(QtCore.QObject):
             w = Wave([1,2,3])
             w2=w.duplicate()
             print(w2.data) # [1,2,3]
+
+            w2[0] = 0
+            print(w2.data) # [0,2,3]
+            print(w.data)  # [1,2,3]
         """
-        return Wave(self.data, *self.axes, **self.note)
+        return Wave(self._data, *self.axes, copy=self._data.flags.writeable, **self.note)
 
     def update(self):
         """
@@ -629,8 +1094,51 @@ class Wave(QtCore.QObject):
             w.data = [0, 1, 2]        # modified, modified is emitted when Wave.data is changed.
             w.data[1] = 0             # modified is NOT emitted through data.__setitem__ is called.
             w.update()                # modified
+
+        See also:
+            :meth:`batchUpdate`, :meth:`setUpdateInterval`
+        """
+        if self._batchLevel > 0:
+            self._pending = True
+        elif self._signals is None:  # nothing is connected to modified
+            return
+        elif self._updateInterval > 0:
+            self._signals.emitLater(self._updateInterval)
+        else:
+            self._signals.modified.emit(self)
+
+    def batchUpdate(self):
+        """
+        Coalesce *modified* signals in *with* block into one signal.
+
+        *modified* is emitted once at the end of the outermost *with* block if the wave is changed in the block.
+
+        Example::
+
+            from lys import Wave
+
+            w = Wave([1,2,3])
+            w.modified.connect(lambda: print("modified"))
+
+            with w.batchUpdate():
+                w.data = [0, 1]
+                w.x = [1, 2]
+                w.name = "wave1"
+            # modified is printed only once here
+        """
+        return _WaveBatch(self)
+
+    def setUpdateInterval(self, msec):
         """
-        self.modified.emit(self)
+        Set the minimum interval of *modified* signal.
+
+        When *msec* > 0, changes of the wave are coalesced and *modified* is emitted at most once per *msec* milliseconds, after the first change in the interval.
+        This rate-limited mode requires Qt event loop. *modified* is emitted immediately when *msec* = 0 (default).
+
+        Args:
+            msec (int): The interval in milliseconds.
+        """
+        self._updateInterval = msec
 
     def __str__(self):
         return "Wave object (name = {0}, dtype = {1}, shape = {2})".format(self.name, self.dtype, self.shape)
@@ -651,8 +1159,45 @@ class Wave(QtCore.QObject):
         return w
 
     def __setitem__(self, key, value):
+        if not self._data.flags.writeable:
+            self._data = np.array(self._data)
         self._data[key] = value
-        self.modified.emit(self)
+        self.update()
+
+
+class _WaveBatch:
+    def __init__(self, wave):
+        self.wave = wave
+
+    def __enter__(self):
+        self.wave._batchLevel += 1
+        return self.wave
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.wave._batchLevel -= 1
+        if self.wave._batchLevel == 0 and self.wave._pending:
+            self.wave._pending = False
+            self.wave.update()
+
+
+_installDelegates(Wave, [("_data", np.ndarray), ("_axes", WaveAxes), ("_note", WaveNote)])
+
+
+_autoRechunk = contextvars.ContextVar("autoRechunk", default=True)
+
+
+class _KeepChunks:
+    """
+    Disable automatic rechunking of DaskWave created from dask array within *with* block.
+
+    Filters uses this to compile a chain of filters into a single dask graph. Steps that require specific chunks should rechunk explicitly.
+    """
+
+    def __enter__(self):
+        self._token = _autoRechunk.set(False)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _autoRechunk.reset(self._token)
 
 
 class _DaskWaveDataDescriptor:
@@ -671,7 +1216,22 @@ class _DaskWaveDataDescriptor:
         return instance._data
 
 
-class DaskWave(QtCore.QObject):
+class _DaskWaveClientDescriptor:
+    """
+    *client* is the dask.distributed.Client connected to the local cluster, which is None if the cluster is not running.
+
+    It is read-only and always returns :func:`lys.cluster.client`. Use :func:`lys.cluster.start` to start the cluster.
+    """
+
+    def __set__(self, instance, value):
+        raise AttributeError("DaskWave.client is read-only. Use lys.cluster.start to start the cluster.")
+
+    def __get__(self, instance, objtype=None):
+        from lys import cluster
+        return cluster.client()
+
+
+class DaskWave:
     """
     *DaskWave* class is a central data class in lys, which is used for easy parallel computing via dask.
 
@@ -719,38 +1279,45 @@ class DaskWave(QtCore.QObject):
         arr = da.from_array([1,2,3])   # dask array can be prepared by other mehotds, such as dask.delayed if data is huge
         dw = DaskWave(arr)
         dw.compute().data   #[1,2,3]
+
+    Example4::
+
+        from lys import DaskWave
+
+        dw = DaskWave(np.random.rand(100, 100, 100), chunks=(10, 100, 100))
+        dw.save("wave.zarr")               # chunked, compressed store. zarr is required.
+
+        dw2 = DaskWave.open("wave.zarr")   # data is read chunk by chunk when it is computed.
+        print(dw2.data.chunks[0])          # (10, 10, 10, 10, 10, 10, 10, 10, 10, 10)
     """
+    # DaskWave is a plain data container without Qt, because filters create many intermediate DaskWaves.
+    __slots__ = ("_data", "_axes", "_note", "__weakref__", "__dict__")
     data = _DaskWaveDataDescriptor()
     axes = _WaveAxesDescriptor()
     note = _WaveNoteDescriptor()
+    client = _DaskWaveClientDescriptor()
 
     @classmethod
     def initWorkers(cls, n_workers, threads_per_worker=1):
         """
-        Initializa local cluster. 
-        This method is automatically called when lys is launched with parallel computing option.
-        DO NOT call this method within lys.
+        Initialize local cluster.
+        This method is kept for compatibility. Use :func:`lys.cluster.start` to control memory limits and scaling of the cluster,
+        and :func:`lys.cluster.client` to get the client.
 
         Args:
             n_workers (int): number of workers to be launched.
-            threads_per_worker (int): number of therads for each worker.
+            threads_per_worker (int): number of threads for each worker.
+
+        Returns:
+            dask.distributed.Client: The client connected to the cluster. None is returned if the cluster failed to start.
         """
+        from lys import cluster
         try:
-            from dask.distributed import Client, LocalCluster
-
-            def closeClient():
-                print("[DaskWave] Closing local cluster...")
-                cls.client.close()
-                print("[DaskWave] Closing local cluster finished")
-            cluster = LocalCluster(n_workers=n_workers, threads_per_worker=threads_per_worker)
-            cls.client = Client(cluster)
-            atexit.register(closeClient)
-            print("[DaskWave] Local cluster launched:", cls.client)
+            return cluster.start(n_workers=n_workers, threads_per_worker=threads_per_worker)
         except Exception:
             print("[DaskWave] failed to initialize local cluster for parallel computing.")
 
     def __init__(self, data, *axes, chunks="auto", **note):
-        super().__init__()
         if isinstance(data, Wave):
             return self.__fromWave(data, chunks)
         elif isinstance(data, da.core.Array):
@@ -771,7 +1338,7 @@ class DaskWave(QtCore.QObject):
 
     def __fromda(self, wave, axes, chunks, note):
         """Load from da.core.Array"""
-        if chunks == "NoRechunk":
+        if chunks == "NoRechunk" or (chunks == "auto" and not _autoRechunk.get()):
             self.data = wave
         else:
             self.data = wave.rechunk(chunks)
@@ -788,24 +1355,17 @@ class DaskWave(QtCore.QObject):
         self.note = note
 
     def __getattr__(self, key):
-        if "_note" in self.__dict__:
-            if hasattr(self.note, key):
-                return getattr(self.note, key)
-        if "_axes" in self.__dict__:
-            if hasattr(self.axes, key):
-                return getattr(self.axes, key)
-        if "_data" in self.__dict__:
-            if hasattr(self.data, key):
-                return getattr(self.data, key)
-        return super().__getattr__(key)
+        if key not in _ownAttributes:
+            owner = _delegate((getattr(self, "_note", None), getattr(self, "_axes", None), getattr(self, "_data", None)), key)
+            if owner is not None:
+                return getattr(owner, key)
+        raise AttributeError("'DaskWave' object has no attribute '" + key + "'")
 
     def __setattr__(self, key, value):
-        if "_axes" in self.__dict__:
-            if hasattr(self.axes, key):
-                return setattr(self.axes, key, value)
-        if "_note" in self.__dict__:
-            if hasattr(self.note, key):
-                return setattr(self.note, key, value)
+        if key not in _ownAttributes:
+            owner = _delegate((getattr(self, "_axes", None), getattr(self, "_note", None)), key)
+            if owner is not None:
+                return setattr(owner, key, value)
         return super().__setattr__(key, value)
 
     def compute(self):
@@ -819,12 +1379,72 @@ class DaskWave(QtCore.QObject):
         Return:
             Wave: cauculated result
         """
-        return Wave(self.data.compute(), *self.axes, **self.note)
+        return Wave(self.data.compute(), *self.axes, copy=False, **self.note)
+
+    def __reduce__(self):
+        return _produceDaskWave, (self.data, list(self.axes), self.note)
 
     def persist(self):
         """Call data.persist"""
         self.data = self.data.persist()
 
+    @staticmethod
+    def open(path, chunks=None):
+        """
+        Open *DaskWave* saved in chunked store by :meth:`save`.
+
+        The data is not loaded when this method is called.
+        Each chunk is read in parallel when it is needed for computation.
+
+        zarr (https://zarr.readthedocs.io) is required to use this method.
+
+        Args:
+            path (str): The path to the store.
+            chunks (None or tuple): The chunks of the dask array. If it is None, the chunks in the store are used.
+
+        Return:
+            DaskWave: The opened wave.
+        """
+        import zarr
+        root = zarr.open_group(path, mode="r")
+        if chunks is None:
+            data = da.from_zarr(root["data"])
+        else:
+            data = da.from_zarr(root["data"], chunks=chunks)
+        axes = [root["axes"][str(d)][:] for d in range(data.ndim)]
+        if "note" in root.attrs:
+            note = root.attrs["note"]
+        else:
+            note = serialization.loads(root["note"][:].tobytes())
+        return DaskWave(data, *axes, chunks="NoRechunk", **note)
+
+    def save(self, path, chunks=None):
+        """
+        Save *DaskWave* to chunked, compressed store.
+
+        Each chunk is computed and written in parallel, and therefore data is not materialized in memory.
+        The saved data can be opened by :meth:`open`.
+
+        zarr (https://zarr.readthedocs.io) is required to use this method.
+
+        Args:
+            path (str): The path to the store.
+            chunks (None or tuple): The chunks in the store. If it is None, the chunks of the dask array are used.
+        """
+        import zarr
+        data = self.data if chunks is None else self.data.rechunk(chunks)
+        if any(len(set(c[:-1])) > 1 or c[-1] > c[0] for c in data.chunks):
+            data = data.rechunk(data.chunksize)  # zarr requires regular chunks
+        root = zarr.open_group(path, mode="w")
+        axes = root.create_group("axes")
+        for d, ax in enumerate(self.axes):
+            axes.array(str(d), np.asarray(ax))
+        try:
+            root.attrs["note"] = dict(self.note)
+        except TypeError:
+            root.array("note", np.frombuffer(serialization.dumps(dict(self.note)), dtype=np.uint8))
+        da.to_zarr(data, root.store, component="data", overwrite=True)
+
     def duplicate(self):
         """
         Create duplicated *DaskWave*
@@ -841,3 +1461,6 @@ class DaskWave(QtCore.QObject):
             print(w2.compute().data) # [1,2,3]
         """
         return DaskWave(self, chunks="NoRechunk")
+
+
+_installDelegates(DaskWave, [("_note", WaveNote), ("_axes", WaveAxes), ("_data", da.Array)])
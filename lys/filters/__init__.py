@@ -1,5 +1,8 @@
 
 from .function import addFilter, getFilter, fromFile, fromString, toString, toFile, fromWave
 from .interface import FilterSettingBase, filterGUI, FilterInterface, Filters
+from .optimizer import optimize
+from .cache import enableCache, disableCache, clearCache, isCacheEnabled
+from .incremental import IncrementalExecutor
 from .filtersGUI import FiltersGUI
 from .filter import *
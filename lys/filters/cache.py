@@ -0,0 +1,235 @@
+"""
+Cache of the results of filters.
+
+When the cache is enabled by :func:`enableCache`, the results of :meth:`FilterInterface.execute` are saved in memory and on disk (home()/.lys/cache).
+Results in memory are saved on disk when they are evicted from memory.
+The results are identified by the hash of the data and axes of the input wave and the string representation of the filters (see :func:`lys.filters.toString`).
+
+The result of the filters without the last one is also cached. Therefore, when only the last filter is changed, the other filters are not calculated again.
+This is skipped when the last filter reduces the size of the data (such as slicing), so that the filters are optimized together (see :func:`optimize`).
+
+Results that fit the memory cache are calculated in memory. Larger results that fit the disk cache are written to disk block by block and memory-mapped.
+
+Example::
+
+    from lys import Wave, filters
+    import numpy as np
+
+    filters.enableCache()
+
+    w = Wave(np.random.rand(100, 100, 100))
+    f = filters.GaussianFilter([3, 3, 3]) + filters.SliceFilter([slice(None), slice(None), 0])
+    result1 = f.execute(w)  # calculated
+
+    f = filters.GaussianFilter([3, 3, 3]) + filters.SliceFilter([slice(None), slice(None), 1])
+    result2 = f.execute(w)  # the result of GaussianFilter is taken from the cache
+"""
+
+import os
+import sys
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+from dask.base import tokenize
+
+from lys import home, Wave, DaskWave
+from lys.core import _exportNpzBlocks
+
+_cache = None
+
+
+def enableCache(memory=2**30, disk=2**33, path=None):
+    """
+    Enable the cache of the results of filters.
+
+    Args:
+        memory(int): The maximum size of the cache in memory in bytes.
+        disk(int): The maximum size of the cache on disk in bytes. If it is 0, the results are not saved on disk.
+        path(str): The directory of the cache on disk. If it is None, home()/.lys/cache is used.
+    """
+    global _cache
+    if path is None:
+        path = home() + "/.lys/cache"
+    _cache = _FilterCache(memory, disk, path)
+
+
+def disableCache():
+    """
+    Disable the cache of the results of filters. The files on disk are not removed. Use :func:`clearCache` to remove them.
+    """
+    global _cache
+    _cache = None
+
+
+def clearCache():
+    """
+    Remove all results in the cache.
+    """
+    if _cache is not None:
+        _cache.clear()
+
+
+def isCacheEnabled():
+    """
+    Check if the cache is enabled.
+
+    Returns:
+        bool: True if the cache is enabled.
+    """
+    return _cache is not None
+
+
+class _FilterCache:
+    def __init__(self, memory, disk, path):
+        self._memory = memory
+        self._disk = disk
+        self._path = os.path.abspath(path)
+        self._items = OrderedDict()
+        self._size = 0
+
+    def get(self, key):
+        if key in self._items:
+            self._items.move_to_end(key)
+            return self._items[key]
+        file = self._file(key)
+        if self._disk > 0 and os.path.exists(file):
+            os.utime(file)
+            w = Wave(file)
+            if w.data.nbytes <= self._memory:
+                w = Wave(w.data, *w.axes)
+                self._setMemory(key, w)
+            return w
+
+    def set(self, key, wave):
+        """Keep Wave *wave* in memory. It is saved on disk when it is evicted from memory."""
+        self._setMemory(key, wave)
+
+    def store(self, key, wave):
+        """Calculate DaskWave *wave* block by block, save it on disk, and return the memory-mapped result."""
+        file = self._file(key)
+        os.makedirs(self._path, exist_ok=True)
+        _exportNpzBlocks(file + ".tmp", wave.data, wave.axes, {})
+        os.replace(file + ".tmp", file)
+        self._evictDisk()
+        return Wave(file)
+
+    def fitsMemory(self, wave):
+        return wave.data.nbytes <= self._memory
+
+    def fitsDisk(self, wave):
+        return 0 < wave.data.nbytes <= self._disk
+
+    def clear(self):
+        self._items.clear()
+        self._size = 0
+        for f in self._files():
+            os.remove(f.path)
+
+    def _setMemory(self, key, wave):
+        if key in self._items:
+            self._size -= self._items.pop(key).data.nbytes
+        self._items[key] = wave
+        self._size += wave.data.nbytes
+        while self._size > self._memory:
+            k, w = self._items.popitem(last=False)
+            self._size -= w.data.nbytes
+            self._spill(k, w)
+
+    def _spill(self, key, wave):
+        if not 0 < wave.data.nbytes <= self._disk:
+            return
+        file = self._file(key)
+        if os.path.exists(file):
+            os.utime(file)
+        else:
+            os.makedirs(self._path, exist_ok=True)
+            Wave(wave.data, *wave.axes, copy=False).export(file, type="npz_uncompressed")
+            self._evictDisk()
+
+    def _evictDisk(self):
+        files = sorted(self._files(), key=lambda f: f.stat().st_mtime)
+        size = sum(f.stat().st_size for f in files)
+        while size > self._disk and len(files) > 0:
+            f = files.pop(0)
+            size -= f.stat().st_size
+            os.remove(f.path)
+
+    def _files(self):
+        if not os.path.exists(self._path):
+            return []
+        return [f for f in os.scandir(self._path) if f.name.endswith(".npz")]
+
+    def _file(self, key):
+        return self._path + "/" + key + ".npz"
+
+
+def _keys(wave, filters):
+    """Returns the keys of the results of filters[:1], filters[:2], ..."""
+    from .interface import Filters
+    base = tokenize(wave.data, [np.asarray(ax) for ax in wave.axes])
+    keys = []
+    with np.printoptions(threshold=sys.maxsize):  # parameters given as large arrays should not be abbreviated
+        for i in range(len(filters)):
+            keys.append(hashlib.sha1((base + Filters.toString(Filters(filters[:i + 1]))).encode()).hexdigest())
+    return keys
+
+
+def _run(filters, wave):
+    from .interface import Filters
+    f = Filters(filters)
+    result = f._execute(wave)
+    f._setNote(result)
+    return result
+
+
+def _restore(cached, wave, filters):
+    """Returns DaskWave of the cached result with the note of the input *wave*."""
+    # data is copied so that the cache is not changed by users. Read-only data memory-mapped from disk is not copied.
+    result = DaskWave(Wave(cached.data, *cached.axes, copy=cached.data.flags.writeable, **wave.note))
+    if len(filters) > 0:
+        from .interface import Filters
+        Filters(filters)._setNote(result)
+    return result
+
+
+def _execute(filt, wave):
+    """Execute *filt* for DaskWave using the cache."""
+    from .interface import Filters
+    filters = filt.getFilters() if isinstance(filt, Filters) else [filt]
+    if len(filters) == 0:
+        return _run(filters, wave)
+    keys = _keys(wave, filters)
+
+    # find the longest cached part of the filters
+    n = len(filters)
+    start, i = wave, 0
+    for i in range(n, 0, -1):
+        cached = _cache.get(keys[i - 1])
+        if cached is not None:
+            start = _restore(cached, wave, filters[:i])
+            break
+    else:
+        i = 0
+    if i == n:
+        return start
+
+    # calculate the result without the last filter, and then the last filter.
+    # If the last filter reduces the data, all filters are calculated together so that the optimizer can move it forward.
+    if i < n - 1:
+        prefix = _run(filters[i:n - 1], start)
+        if _run(filters[n - 1:], prefix).data.nbytes < prefix.data.nbytes:
+            return _calculate(keys[n - 1], _run(filters[i:], start))
+        start = _calculate(keys[n - 2], prefix)
+    return _calculate(keys[n - 1], _run(filters[n - 1:], start))
+
+
+def _calculate(key, wave):
+    """Calculate *wave* and save it in the cache. Large wave that does not fit the cache is returned without calculation."""
+    if _cache.fitsMemory(wave):
+        result = wave.compute()
+        _cache.set(key, Wave(result.data, *result.axes))
+        return DaskWave(result)
+    if _cache.fitsDisk(wave):
+        return DaskWave(_cache.store(key, wave))
+    return wave
@@ -1,7 +1,6 @@
 import numpy as np
+from scipy import ndimage
 from scipy.ndimage import filters
-import dask.array as da
-from dask_image import ndfilters as dfilters
 
 from lys import DaskWave
 from lys.filters import FilterInterface, filterGUI, addFilter
@@ -31,11 +30,17 @@ class _ConvolutionFilter(FilterInterface):
     def _getDim(self, wave):
         return wave.data.ndim
 
+    def _makeKernel(self, wave):
+        # convolution is linear, so that the results along axes are summed by a single kernel
+        return np.sum([self._kernel(wave, ax) for ax in self._axes], axis=0)
+
     def _execute(self, wave, *args, **kwargs):
-        results = [self._applyFunc(dfilters.convolve, wave.data, self._kernel(wave, ax)) for ax in self._axes]
-        data = da.sum(da.stack(results), axis=0)
+        data = self._applyWithHalo(ndimage.convolve, wave.data, self._getDepth(wave), weights=self._makeKernel(wave))
         return DaskWave(data, *wave.axes, **wave.note)
 
+    def _getDepth(self, wave):
+        return [1] * wave.data.ndim
+
     def getParameters(self):
         return {"axes": self._axes}
 
@@ -103,10 +108,8 @@ class LaplacianConvFilter(_ConvolutionFilter):
         res[tuple([1 for i in range(core.ndim)])] -= 1
         return res
 
-    def _execute(self, wave, **kwargs):
-        kernel = self._kernel(wave, None)
-        wave.data = dfilters.convolve(wave.data, kernel)
-        return wave
+    def _makeKernel(self, wave):
+        return self._kernel(wave, None)
 
 
 @filterGUI(PrewittFilter)
@@ -6,6 +6,19 @@ from lys.filters import FilterInterface, FilterSettingBase, filterGUI, addFilter
 from lys.widgets import AxisCheckLayout
 
 
+def _gradient(filter, data, x, axis, n=1):
+    """Calculate n-th derivative of dask array *data* along *axis*, where *x* is the axis values."""
+    return filter._applyAlongAxis(_gradientBlock, data, axis, dtype=np.result_type(data.dtype, float), x=np.asarray(x), n=n)
+
+
+def _gradientBlock(d, x, n, axis):
+    if d.shape[axis] == 1:  # np.gradient requires at least two points
+        return np.zeros(d.shape, dtype=np.result_type(d.dtype, float))
+    for _ in range(n):
+        d = np.gradient(d, x, axis=axis)
+    return d
+
+
 class GradientFilter(FilterInterface):
     """
     Differentiate wave along *axes* (implementation of np.gradient in lys)
@@ -29,12 +42,9 @@ class GradientFilter(FilterInterface):
         self._axes = axes
 
     def _execute(self, wave, *axes, **kwargs):
-        def f(d, x):
-            if len(d) == 1:
-                return x
-            return np.gradient(d, x)
+        data = wave.data
         for ax in self._axes:
-            data = da.apply_along_axis(f, ax, wave.data, wave.getAxis(ax))
+            data = _gradient(self, data, wave.getAxis(ax), ax)
         return DaskWave(data, *wave.axes, **wave.note)
 
     def getParameters(self):
@@ -59,11 +69,7 @@ class NablaFilter(FilterInterface):
     """
 
     def _execute(self, wave, *axes, **kwargs):
-        def f(d, x):
-            if len(d) == 1:
-                return x
-            return np.gradient(d, x)
-        data = da.stack([da.apply_along_axis(f, ax, wave.data, wave.getAxis(ax)) for ax in range(wave.data.ndim)])
+        data = da.stack([_gradient(self, wave.data, wave.getAxis(ax), ax) for ax in range(wave.data.ndim)])
         return DaskWave(data, None, *wave.axes, **wave.note)
 
     def getParameters(self):
@@ -96,12 +102,8 @@ class LaplacianFilter(FilterInterface):
         pass
 
     def _execute(self, wave, *axes, **kwargs):
-        def f(d, x):
-            if len(d) == 1:
-                return x
-            return np.gradient(np.gradient(d, x), x)
-        data = da.stack([da.apply_along_axis(f, ax, wave.data, wave.getAxis(ax)) for ax in range(wave.data.ndim)]).sum(axis=0)
-        return DaskWave(data, None, *wave.axes, **wave.note)
+        data = da.stack([_gradient(self, wave.data, wave.getAxis(ax), ax, n=2) for ax in range(wave.data.ndim)]).sum(axis=0)
+        return DaskWave(data, *wave.axes, **wave.note)
 
     def getParameters(self):
         return {}
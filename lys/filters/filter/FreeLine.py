@@ -1,6 +1,7 @@
+import functools
 import numpy as np
-from scipy import ndimage
 import dask.array as da
+from scipy import sparse
 
 
 from lys import DaskWave, frontCanvas
@@ -16,10 +17,14 @@ class FreeLineFilter(FilterInterface):
 
     *range* specifies start and end points in axes coordinates, [(x1, y1), (x2, y2)].
     For example, [(0,0),(5,10)] means that data is cut along y=2x.
+    If more than two points are given, data is cut along the polyline that connects the points.
+
+    The data is interpolated linearly and summed over the width of the line.
+    The interpolation weights are calculated once for each line and applied to all 2-dimensional slices as sparse matrix product.
 
     Args:
         axes(tuple of size 2): axes to be cut.
-        range(2*2 sequence): see description above.
+        range(n*2 sequence): see description above.
         width(int): width of integration around the line in pixel unit.
 
     Example::
@@ -33,6 +38,11 @@ class FreeLineFilter(FilterInterface):
         f = filters.FreeLineFilter(axes=[0, 1], range=[(1, 1), (3, 3)], width=1)
         result = f.execute(w)
         print(result.data) # [1, 3, 5]
+
+        # cut along polyline
+        f = filters.FreeLineFilter(axes=[0, 1], range=[(1, 1), (3, 1), (3, 3)], width=1)
+        result = f.execute(w)
+        print(result.data) # [1, 2, 3, 4, 5]
     """
 
     def __init__(self, axes, range, width):
@@ -43,43 +53,28 @@ class FreeLineFilter(FilterInterface):
 
     def _execute(self, wave, *axes, **kwargs):
         width = self.__calcWidthInPixel(wave, self._axes, self._width)
-        return self._execute_dask(wave, self._axes, width)
+        points = tuple((int(wave.posToPoint(p[0], self._axes[0])), int(wave.posToPoint(p[1], self._axes[1]))) for p in self.position)
+        weight = _lineWeights(points, width, (wave.data.shape[self._axes[0]], wave.data.shape[self._axes[1]]))
+        res = self._applyToPlane(_applyWeight, wave.data, self._axes, weight.shape[0], dtype=np.result_type(wave.data.dtype, float), weight=weight)
+        res = da.moveaxis(res, -1, min(self._axes))
+        return self.__setAxesAndData(wave, self._axes, points, res)
 
     def __calcWidthInPixel(self, wave, axes, width):
         ax = wave.getAxis(axes[0])
         dx = (ax[-1] - ax[0]) / (len(ax) - 1)
         return max(1, int(np.round(width / dx)))
 
-    def _execute_dask(self, wave, axes, width):
-        coord = []
-        for j in range(1 - width, width, 2):
-            x, y, size = self.__makeCoordinates(wave, axes, j)
-            coord.append(np.array([x, y]))
-        gumap = da.gufunc(_map, signature="(i,j),(p,q,r)->(m)", output_dtypes=wave.data.dtype, vectorize=True, axes=[tuple(axes), (0, 1, 2), (min(axes),)], allow_rechunk=True, output_sizes={"m": size})
-        res = gumap(wave.data, da.from_array(coord))
-        return self.__setAxesAndData(wave, axes, size, res)
-
-    def __makeCoordinates(self, wave, axes, j):
-        pos1 = (wave.posToPoint(self.position[0][0], axes[0]), wave.posToPoint(self.position[0][1], axes[1]))
-        pos2 = (wave.posToPoint(self.position[1][0], axes[0]), wave.posToPoint(self.position[1][1], axes[1]))
-        dx = (pos2[0] - pos1[0])
-        dy = (pos2[1] - pos1[1])
-        size = int(np.sqrt(dx * dx + dy * dy) + 1)
-        nor = np.sqrt(dx * dx + dy * dy)
-        dx, dy = dy / nor, -dx / nor
-        return np.linspace(pos1[0], pos2[0], size) + dx * (j * 0.5), np.linspace(pos1[1], pos2[1], size) + dy * (j * 0.5), size
-
-    def __setAxesAndData(self, wave, axes, size, res):
-        pos1 = (wave.posToPoint(self.position[0][0], axes[0]), wave.posToPoint(self.position[0][1], axes[1]))
-        pos2 = (wave.posToPoint(self.position[1][0], axes[0]), wave.posToPoint(self.position[1][1], axes[1]))
+    def __setAxesAndData(self, wave, axes, points, res):
         axis1 = wave.getAxis(axes[0])
         axis2 = wave.getAxis(axes[1])
-        dx = abs(axis1[pos1[0]] - axis1[pos2[0]])
-        dy = abs(axis2[pos1[1]] - axis2[pos2[1]])
-        d = np.sqrt(dx * dx + dy * dy)
-        axisData = np.linspace(0, d, size)
+        axisData = [np.zeros(1)]
+        for pos1, pos2 in zip(points[:-1], points[1:]):
+            dx = abs(axis1[pos1[0]] - axis1[pos2[0]])
+            dy = abs(axis2[pos1[1]] - axis2[pos2[1]])
+            d = np.sqrt(dx * dx + dy * dy)
+            axisData.append(axisData[-1][-1] + np.linspace(0, d, _segmentSize(pos1, pos2))[1:])
         newAxes = list(wave.axes)
-        newAxes[min(*axes)] = axisData
+        newAxes[min(*axes)] = np.concatenate(axisData)
         newAxes.pop(max(*axes))
         return DaskWave(res, *newAxes, **wave.note)
 
@@ -90,13 +85,44 @@ class FreeLineFilter(FilterInterface):
         return -1
 
 
-def _map(x, coords):
-    if x.dtype == complex:
-        real = np.sum([ndimage.map_coordinates(np.real(x), c, order=1) for c in coords], axis=0)
-        imag = np.sum([ndimage.map_coordinates(np.imag(x), c, order=1) for c in coords], axis=0)
-        return real + imag * 1j
-    else:
-        return np.sum([ndimage.map_coordinates(x, c, order=1) for c in coords], axis=0)
+def _segmentSize(pos1, pos2):
+    return int(np.sqrt((pos2[0] - pos1[0])**2 + (pos2[1] - pos1[1])**2) + 1)
+
+
+@functools.lru_cache(maxsize=64)
+def _lineWeights(points, width, shape):
+    """
+    Calculate sparse matrix of shape (number of points along the line, shape[0] * shape[1]) that interpolates data linearly and sums it over the width of the line.
+    """
+    x, y, nx, ny = [], [], [], []
+    for i, (pos1, pos2) in enumerate(zip(points[:-1], points[1:])):
+        size = _segmentSize(pos1, pos2)
+        dx, dy = pos2[0] - pos1[0], pos2[1] - pos1[1]
+        nor = np.sqrt(dx * dx + dy * dy)
+        start = 0 if i == 0 else 1  # the first point of the segment is the last point of the previous one
+        x.append(np.linspace(pos1[0], pos2[0], size)[start:])
+        y.append(np.linspace(pos1[1], pos2[1], size)[start:])
+        nx.append(np.full(size - start, dy / nor if nor > 0 else 0))
+        ny.append(np.full(size - start, -dx / nor if nor > 0 else 0))
+    x, y, nx, ny = [np.concatenate(v)[:, np.newaxis] for v in (x, y, nx, ny)]
+
+    offsets = np.arange(1 - width, width, 2) * 0.5
+    x, y = x + nx * offsets, y + ny * offsets
+    x0, y0 = np.floor(x).astype(int), np.floor(y).astype(int)
+    fx, fy = x - x0, y - y0
+    index = np.broadcast_to(np.arange(x.shape[0])[:, np.newaxis], x.shape)
+    rows, cols, weights = [], [], []
+    for ix, iy, w in [(x0, y0, (1 - fx) * (1 - fy)), (x0 + 1, y0, fx * (1 - fy)), (x0, y0 + 1, (1 - fx) * fy), (x0 + 1, y0 + 1, fx * fy)]:
+        valid = (ix >= 0) & (ix < shape[0]) & (iy >= 0) & (iy < shape[1]) & (w != 0)
+        rows.append(index[valid])
+        cols.append(ix[valid] * shape[1] + iy[valid])
+        weights.append(w[valid])
+    return sparse.csr_matrix((np.concatenate(weights), (np.concatenate(rows), np.concatenate(cols))), shape=(x.shape[0], shape[0] * shape[1]))
+
+
+def _applyWeight(block, weight):
+    data = block.reshape(-1, block.shape[-1])
+    return (weight @ data.T).T.reshape(block.shape[:-1] + (weight.shape[0],))
 
 
 @filterGUI(FreeLineFilter)
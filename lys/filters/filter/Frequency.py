@@ -1,21 +1,23 @@
 import numpy as np
-import dask.array as da
 from scipy import signal
-from dask.array import apply_along_axis
 
-from lys import DaskWave
+from lys import DaskWave, LinearAxis
 from lys.Qt import QtWidgets
 from lys.filters import FilterInterface, FilterSettingBase, filterGUI, addFilter
 from lys.widgets import AxisCheckLayout
 
 
-def _filt(wave, axes, b, a):
+def _filt(filter, wave, axes, b, a):
     data = wave.data
     for i in axes:
-        data = apply_along_axis(lambda x, b, a: signal.filtfilt(b, a, x), i, data, b, a, dtype=data.dtype, shape=(data.shape[i],))
+        data = filter._applyAlongAxis(_filtfilt, data, i, dtype=np.result_type(data.dtype, float), b=b, a=a)
     return DaskWave(data, *wave.axes, **wave.note)
 
 
+def _filtfilt(x, b, a, axis):
+    return signal.filtfilt(b, a, x, axis=axis)
+
+
 class LowPassFilter(FilterInterface):
     """
     Apply low-pass (butterworth) filter by scipy.signal.filtfilt.
@@ -34,7 +36,7 @@ class LowPassFilter(FilterInterface):
         self._axes = axes
 
     def _execute(self, wave, *axes, **kwargs):
-        return _filt(wave, self._axes, self._b, self._a)
+        return _filt(self, wave, self._axes, self._b, self._a)
 
     def getParameters(self):
         return {"order": self._order, "cutoff": self._cutoff, "axes": self._axes}
@@ -58,7 +60,7 @@ class HighPassFilter(FilterInterface):
         self._axes = axes
 
     def _execute(self, wave, **kwargs):
-        return _filt(wave, self._axes, self._b, self._a)
+        return _filt(self, wave, self._axes, self._b, self._a)
 
     def getParameters(self):
         return {"order": self._order, "cutoff": self._cutoff, "axes": self._axes}
@@ -82,7 +84,7 @@ class BandPassFilter(FilterInterface):
         self._axes = axes
 
     def _execute(self, wave, **kwargs):
-        return _filt(wave, self._axes, self._b, self._a)
+        return _filt(self, wave, self._axes, self._b, self._a)
 
     def getParameters(self):
         return {"order": self._order, "cutoff": self._cutoff, "axes": self._axes}
@@ -106,7 +108,7 @@ class BandStopFilter(FilterInterface):
         self._axes = axes
 
     def _execute(self, wave, **kwargs):
-        return _filt(wave, self._axes, self._b, self._a)
+        return _filt(self, wave, self._axes, self._b, self._a)
 
     def getParameters(self):
         return {"order": self._order, "cutoff": self._cutoff, "axes": self._axes}
@@ -119,9 +121,8 @@ class FourierFilter(FilterInterface):
     If *process* is not complex, postprocessing is applied to FFT data.
     For example, when *process* ="real", real part of FFT data is returned.
 
-    Note:
-        dask.array.fft requires chunk along *axes* along which the FFT is applied should be one.
-        Uses should rechunk before applying this filter by :class:`RechunkFilter`.
+    The data is rechunked automatically so that each chunk contains whole *axes*.
+    When the input is real and *process* is 'absolute' or 'real', the half spectrum is calculated by real FFT and the other half is given by the symmetry of the Fourier transformation.
 
     Args:
         axes(list of int): axes to be transformed
@@ -151,71 +152,80 @@ class FourierFilter(FilterInterface):
         self.window = window
         self.roll = roll
 
-    def __getFunction(self, process):
-        if process == "absolute":
-            func = da.absolute
-        elif process == "real":
-            func = da.real
-        elif process == "imag":
-            func = da.imag
-        elif process == "phase":
-            func = da.angle
-        elif process == 'complex':
-            def func(x):
-                return x
-        return func
-
     def _execute(self, wave, *args, **kwargs):
-        axes = self.__exeAxes(wave)
-        size = [int(wave.data.shape[ax] / 2) for ax in self.axes]
-        func = self.__getFunction(self.process)
-        data = self.__applyWindow(wave)
-        if self.type == "forward":
-            data = func(da.fft.fftn(data, axes=tuple(self.axes)))
-            if self.roll:
-                data = da.roll(data, size, axis=tuple(self.axes))
-        else:
-            if self.roll:
-                size_inv = [-s for s in size]
-                data = da.roll(data, size_inv, axis=tuple(self.axes))
-            data = func(da.fft.ifftn(data, axes=tuple(self.axes)))
-        return DaskWave(data, *axes, **wave.note)
+        axes = tuple(self.axes)
+        data = wave.data
+        if any(data.numblocks[ax] != 1 for ax in axes):
+            data = data.rechunk({i: -1 if i in axes else "auto" for i in range(data.ndim)})
+        dtype = complex if self.process == "complex" else float
+        data = data.map_blocks(_fft, axes=axes, type=self.type, process=self.process, windows=self.__getWindows(data.shape), roll=self.roll, dtype=dtype)
+        return DaskWave(data, *self.__exeAxes(wave), **wave.note)
 
     def __exeAxes(self, wave):
         axes = []
         for ax in range(wave.data.ndim):
             if ax in self.axes:
                 a = wave.getAxis(ax)
-                axis = np.fft.fftfreq(len(a), d=(np.max(a) - np.min(a)) / (len(a) - 1))
+                d = (np.max(a) - np.min(a)) / (len(a) - 1)
                 if self.roll:
-                    axis = np.roll(axis, len(a) // 2)
+                    axis = LinearAxis(-(len(a) // 2) / (len(a) * d), 1 / (len(a) * d), len(a))
+                else:
+                    axis = np.fft.fftfreq(len(a), d=d)
                 axes.append(axis)
             else:
                 axes.append(wave.axes[ax])
         return axes
 
-    def __applyWindow(self, wave):
-        windowFunc = {"Rect": None, "Hann": signal.hann, "Hamming": signal.hamming, "Blackman": signal.blackman}
-        index = ["i", "j", "k", "l", "m", "n", "o", "p", "q", "r"]
+    def __getWindows(self, shape):
+        windowFunc = {"Rect": None, "Hann": signal.windows.hann, "Hamming": signal.windows.hamming, "Blackman": signal.windows.blackman}
         f = windowFunc[self.window]
         if f is None:
-            return wave.data
-        window = []
-        fr, to = "", ""
-        for ax in range(wave.data.ndim):
-            if ax in self.axes:
-                window.append(f(wave.data.shape[ax]))
-            else:
-                window.append(np.array([1]))
-            fr += index[ax] + ","
-            to += index[ax]
-        window = np.einsum(fr[:len(fr) - 1] + "->" + to, *window)
-        return wave.data * window
+            return None
+        return [f(shape[ax]) for ax in self.axes]
 
     def getParameters(self):
         return {"axes": self.axes, "type": self.type, "process": self.process, "window": self.window, "roll": self.roll}
 
 
+_processFunctions = {"absolute": np.absolute, "real": np.real, "imag": np.imag, "phase": np.angle, "complex": lambda x: x}
+
+
+def _fft(x, axes, type, process, windows, roll):
+    """FFT of a block that contains whole *axes*."""
+    if windows is not None:
+        for ax, w in zip(axes, windows):
+            x = x * w.reshape([-1 if i == ax else 1 for i in range(x.ndim)])
+    func = _processFunctions[process]
+    shifts = [x.shape[ax] // 2 if roll else 0 for ax in axes]
+    if type == "forward":
+        if process in ["absolute", "real"] and not np.iscomplexobj(x):
+            return _roll(_rfftFull(x, axes, func), axes, shifts)
+        return _roll(func(np.fft.fftn(x, axes=axes)), axes, shifts)
+    else:
+        return func(np.fft.ifftn(_roll(x, axes, [-s for s in shifts]), axes=axes))
+
+
+def _roll(x, axes, shifts):
+    if not any(shifts):
+        return x
+    return np.roll(x, shifts, axes)
+
+
+def _rfftFull(x, axes, func):
+    """
+    Calculate func(np.fft.fftn(x, axes=axes)) for real *x* by real FFT, where func(F(-k)) = func(F(k)) because F(-k) = F(k)*.
+    """
+    half = func(np.fft.rfftn(x, axes=axes))
+    last = axes[-1]
+    n, m = x.shape[last], half.shape[last]
+
+    # negative frequencies along the last axis, F(-k) = F((N - k) % N)
+    upper = half[tuple(slice(n - m, 0, -1) if i == last else slice(None) for i in range(x.ndim))]
+    for ax in axes[:-1]:
+        upper = np.roll(np.flip(upper, ax), 1, axis=ax)
+    return np.concatenate([half, upper], axis=last)
+
+
 class _Setting1(FilterSettingBase):
     def __init__(self, dim):
         super().__init__(dim)
@@ -1,5 +1,10 @@
+import functools
+import warnings
 import numpy as np
+import dask
 import dask.array as da
+from dask.utils import parse_bytes
+from scipy import sparse
 
 from lys import DaskWave, frontCanvas
 from lys.filters import FilterInterface, FilterSettingBase, filterGUI, addFilter
@@ -7,28 +12,183 @@ from lys.Qt import QtWidgets
 from lys.widgets import AxisCheckLayout, ScientificSpinBox, RegionSelectWidget, AxisSelectionLayout
 
 
-def _getSumFunction(sumtype):
+def _integrate(data, axes, sumtype, percentile=50, accuracy=None):
+    axes = tuple(axes)
     if sumtype == "Sum":
-        return da.sum
+        return da.sum(data, axis=axes)
     elif sumtype == "Mean":
-        return da.mean
+        return da.mean(data, axis=axes)
     elif sumtype == "Max":
-        return da.max
+        return da.max(data, axis=axes)
     elif sumtype == "Min":
-        return da.min
+        return da.min(data, axis=axes)
     elif sumtype == "Median":
-        return da.median
+        return _percentile(data, axes, 50, accuracy)
+    elif sumtype == "Percentile":
+        return _percentile(data, axes, percentile, accuracy)
+    raise ValueError("Unknown sumtype: " + str(sumtype))
+
+
+def _percentile(data, axes, q, accuracy=None):
+    """
+    Calculate *q*-th percentile of dask array *data* along *axes*. NaN is ignored.
+
+    If data along *axes* fits in a chunk, the exact value is calculated blockwise.
+    Otherwise, the data is read several times so that memory usage does not depend on the size of *axes* (see :func:`_streamingPercentile`).
+    """
+    if len(axes) == 0:
+        return data
+    if np.prod([data.shape[i] for i in axes]) * data.dtype.itemsize <= parse_bytes(dask.config.get("array.chunk-size")):
+        data = data.rechunk({i: -1 if i in axes else "auto" for i in range(data.ndim)})
+        return data.map_blocks(_nanpercentile, q=q, axis=axes, drop_axis=axes, dtype=float)
+    shape = tuple(s for i, s in enumerate(data.shape) if i not in axes)
+    return da.from_delayed(dask.delayed(_streamingPercentile)(_Source(data), axes, q, accuracy), shape=shape, dtype=float)
+
+
+def _nanpercentile(x, q, axis):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN slice
+        return np.nanpercentile(x, q, axis=axis).astype(float)
+
+
+class _Source:
+    """Dask array that is not calculated by dask.delayed before the task is called."""
+
+    def __init__(self, data):
+        self.data = data
+
+    def __dask_tokenize__(self):
+        return self.data.name
+
+
+def _streamingPercentile(source, axes, q, accuracy):
+    """
+    Calculate percentile by streaming reductions. Only the histograms of shape (number of outputs, number of bins) are kept in memory.
+
+    If *accuracy* is None, exact value is found by radix selection (ten passes through the data).
+    Otherwise, the value is interpolated from a histogram between minimum and maximum (two passes), whose error is less than *accuracy* * (max - min).
+    """
+    data = source.data
+    if accuracy is None:
+        n = da.sum(~da.isnan(data), axis=axes).compute()
+    else:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN slice
+            n, lo, hi = dask.compute(da.sum(~da.isnan(data), axis=axes), da.nanmin(data, axis=axes), da.nanmax(data, axis=axes))
+    pos = q / 100 * (n - 1)
+    k = np.floor(pos).astype(np.int64)
+    if accuracy is None:
+        res = _radixSelect(data, axes, k, pos - k)
+    else:
+        res = _histogramSelect(data, axes, pos, np.asarray(lo, dtype=float), np.asarray(hi, dtype=float), max(1, int(np.ceil(1 / accuracy))))
+    return np.where(n > 0, res, np.nan)
+
+
+def _radixSelect(data, axes, k, frac):
+    """Find *k*-th smallest values by 8 bits of their keys per pass, and interpolate to the next values by *frac*."""
+    prefix, below = np.zeros(k.shape, dtype=np.uint64), np.zeros(k.shape, dtype=np.int64)
+    for shift in range(56, -1, -8):
+        counts = _countBlocks(data, axes, _radixCount, 256, _keepdims(prefix, data, axes), shift=shift).compute()
+        cum = below[..., np.newaxis] + np.cumsum(counts, axis=-1)
+        digit = np.minimum(np.sum(cum <= k[..., np.newaxis], axis=-1), 255)[..., np.newaxis]
+        below = np.take_along_axis(cum - counts, digit, axis=-1)[..., 0]
+        prefix |= digit[..., 0].astype(np.uint64) << np.uint64(shift)
+    lower = _fromKeys(prefix)
+
+    # the next value is needed only when the k-th value is not repeated
+    upper = lower.copy()
+    need = (frac > 0) & (below + np.take_along_axis(counts, digit, axis=-1)[..., 0] <= k + 1)
+    if np.any(need):
+        nxt = da.min(da.map_blocks(_above, data, _keepdims(prefix, data, axes), dtype=float), axis=axes).compute()
+        upper = np.where(need, nxt, upper)
+    with np.errstate(invalid="ignore"):
+        return np.where(frac > 0, lower + frac * (upper - lower), lower)
+
+
+def _histogramSelect(data, axes, pos, lo, hi, bins):
+    counts = _countBlocks(data, axes, _histogramCount, bins, _keepdims(lo, data, axes), _keepdims(hi, data, axes)).compute()
+    cum = np.cumsum(counts, axis=-1)
+    j = np.minimum(np.sum(cum <= np.floor(pos)[..., np.newaxis], axis=-1), bins - 1)[..., np.newaxis]
+    below = np.take_along_axis(cum - counts, j, axis=-1)[..., 0]
+    c = np.maximum(np.take_along_axis(counts, j, axis=-1)[..., 0], 1)
+    j = j[..., 0]
+    return lo + (j + np.clip((pos - below + 0.5) / c, 0, 1)) * (hi - lo) / bins
+
+
+def _keepdims(x, data, axes):
+    """Returns dask array of *x* whose chunks are the same as *data* reduced along *axes* with keepdims=True."""
+    return da.from_array(np.expand_dims(x, axes), chunks=tuple((1,) if i in axes else c for i, c in enumerate(data.chunks)))
+
+
+def _countBlocks(data, axes, func, size, *args, **kwargs):
+    """Apply func(block, *args, axes, size, **kwargs) that returns counts of shape (block shape with *axes* of size 1, *size*) to all blocks, and sum them."""
+    chunks = tuple((1,) * len(c) if i in axes else c for i, c in enumerate(data.chunks)) + ((size,),)
+    res = da.map_blocks(func, data, *args, axes=axes, size=size, chunks=chunks, new_axis=data.ndim, dtype=np.int64, meta=np.array((), dtype=np.int64), **kwargs)
+    return res.sum(axis=axes)
+
+
+def _flat(block, axes):
+    """Move *axes* to the end and reshape *block* to (number of kept elements, number of reduced elements)."""
+    kept = [i for i in range(block.ndim) if i not in axes]
+    block = np.transpose(block, kept + list(axes))
+    return block.reshape(int(np.prod(block.shape[:len(kept)])), -1)
+
+
+def _binCount(bins, mask, block, axes, size):
+    index = np.arange(bins.shape[0])[:, np.newaxis] * size + bins
+    counts = np.bincount(index[mask], minlength=bins.shape[0] * size)
+    return counts.reshape(tuple(1 if i in axes else n for i, n in enumerate(block.shape)) + (size,))
+
+
+def _radixCount(block, prefix, axes, size, shift):
+    x = _flat(block, axes)
+    keys = _orderedKeys(x)
+    mask = ~np.isnan(x)
+    if shift < 56:
+        high = np.uint64(shift + 8)
+        mask &= (keys >> high) == (_flat(prefix, axes) >> high)
+    digit = ((keys >> np.uint64(shift)) & np.uint64(255)).astype(np.int64)
+    return _binCount(digit, mask, block, axes, size)
+
+
+def _histogramCount(block, lo, hi, axes, size):
+    x = _flat(block, axes)
+    lo, hi = _flat(lo, axes), _flat(hi, axes)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        bins = np.nan_to_num(np.floor((x - lo) / (hi - lo) * size))
+    return _binCount(np.clip(bins, 0, size - 1).astype(np.int64), ~np.isnan(x), block, axes, size)
+
+
+def _above(block, prefix):
+    """Returns *block* where its key is larger than *prefix*, and inf otherwise."""
+    return np.where(~np.isnan(block) & (_orderedKeys(block) > prefix), block, np.inf)
+
+
+def _orderedKeys(x):
+    """Map float values to unsigned integers in the same order."""
+    b = np.ascontiguousarray(x, dtype=np.float64).view(np.uint64)
+    return np.where(b >> np.uint64(63) == 1, ~b, b | np.uint64(1 << 63))
+
+
+def _fromKeys(keys):
+    b = np.where(keys >> np.uint64(63) == 1, keys & np.uint64((1 << 63) - 1), ~keys)
+    return np.asarray(b, dtype=np.uint64).view(np.float64)
 
 
 class IntegralAllFilter(FilterInterface):
     """
-    Integrate wave along *axes* (implementation of np.sum, mean, max, min, and median in lys)
+    Integrate wave along *axes* (implementation of np.sum, mean, max, min, median, and percentile in lys)
+
+    Median and percentile ignore NaN. They are calculated exactly by default.
+    If data along *axes* is larger than a chunk, the data is read several times so that the memory usage is bounded. *accuracy* can be given to reduce the number of passes.
 
     See :class:`.FilterInterface.FilterInterface` for general description of Filters.
 
     Args:
         axes(list of int): axes to be integrated
-        sumtype('Sum', 'Mean', 'Max', 'Min', or 'Median')
+        sumtype('Sum', 'Mean', 'Max', 'Min', 'Median', or 'Percentile')
+        percentile(float): percentile in the range of [0, 100] used when *sumtype* is 'Percentile'.
+        accuracy(float): If it is given, median and percentile of large data are approximated, whose error is less than *accuracy* * (max - min).
 
     Example::
 
@@ -47,18 +207,19 @@ class IntegralAllFilter(FilterInterface):
 
     """
 
-    def __init__(self, axes, sumtype):
+    def __init__(self, axes, sumtype, percentile=50, accuracy=None):
         self._axes = axes
         self._sumtype = sumtype
+        self._percentile = percentile
+        self._accuracy = accuracy
 
     def _execute(self, wave, *args, **kwargs):
-        func = _getSumFunction(self._sumtype)
-        data = func(wave.data, axis=tuple(self._axes))
+        data = _integrate(wave.data, self._axes, self._sumtype, self._percentile, self._accuracy)
         ax = [wave.axes[i] for i in range(len(wave.axes)) if i not in self._axes]
         return DaskWave(data, *ax, **wave.note)
 
     def getParameters(self):
-        return {"axes": self._axes, "sumtype": self._sumtype}
+        return {"axes": self._axes, "sumtype": self._sumtype, "percentile": self._percentile, "accuracy": self._accuracy}
 
     def getRelativeDimension(self):
         return -len(self._axes)
@@ -76,7 +237,9 @@ class IntegralFilter(FilterInterface):
 
     Args:
         range(list of length 2 sequence or None): region to be integrated. It it is None, the corresponding axis is not integrated.
-        sumtype('Sum', 'Mean', 'Max', 'Min', or 'Median')
+        sumtype('Sum', 'Mean', 'Max', 'Min', 'Median', or 'Percentile')
+        percentile(float): percentile in the range of [0, 100] used when *sumtype* is 'Percentile'.
+        accuracy(float): If it is given, median and percentile of large data are approximated. See :class:`IntegralAllFilter`.
 
     Example::
 
@@ -96,16 +259,18 @@ class IntegralFilter(FilterInterface):
 
     """
 
-    def __init__(self, range, sumtype="Sum"):
+    def __init__(self, range, sumtype="Sum", percentile=50, accuracy=None):
         self._range = range
         self._sumtype = sumtype
+        self._percentile = percentile
+        self._accuracy = accuracy
 
     def _execute(self, wave, *args, **kwargs):
         key, sumaxes, intaxes = self._getIndexAndSumAxes(wave, self._range)
         axes = [wave.axes[i][k] for i, k in enumerate(key) if i not in sumaxes + intaxes]
         sumaxes = [s - np.sum(np.array(intaxes) < s) for s in sumaxes]
-        func = _getSumFunction(self._sumtype)
-        return DaskWave(func(wave.data[key], axis=tuple(sumaxes)), *axes, **wave.note)
+        data = _integrate(wave.data[key], sumaxes, self._sumtype, self._percentile, self._accuracy)
+        return DaskWave(data, *axes, **wave.note)
 
     def _getIndexAndSumAxes(self, wave, rang):
         sl = []
@@ -128,7 +293,7 @@ class IntegralFilter(FilterInterface):
         return key, list(sumaxes), list(intaxes)
 
     def getParameters(self):
-        return {"range": self._range, "sumtype": self._sumtype}
+        return {"range": self._range, "sumtype": self._sumtype, "percentile": self._percentile, "accuracy": self._accuracy}
 
     def getRelativeDimension(self):
         return -len([r for r in self._range if r is not None])
@@ -136,152 +301,168 @@ class IntegralFilter(FilterInterface):
 
 class IntegralCircleFilter(FilterInterface):
     """
-    Circular integration of wave.
+    Circular (azimuthal) integration of wave.
 
-    Circularly integrate *f*(*x*,*y*) and returns *f*(*r*).
+    Circularly average *f*(*x*,*y*) and returns *f*(*r*). If *phi* is given, *f*(*r*, *phi*) is returned, where *phi* is azimuthal angle in degree (-180 to 180).
 
-    This filter is under development. Do not use.
+    Each pixel is divided into subpixels that are assigned to the radial (and azimuthal) bins.
+    The weights of the pixels are calculated once for each geometry, and applied to all images by sparse matrix product.
+    NaN in the data is ignored. Bins that contain no pixel are NaN.
 
     See :class:`.FilterInterface.FilterInterface` for general description of Filters.
 
     Args:
         center(tuple of size 2): position where *r* = 0
-        radiuses(tuple of size 2):
+        radiuses(tuple of size 2): maximum radius *R* and the width of radial bins *dr*.
         axes(tuple of size 2): axes to be integrated, i.e. (x,y)
+        phi(int): the number of azimuthal bins. If it is 0, data is integrated over all angles.
+
+    Example::
+
+        import numpy as np
+        from lys import Wave, filters
+
+        x = np.linspace(-1, 1, 201)
+        w = Wave(np.sqrt(x[:, np.newaxis]**2 + x[np.newaxis, :]**2), x, x)
 
+        f = filters.IntegralCircleFilter(center=(0, 0), radiuses=(1, 0.1))
+        result = f.execute(w)
+        print(result.x)     # [0.05, 0.15, ..., 0.95]
+        print(result.data)  # approximately [0.05, 0.15, ..., 0.95]
     """
 
-    def __init__(self, center, radiuses, axes=(0, 1)):
+    def __init__(self, center, radiuses, axes=(0, 1), phi=0):
         self._center = center
         self._radiuses = radiuses
         self._axes = axes
+        self._phi = phi
 
     def _execute(self, wave, *args, **kwargs):
-        region, rad = _translate_unit(wave, self._center, self._radiuses, self._axes)
-        gumap = da.gufunc(_integrate_tangent, signature="(i,j),(p)->(m)",
-                          output_dtypes=wave.data.dtype, vectorize=True, axes=[tuple(self._axes), (0,), (min(self._axes),)], allow_rechunk=True, output_sizes={"m": int(region[3] / region[4])})
-        res = gumap(wave.data, da.from_array(region))
-        axes = self.__makeAxes(wave, *rad, self._axes)
+        ax1, ax2 = self._axes
+        x, y = np.asarray(wave.getAxis(ax1), dtype=float), np.asarray(wave.getAxis(ax2), dtype=float)
+        weight, nr = _circleWeights(tuple(self._center), float(self._radiuses[0]), float(self._radiuses[1]), int(self._phi), tuple(x), tuple(y))
+
+        res = self._applyToPlane(_integrateCircle, wave.data, self._axes, weight.shape[0], dtype=np.result_type(wave.data.dtype, float), weight=weight)
+
+        dr = self._radiuses[1]
+        newAxes = [(np.arange(nr) + 0.5) * dr]
+        if self._phi > 0:
+            res = res.reshape(res.shape[:-1] + (nr, self._phi))
+            newAxes.append((np.arange(self._phi) + 0.5) * 360 / self._phi - 180)
+        n = len(newAxes)
+        res = da.moveaxis(res, list(range(res.ndim - n, res.ndim)), list(range(min(ax1, ax2), min(ax1, ax2) + n)))
+        axes = [ax for i, ax in enumerate(wave.axes) if i not in (ax1, ax2)]
+        axes[min(ax1, ax2):min(ax1, ax2)] = newAxes
         return DaskWave(res, *axes, **wave.note)
 
-    def __makeAxes(self, wave, r, dr, axes):
-        result = list(np.array(wave.axes))
-        result.pop(max(*axes))
-        result.pop(min(*axes))
-        result.insert(min(*axes), np.linspace(0, r, int(r / dr)))
-        return result
-
     def getParameters(self):
-        return {"center": self._center, "radiuses": self._radiuses, "axes": self._axes}
+        return {"center": self._center, "radiuses": self._radiuses, "axes": self._axes, "phi": self._phi}
 
     def getRelativeDimension(self):
-        return -1
-
-
-def _translate_unit(wave, center, radiuses, axes):
-    cx = wave.posToPoint(center[0], axis=axes[0])
-    cy = wave.posToPoint(center[1], axis=axes[1])
-    r = np.abs(wave.posToPoint(center[0] + radiuses[0], axis=axes[0]) - cx)
-    dr = max(np.abs(wave.posToPoint(center[0] + radiuses[1], axis=axes[0]) - cx), 1)
-    dr = int(dr)
-    r = np.floor(r / dr) * dr
-    pdr = np.abs(wave.pointToPos(dr, axis=axes[0]) - wave.pointToPos(0, axis=axes[0]))
-    pr = np.abs(wave.pointToPos(int(r), axis=axes[0]) - wave.pointToPos(0, axis=axes[0]))
-    return (cx, cy, 0, r, dr), (pr, pdr)
-
-
-def _integrate_tangent(data, region):
-    if len(data) <= 2:
-        return np.empty((1,))
-    dr = region[4]
-    data = [_integrate_circle(data, (int(region[0]), int(region[1]), int(r), int(r + dr)))
-            for r in range(int(region[2]), int(region[3]), int(dr))]
-    return np.array(data)
-
-
-def _integrate_circle(data, region):
-    cx = region[0]
-    cy = region[1]
-    R1 = region[2]
-    R2 = region[3]
-    res = 0
-    n = 0
-    for px in _calcDonutPixels(R1, R2):
-        a = abs(px[0]) - 0.5
-        b = abs(px[1]) - 0.5
-        if a < b:
-            a, b = b, a
-        y, x = cx + px[0], cy + px[1]
-        if x > 0 and y > 0 and x < data.shape[1] and y < data.shape[0]:
-            if not np.isnan(data[y, x]):
-                rat = _calcArea(a, b, R2) - _calcArea(a, b, R1)
-                res += data[y, x] * rat
-                n += rat
-    if n == 0:
-        n = 1
-
-    return res / n
-
-
-def _calcArea(a, b, r):
-    if r == 0:
-        return 0
-    if np.sqrt((a + 1) * (a + 1) + (b + 1) * (b + 1)) <= r:
-        return 1
-    elif np.sqrt(a * a + b * b) <= r and np.sqrt(a * a + (b + 1) * (b + 1)) >= r:
-        b1 = np.sqrt(r * r - a * a)
-        return _int(r, b, b1) - a * (b1 - b)
-    elif np.sqrt(a * a + (b + 1) * (b + 1)) <= r and np.sqrt((a + 1) * (a + 1) + b * b) >= r:
-        return _int(r, b, b + 1) - a
-    elif np.sqrt((a + 1) * (a + 1) + b * b) <= r and np.sqrt((a + 1) * (a + 1) + (b + 1) * (b + 1)) > r:
-        b1 = np.sqrt(r * r - (a + 1) * (a + 1))
-        return (b1 - b) + _int(r, b1, b + 1) - a * (b + 1 - b1)
-    elif np.sqrt(a * a + b * b) > r:
-        return 0
-# calc int_a^b sqrt(r^2-x^2) dx
-
-
-def _int(r, a, b):
-    return 0.5 * (b * np.sqrt(r * r - b * b) + r * r * np.arcsin(b / r) - a * np.sqrt(r * r - a * a) - r * r * np.arcsin(a / r))
-
-
-def _calcDonutPixels(R1, R2):
-    res = []
-    for y1 in range(-int(np.floor(R2 + 0.5)), int(np.floor(R2 + 0.5) + 1)):
-        y1_R1 = _calcCross(y1, R1)
-        y1_R2 = _calcCross(y1, R2)
-        y1p_R1 = _calcCross(y1 + 0.5, R1)
-        y1p_R2 = _calcCross(y1 + 0.5, R2)
-        y1m_R1 = _calcCross(y1 - 0.5, R1)
-        y1m_R2 = _calcCross(y1 - 0.5, R2)
-        if y1m_R1 * y1p_R1 == 0:
-            xmin = 0
-        else:
-            xmin = int(np.round(np.amin([y1_R1, y1p_R1, y1m_R1])))
-        xmax = int(np.round(np.amax([y1_R2, y1p_R2, y1m_R2])))
-        for x1 in range(xmin, xmax + 1):
-            res.append((x1, y1))
-        for x1 in range(-xmax, -xmin + 1):
-            if x1 != 0:
-                res.append((x1, y1))
-    return res
-
-
-def _calcCross(y, R):
-    if abs(y) > R:
-        return 0
+        return -1 if self._phi == 0 else 0
+
+
+def _integrateCircle(block, weight):
+    data = block.reshape(-1, block.shape[-1])
+    nan = np.isnan(data)
+    if nan.any():
+        norm = weight @ (~nan).T.astype(float)
+        data = np.where(nan, 0, data)
     else:
-        return np.sqrt(R * R - y * y)
+        norm = np.asarray(weight.sum(axis=1))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        res = (weight @ data.T) / norm
+    return res.T.reshape(block.shape[:-1] + (weight.shape[0],))
+
+
+@functools.lru_cache(maxsize=16)
+def _circleWeights(center, R, dr, phi, x, y, sub=4):
+    """
+    Calculate sparse matrix of shape (number of bins, len(x) * len(y)), whose elements are areas of the pixels included in the bins.
+
+    Returns:
+        tuple of length 2: The sparse matrix and the number of radial bins.
+    """
+    nr = max(int(np.floor(R / dr + 1e-9)), 1)
+    nbins = nr * max(phi, 1)
+    xs, wx = _subpixels(np.array(x), sub)
+    ys, wy = _subpixels(np.array(y), sub)
+    ny = len(y)
+    keys, weights = [], []
+    step = max(1, 2**22 // (sub * sub * ny))
+    for start in range(0, len(x), step):
+        dx = xs[start:start + step, :, np.newaxis, np.newaxis] - center[0]
+        dy = ys[np.newaxis, np.newaxis, :, :] - center[1]
+        r = np.sqrt(dx**2 + dy**2)
+        bins = np.floor(r / dr).astype(int)
+        if phi > 0:
+            p = np.floor((np.arctan2(dy, dx) + np.pi) / (2 * np.pi) * phi).astype(int)
+            bins = bins * phi + np.clip(p, 0, phi - 1)
+        pix = (np.arange(start, start + dx.shape[0])[:, np.newaxis, np.newaxis, np.newaxis] * ny + np.arange(ny)[np.newaxis, np.newaxis, :, np.newaxis])
+        w = wx[start:start + step, :, np.newaxis, np.newaxis] * wy[np.newaxis, np.newaxis, :, :]
+        valid = np.broadcast_to(r < nr * dr, bins.shape)
+        key = (np.broadcast_to(bins, valid.shape)[valid] * (len(x) * ny) + np.broadcast_to(pix, valid.shape)[valid])
+        key, inv = np.unique(key, return_inverse=True)
+        keys.append(key)
+        weights.append(np.bincount(inv.ravel(), np.broadcast_to(w, valid.shape)[valid]))
+    keys, weights = np.concatenate(keys), np.concatenate(weights)
+    weight = sparse.csr_matrix((weights, (keys // (len(x) * ny), keys % (len(x) * ny))), shape=(nbins, len(x) * ny))
+    return weight, nr
+
+
+def _subpixels(x, sub):
+    """Returns positions and areas of subpixels for pixels centered at *x*."""
+    if len(x) == 1:
+        edges = np.array([x[0] - 0.5, x[0] + 0.5])
+    else:
+        edges = np.concatenate([[1.5 * x[0] - 0.5 * x[1]], (x[1:] + x[:-1]) / 2, [1.5 * x[-1] - 0.5 * x[-2]]])
+    width = edges[1:] - edges[:-1]
+    pos = edges[:-1, np.newaxis] + width[:, np.newaxis] * (np.arange(sub) + 0.5) / sub
+    return pos, np.abs(width[:, np.newaxis]) / sub * np.ones(sub)
+
+
+class _SumTypeWidget(QtWidgets.QWidget):
+    _sumtypes = ["Sum", "Mean", "Median", "Max", "Min", "Percentile"]
+
+    def __init__(self):
+        super().__init__()
+        self._type = QtWidgets.QComboBox()
+        self._type.addItems(self._sumtypes)
+        self._type.currentTextChanged.connect(self.__update)
+        self._percentile = QtWidgets.QDoubleSpinBox()
+        self._percentile.setRange(0, 100)
+        self._percentile.setValue(50)
+        self._accuracy = ScientificSpinBox()
+        self._accuracy.setToolTip("Accuracy of median and percentile relative to the range of data. If it is zero, exact value is calculated.")
+        h = QtWidgets.QHBoxLayout()
+        h.setContentsMargins(0, 0, 0, 0)
+        h.addWidget(self._type)
+        h.addWidget(QtWidgets.QLabel("Percentile"))
+        h.addWidget(self._percentile)
+        h.addWidget(QtWidgets.QLabel("Accuracy"))
+        h.addWidget(self._accuracy)
+        self.setLayout(h)
+        self.__update()
+
+    def __update(self):
+        self._percentile.setEnabled(self._type.currentText() == "Percentile")
+        self._accuracy.setEnabled(self._type.currentText() in ["Median", "Percentile"])
+
+    def getParameters(self):
+        accuracy = self._accuracy.value()
+        return {"sumtype": self._type.currentText(), "percentile": self._percentile.value(), "accuracy": accuracy if accuracy > 0 else None}
+
+    def setParameters(self, sumtype, percentile=50, accuracy=None):
+        self._type.setCurrentIndex(self._sumtypes.index(sumtype))
+        self._percentile.setValue(percentile)
+        self._accuracy.setValue(0 if accuracy is None else accuracy)
 
 
 @ filterGUI(IntegralAllFilter)
 class _IntegralAllSetting(FilterSettingBase):
-    _sumtypes = ["Sum", "Mean", "Median", "Max", "Min"]
-
     def __init__(self, dim):
         super().__init__(dim)
-        self.type = QtWidgets.QComboBox()
-        self.type.addItems(self._sumtypes)
+        self.type = _SumTypeWidget()
         self.axes = AxisCheckLayout(dim)
         self.axes.stateChanged.connect(self.dimensionChanged)
         lv = QtWidgets.QVBoxLayout()
@@ -290,21 +471,18 @@ class _IntegralAllSetting(FilterSettingBase):
         self.setLayout(lv)
 
     def getParameters(self):
-        return {"axes": self.axes.GetChecked(), "sumtype": self.type.currentText()}
+        return {"axes": self.axes.GetChecked(), **self.type.getParameters()}
 
-    def setParameters(self, axes, sumtype):
+    def setParameters(self, axes, sumtype, percentile=50, accuracy=None):
         self.axes.SetChecked(axes)
-        self.type.setCurrentIndex(self._sumtypes.index(sumtype))
+        self.type.setParameters(sumtype, percentile, accuracy)
 
 
 @ filterGUI(IntegralFilter)
 class _IntegralSetting(FilterSettingBase):
-    _sumtypes = ["Sum", "Mean", "Median", "Max", "Min"]
-
     def __init__(self, dim):
         super().__init__(dim)
-        self.type = QtWidgets.QComboBox()
-        self.type.addItems(self._sumtypes)
+        self.type = _SumTypeWidget()
         self.range = RegionSelectWidget(self, dim, check=True)
         self.range.stateChanged.connect(self.dimensionChanged)
         lv = QtWidgets.QVBoxLayout()
@@ -322,10 +500,10 @@ class _IntegralSetting(FilterSettingBase):
                     res.append(r)
             else:
                 res.append(None)
-        return {"range": res, "sumtype": self.type.currentText()}
+        return {"range": res, **self.type.getParameters()}
 
-    def setParameters(self, range, sumtype):
-        self.type.setCurrentIndex(self._sumtypes.index(sumtype))
+    def setParameters(self, range, sumtype, percentile=50, accuracy=None):
+        self.type.setParameters(sumtype, percentile, accuracy)
         checked = []
         for i, r in enumerate(range):
             checked.append(r is not None)
@@ -349,6 +527,9 @@ class _CircleSetting(FilterSettingBase):
         self.axes = [AxisSelectionLayout("Axis1", dim=dim, init=0), AxisSelectionLayout("Axis2", dim=dim, init=1)]
         self.center = [ScientificSpinBox(), ScientificSpinBox()]
         self.radiuses = [ScientificSpinBox(), ScientificSpinBox()]
+        self.phi = QtWidgets.QSpinBox()
+        self.phi.setRange(0, 100000)
+        self.phi.valueChanged.connect(self.dimensionChanged)
         l0 = QtWidgets.QGridLayout()
         l0.addWidget(QtWidgets.QLabel("Center1"), 0, 0)
         l0.addWidget(self.center[0], 1, 0)
@@ -358,7 +539,9 @@ class _CircleSetting(FilterSettingBase):
         l0.addWidget(self.radiuses[0], 1, 2)
         l0.addWidget(QtWidgets.QLabel("dr"), 0, 3)
         l0.addWidget(self.radiuses[1], 1, 3)
-        l0.addWidget(QtWidgets.QPushButton("Load from freeline", clicked=self._LoadFromFreeLine), 1, 4)
+        l0.addWidget(QtWidgets.QLabel("Angle bins (0: all)"), 0, 4)
+        l0.addWidget(self.phi, 1, 4)
+        l0.addWidget(QtWidgets.QPushButton("Load from freeline", clicked=self._LoadFromFreeLine), 1, 5)
         lh = QtWidgets.QVBoxLayout()
         lh.addLayout(self.axes[0])
         lh.addLayout(self.axes[1])
@@ -366,15 +549,16 @@ class _CircleSetting(FilterSettingBase):
         self.setLayout(lh)
 
     def getParameters(self):
-        return {"center": [c.value() for c in self.center], "radiuses": [c.value() for c in self.radiuses], "axes": [c.getAxis() for c in self.axes]}
+        return {"center": [c.value() for c in self.center], "radiuses": [c.value() for c in self.radiuses], "axes": [c.getAxis() for c in self.axes], "phi": self.phi.value()}
 
-    def setParameters(self, center, radiuses, axes):
+    def setParameters(self, center, radiuses, axes, phi=0):
         for c, i in zip(self.center, center):
             c.setValue(i)
         for c, i in zip(self.radiuses, radiuses):
             c.setValue(i)
         for c, i in zip(self.axes, axes):
             c.setAxis(i)
+        self.phi.setValue(phi)
 
     def _LoadFromFreeLine(self):
         c = frontCanvas()
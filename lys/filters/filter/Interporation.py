@@ -1,5 +1,8 @@
+import functools
+
 import numpy as np
-from scipy.interpolate import interpn, interp2d, interp1d
+import dask.array as da
+from scipy import sparse, interpolate
 
 from lys import DaskWave
 from lys.filters import FilterInterface, FilterSettingBase, filterGUI, addFilter
@@ -8,10 +11,20 @@ from lys.Qt import QtWidgets
 
 class InterpFilter(FilterInterface):
     """
-    Interpolate data by scipy.interpolate
+    Interpolate data.
+
+    The data is resampled along each axis separately by sparse interpolation weights, which are calculated once for each pair of old and new axes.
+    The interpolated axes are not rechunked into a single chunk, so that large data can be interpolated.
+    The axes of data can be non-uniform.
+
+    The new axis is np.linspace(min(axis), max(axis), size[i]) if size[i] is not 0, or *axes[i]* if it is given (regridding).
+    The points outside the original axis are NaN.
 
     Args:
-        size(tuple of int): new shape
+        size(tuple of int): new shape. 0 means that the axis is not interpolated.
+        mode('auto', 'linear', 'cubic', 'nearest', 'quadratic spline', or 'cubic spline'): interpolation mode. 'cubic' is Lagrange interpolation by neighboring four points.
+            'auto' means 'quadratic spline' when one axis is interpolated, 'cubic spline' when two axes are interpolated, and 'linear' otherwise.
+        axes(list of array or None): new axes. None means that the axis is determined by *size*.
 
     Example::
 
@@ -27,55 +40,144 @@ class InterpFilter(FilterInterface):
 
     """
 
-    def __init__(self, size):
+    def __init__(self, size, mode="auto", axes=None):
         self._size = size
+        self._mode = mode
+        self._axes = axes
 
     def _execute(self, wave, *args, **kwargs):
-        sigList1, sigList2 = "a,b,c,d,e,f,g,h", "i,j,k,l,m,n,o,p"
-        indice = [i for i in range(len(self._size)) if self._size[i] != 0]
-        if len(indice) == 0:
-            return
-        sig = "(" + sigList1[:len(indice) * 2 - 1] + ")->(" + sigList2[:len(indice) * 2 - 1] + ")"
-        newAxes = self._getNewAxes(wave)
-        oldAxes = [wave.getAxis(i) for i in indice]
-        axes_used = [newAxes[i] for i in indice]
-        if len(indice) in [1, 2]:
-            def func(x):
-                if x.ndim == 2:
-                    intp = interp2d(oldAxes[1], oldAxes[0], x, kind="cubic")
-                    return intp(axes_used[1], axes_used[0])
-                else:
-                    intp = interp1d(oldAxes[0], x, kind='quadratic')
-                    return intp(axes_used[0])
-        else:
-            order = list(range(1, len(indice) + 1)) + [0]
-            mesh = np.array(np.meshgrid(*axes_used, indexing="ij")).transpose(*order)
-
-            def func(x):
-                return interpn(oldAxes, x, mesh)
-        output_sizes = {sigList2[j * 2]: len(newAxes[i]) for j, i in enumerate(indice)}
-        uf = self._generalizedFunction(wave, func, sig, [indice, indice], output_sizes=output_sizes)
-        return DaskWave(self._applyFunc(uf, wave.data), *newAxes, **wave.note)
+        newAxes, indice = self._getNewAxes(wave)
+        data, mode = wave.data, self._mode
+        if mode == "auto":
+            mode = {1: "quadratic spline", 2: "cubic spline"}.get(len(indice), "linear")
+        for i in sorted(indice, key=lambda i: len(newAxes[i]) / data.shape[i]):  # shrink data first
+            data = _resample(data, i, wave.getAxis(i), newAxes[i], mode)
+        return DaskWave(data, *newAxes, **wave.note)
 
     def _getNewAxes(self, wave):
-        axes = []
-        for i in range(len(self._size)):
+        axes, indice = [], []
+        for i in range(wave.data.ndim):
             ax = wave.getAxis(i)
-            if self._size[i] == 0:
-                axes.append(ax)
-            else:
+            if self._axes is not None and i < len(self._axes) and self._axes[i] is not None:
+                axes.append(np.asarray(self._axes[i]))
+                indice.append(i)
+            elif i < len(self._size) and self._size[i] != 0:
                 axes.append(np.linspace(min(ax), max(ax), self._size[i]))
-        return axes
+                indice.append(i)
+            else:
+                axes.append(ax)
+        return axes, indice
 
     def getParameters(self):
-        return {"size": self._size}
+        return {"size": self._size, "mode": self._mode, "axes": self._axes}
+
+
+def _resample(data, axis, old, new, mode):
+    """
+    Resample dask array *data* along *axis* from *old* axis to *new* axis.
+
+    The output is split into as many chunks as the input along *axis*, and each chunk is calculated only from the input points required for it.
+    """
+    weight, invalid = _weights(old, new, mode)
+    dtype = np.result_type(data.dtype, float)
+    bounds = np.linspace(0, len(new), data.numblocks[axis] + 1).astype(int)
+    pieces = []
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        if start == stop:
+            continue
+        w = weight[start:stop]
+        lo, hi = (w.indices.min(), w.indices.max() + 1) if w.nnz > 0 else (0, 1)
+        sl = [slice(None)] * data.ndim
+        sl[axis] = slice(lo, hi)
+        piece = data[tuple(sl)].rechunk({axis: -1})
+        chunks = piece.chunks[:axis] + ((stop - start,),) + piece.chunks[axis + 1:]
+        func = functools.partial(_contract, weight=w[:, lo:hi], invalid=invalid[start:stop], axis=axis, dtype=dtype)
+        pieces.append(piece.map_blocks(func, dtype=dtype, chunks=chunks, meta=np.array((), dtype=dtype)))
+    return da.concatenate(pieces, axis=axis)
+
+
+def _contract(block, weight, invalid, axis, dtype):
+    x = np.moveaxis(block, axis, 0)
+    res = weight @ x.reshape(x.shape[0], -1)
+    res = np.asarray(res, dtype=dtype).reshape((weight.shape[0],) + x.shape[1:])
+    res[invalid] = np.nan
+    return np.moveaxis(res, 0, axis)
+
+
+def _weights(old, new, mode):
+    return _cachedWeights(tuple(np.asarray(old, dtype=float)), tuple(np.asarray(new, dtype=float)), mode)
+
+
+@functools.lru_cache(64)
+def _cachedWeights(old, new, mode):
+    """
+    Returns sparse matrix W of shape (len(new), len(old)) and boolean array of the points outside *old*.
+    Data along the axis is interpolated by W @ data.
+    """
+    old, new = np.array(old), np.array(new)
+    order = np.argsort(old, kind="stable")
+    x, n = old[order], len(old)
+    tol = 1e-9 * (x[-1] - x[0])
+    invalid = (new < x[0] - tol) | (new > x[-1] + tol)
+    if mode == "nearest":
+        j = np.clip(np.searchsorted(x, new), 1, max(n - 1, 1)) if n > 1 else np.zeros(len(new), dtype=int)
+        if n > 1:
+            j = np.where(new - x[j - 1] <= x[j] - new, j - 1, j)
+        stencil, w = j[:, None], np.ones((len(new), 1))
+    elif mode in ["linear", "cubic"]:
+        m = min({"linear": 2, "cubic": 4}[mode], n)
+        i = np.clip(np.searchsorted(x, new, side="right") - 1, 0, max(n - 2, 0))
+        stencil = np.clip(i - (m // 2 - 1), 0, n - m)[:, None] + np.arange(m)
+        p = x[stencil]
+        w = np.ones(p.shape)
+        for j in range(m):
+            for k in range(m):
+                if k != j:
+                    w[:, j] *= (new - p[:, k]) / (p[:, j] - p[:, k])
+    elif mode in ["quadratic spline", "cubic spline"]:
+        weight = _splineWeights(x, new, {"quadratic spline": 2, "cubic spline": 3}[mode])
+        weight = sparse.diags((~invalid).astype(float)) @ weight[:, np.argsort(order)]
+        invalid.flags.writeable = False
+        return weight.tocsr(), invalid
+    else:
+        raise ValueError("Unknown interpolation mode: " + str(mode))
+    w[invalid] = 0
+    rows = np.repeat(np.arange(len(new)), stencil.shape[1])
+    weight = sparse.csr_matrix((w.ravel(), (rows, order[stencil].ravel())), shape=(len(new), n))
+    invalid.flags.writeable = False
+    return weight, invalid
+
+
+def _splineWeights(x, new, k, block=256):
+    """
+    Returns weights of the interpolating B-spline of degree *k* (not-a-knot condition) for sorted *x*.
+    The spline is linear in data, so the weights are obtained by interpolating the columns of the identity matrix.
+    They decay exponentially from each point, and weights smaller than 1e-13 are discarded.
+    """
+    n = len(x)
+    k = min(k, n - 1)
+    if k == 0:
+        return sparse.csr_matrix(np.ones((len(new), 1)))
+    new = np.clip(new, x[0], x[-1])
+    parts = []
+    for start in range(0, n, block):
+        m = min(block, n - start)
+        eye = np.zeros((n, m))
+        eye[start + np.arange(m), np.arange(m)] = 1
+        w = interpolate.make_interp_spline(x, eye, k=k)(new)
+        w[np.abs(w) < 1e-13] = 0
+        parts.append(sparse.csr_matrix(w))
+    return sparse.hstack(parts).tocsr()
 
 
 @filterGUI(InterpFilter)
 class _InterpSetting(FilterSettingBase):
+    _modes = ["auto", "cubic", "linear", "nearest", "quadratic spline", "cubic spline"]
+
     def __init__(self, dim):
         super().__init__(dim)
         self._vals = []
+        self._axes = None
         self._layout = QtWidgets.QGridLayout()
         for d in range(dim):
             self._layout.addWidget(QtWidgets.QLabel("Axis" + str(d + 1)), 0, d)
@@ -83,14 +185,20 @@ class _InterpSetting(FilterSettingBase):
             v.setRange(0, 100000)
             self._vals.append(v)
             self._layout.addWidget(v, 1, d)
+        self._mode = QtWidgets.QComboBox()
+        self._mode.addItems(self._modes)
+        self._layout.addWidget(QtWidgets.QLabel("Mode"), 2, 0)
+        self._layout.addWidget(self._mode, 2, 1)
         self.setLayout(self._layout)
 
     def getParameters(self):
-        return {"size": [v.value() for v in self._vals]}
+        return {"size": [v.value() for v in self._vals], "mode": self._mode.currentText(), "axes": self._axes}
 
-    def setParameters(self, size):
+    def setParameters(self, size, mode="auto", axes=None):
         for v, s in zip(self._vals, size):
             v.setValue(s)
+        self._mode.setCurrentIndex(self._modes.index(mode))
+        self._axes = axes
 
 
 addFilter(InterpFilter, gui=_InterpSetting, guiName="Interpolation", guiGroup="Resize and interpolation")
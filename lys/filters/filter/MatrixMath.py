@@ -26,10 +26,13 @@ class SelectIndexFilter(FilterInterface):
     def _execute(self, wave, **kwargs):
         axes = list(wave.axes)
         axes.pop(self._axis)
+        data = wave.data[self._sliceKey(wave)]
+        return DaskWave(data, *axes, **wave.note)
+
+    def _sliceKey(self, wave):
         sl = [slice(None)] * wave.data.ndim
         sl[self._axis] = self._index
-        data = wave.data[tuple(sl)]
-        return DaskWave(data, *axes, **wave.note)
+        return tuple(sl)
 
     def getParameters(self):
         return {"axis": self._axis, "index": self._index}
@@ -70,12 +73,12 @@ class SliceFilter(FilterInterface):
                 self._sl.append(slice(*s))
 
     def _execute(self, wave, **kwargs):
-        slices = self._sl
-        axes = [wave.axes[i][s] for i, s in enumerate(slices) if not self._isChangeDim(s)]
-        for i, s in enumerate(slices):
-            if self._isChangeDim(s):
-                slices[i] = s.start
-        return DaskWave(wave.data[tuple(slices)], *axes, **wave.note)
+        key = self._sliceKey(wave)
+        axes = [wave.axes[i][s] for i, s in enumerate(key) if isinstance(s, slice)]
+        return DaskWave(wave.data[key], *axes, **wave.note)
+
+    def _sliceKey(self, wave):
+        return tuple(s.start if self._isChangeDim(s) else s for s in self._sl)
 
     def _isChangeDim(self, slice):
         if slice.start is None:
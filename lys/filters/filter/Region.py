@@ -1,4 +1,5 @@
-import dask.array as da
+import numpy as np
+from scipy import ndimage
 
 from lys import DaskWave
 from lys.Qt import QtWidgets
@@ -16,6 +17,8 @@ class NormalizeFilter(FilterInterface):
     I_sliced is determined by *range* parameter. 
     For example, when range= [None, (0,1), (2,3), None], I_sliced = Int_0^1 Int_1^2 dydz I(x,y,z,t).
 
+    N is calculated by reduction of each chunk and broadcasted to the data, so that the data is not copied.
+
     Args: 
         range(sqeuence of length-2 float or None): see description above.
         axis(tuple of int): axes along which the wave is integrated.
@@ -24,7 +27,7 @@ class NormalizeFilter(FilterInterface):
     def __init__(self, range, axis):
         self._range = range
         if isinstance(axis, int):
-            self._axis = [axis]
+            axis = [axis]
         self._axis = axis
 
     def _makeSlice(self, wave):
@@ -40,17 +43,8 @@ class NormalizeFilter(FilterInterface):
         return tuple(sl)
 
     def _execute(self, wave, **kwargs):
-        letters = ["a", "b", "c", "d", "e", "f", "g", "h", "i", "j", "k", "l", "m", "n"]
-        nor = 1 / wave.data[self._makeSlice(wave)].mean(axis=self._axis)
-        subscripts = ""
-        intaxes = ""
-        for i in range(wave.data.ndim):
-            subscripts += letters[i]
-            if i not in self._axis:
-                intaxes += letters[i]
-        subscripts = subscripts + "," + intaxes + "->" + subscripts
-        data = da.einsum(subscripts, wave.data, nor)
-        return DaskWave(data, *wave.axes, **wave.note)
+        ref = _regionReference(wave.data, self._makeSlice(wave), self._axis)
+        return DaskWave(_normalize(wave.data, ref, "Divide"), *wave.axes, **wave.note)
 
     def getParameters(self):
         return {"range": self._range, "axis": self._axis}
@@ -63,35 +57,59 @@ class ReferenceNormalizeFilter(FilterInterface):
     When data.ndim=2 and *axis* = 1, type='Divide', refIndex=5, data is normalized as
     data[:,0] = data[:,0]/data[:,5], data[:,1]=data[:,1]/dsata[:,5], ...
 
+    If *refIndex* is a tuple (start, stop), the mean of data[:, start:stop] is used as reference.
+    If *window* is given, the moving average of *window* points along *axis* is used as reference (running reference) instead of *refIndex*.
+
+    The reference is broadcasted to the data, so that it is not copied along *axis*.
+
     Args:
         axis(int): axis along which data is normalized.
         type('Diff' or 'Divide'): operator between data and reference.
-        refIndex(int): index of reference data.
+        refIndex(int or length-2 tuple of int): index or index range of reference data.
+        window(int): the number of points of the moving average used as running reference.
     """
 
-    def __init__(self, axis, type, refIndex):
+    def __init__(self, axis, type, refIndex, window=None):
         self._type = type
         self._axis = axis
         self._ref = refIndex
+        self._window = window
 
     def _execute(self, wave, *axes, **kwargs):
-        ref = self.__makeReference(wave)
-        if self._type == "Diff":
-            data = wave.data.astype(float) - ref
-        if self._type == "Divide":
-            data = wave.data.astype(float) / ref
+        data = _normalize(wave.data, self.__makeReference(wave), self._type)
         return DaskWave(data, *wave.axes, **wave.note)
 
     def __makeReference(self, wave):
+        if self._window is not None:
+            depth = [0] * wave.data.ndim
+            depth[self._axis] = self._window // 2 + 1
+            data = wave.data.astype(np.result_type(wave.data.dtype, float))
+            return self._applyWithHalo(ndimage.uniform_filter1d, data, depth, size=self._window, axis=self._axis, mode="nearest")
+        if isinstance(self._ref, (list, tuple)):
+            index = slice(*self._ref)
+        else:
+            index = slice(self._ref, self._ref + 1 or None)
         sl = [slice(None)] * wave.data.ndim
-        sl[self._axis] = self._ref
-        order = list(range(1, wave.data.ndim))
-        order.insert(self._axis, 0)
-        res = da.stack([wave.data[tuple(sl)]] * wave.data.shape[self._axis]).transpose(*order)
-        return res
+        sl[self._axis] = index
+        return _regionReference(wave.data, tuple(sl), [self._axis])
 
     def getParameters(self):
-        return {"axis": self._axis, "type": self._type, "refIndex": self._ref}
+        return {"axis": self._axis, "type": self._type, "refIndex": self._ref, "window": self._window}
+
+
+def _regionReference(data, key, axes):
+    """Returns the mean of data[key] along *axes*. Reduced axes are kept with length 1 so that the result is broadcastable to *data*."""
+    return data[key].mean(axis=tuple(axes), keepdims=True)
+
+
+def _normalize(data, ref, type):
+    """Normalize *data* by *ref* that is broadcastable to *data*."""
+    data = data.astype(np.result_type(data.dtype, float))
+    if type == "Diff":
+        return data - ref
+    if type == "Divide":
+        return data / ref
+    raise ValueError("Unknown normalization type: " + str(type))
 
 
 class SelectRegionFilter(FilterInterface):
@@ -123,12 +141,12 @@ class SelectRegionFilter(FilterInterface):
         self._range = range
 
     def _execute(self, wave, *axes, **kwargs):
-        key = self._makeSlice(wave)
+        key = self._sliceKey(wave)
         data = wave.data[key]
         axes = [wave.getAxis(i)[s] for i, s in enumerate(key)]
         return DaskWave(data, *axes, **wave.note)
 
-    def _makeSlice(self, wave):
+    def _sliceKey(self, wave):
         sl = []
         for i, r in enumerate(self._range):
             if r is None:
@@ -175,28 +193,40 @@ class _ReferenceNormalizeSetting(FilterSettingBase):
         self.__type = QtWidgets.QComboBox()
         self.__type.addItems(["Diff", "Divide"])
         self.__ref = QtWidgets.QComboBox()
-        self.__ref.addItems(["First", "Last"])
+        self.__ref.addItems(["First", "Last", "Running"])
+        self.__ref.currentTextChanged.connect(lambda t: self.__window.setEnabled(t == "Running"))
+        self.__window = QtWidgets.QSpinBox()
+        self.__window.setRange(1, 100000)
+        self.__window.setValue(5)
+        self.__window.setEnabled(False)
         hbox = QtWidgets.QHBoxLayout()
         hbox.addLayout(self.__axis)
         hbox.addWidget(self.__type)
         hbox.addWidget(self.__ref)
+        hbox.addWidget(self.__window)
         self.setLayout(hbox)
 
     def getParameters(self):
         ref = self.__ref.currentText()
+        window = None
         if ref == "First":
             ref = 0
-        else:
+        elif ref == "Last":
             ref = -1
-        return {"axis": self.__axis.getAxis(), "type": self.__type.currentText(), "refIndex": ref}
+        else:
+            ref, window = 0, self.__window.value()
+        return {"axis": self.__axis.getAxis(), "type": self.__type.currentText(), "refIndex": ref, "window": window}
 
-    def setParameters(self, axis, type, refIndex):
+    def setParameters(self, axis, type, refIndex, window=None):
         self.__axis.setAxis(axis)
         if type == "Diff":
             self.__type.setCurrentIndex(0)
         else:
             self.__type.setCurrentIndex(1)
-        if refIndex == 0:
+        if window is not None:
+            self.__window.setValue(window)
+            self.__ref.setCurrentIndex(2)
+        elif refIndex == 0:
             self.__ref.setCurrentIndex(0)
         else:
             self.__ref.setCurrentIndex(1)
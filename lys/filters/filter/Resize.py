@@ -1,8 +1,7 @@
 import numpy as np
 import dask.array as da
-import itertools
 
-from lys import DaskWave
+from lys import DaskWave, LinearAxis
 from lys.Qt import QtWidgets
 from lys.filters import FilterInterface, FilterSettingBase, filterGUI, addFilter
 from lys.widgets import kernelSizeLayout, AxisCheckLayout, ScientificSpinBox
@@ -12,12 +11,19 @@ class ReduceSizeFilter(FilterInterface):
     """
     Reduce size of data.
 
-    When *kernel* = (xn,yn), shape of data is reduced to 1/xn and 1/yn along both x and y direction, respectively. 
+    When *kernel* = (xn,yn), shape of data is reduced to 1/xn and 1/yn along both x and y direction, respectively.
+    Each xn*yn bin is reduced to a value by *sumtype*.
 
     This filter is used to gain signal to noise ratio by summation.
 
+    When the shape of data is not divisible by *kernel*, the points at the end of data are treated according to *edge*.
+    If *edge* is 'trim', these points are discarded. If *edge* is 'pad', data is padded by zero.
+    If *edge* is 'partial', the last bin is reduced by the available points (NaN is ignored in this case).
+
     Args:
         kernel(sequence of int): see above description.
+        sumtype('Sum', 'Mean', 'Max', 'Min', or 'Median'): function used to reduce each bin.
+        edge('trim', 'pad', or 'partial'): see above description.
 
     Example::
 
@@ -32,27 +38,37 @@ class ReduceSizeFilter(FilterInterface):
         print(result.x)      # [0, 2, 4]
     """
 
-    def __init__(self, kernel):
+    def __init__(self, kernel, sumtype="Mean", edge="trim"):
         self.kernel = kernel
+        self.sumtype = sumtype
+        self.edge = edge
 
     def _execute(self, wave, *args, **kwargs):
+        kernel = {i: int(self.kernel[i]) if i < len(self.kernel) else 1 for i in range(wave.data.ndim)}
+        data, func = wave.data, _reductions[self.sumtype]
+        pad = [(0, -n % kernel[i]) for i, n in enumerate(data.shape)]
+        if self.edge != "trim" and any(p for _, p in pad):
+            if self.edge == "pad":
+                data = da.pad(data, pad, mode="constant")
+            else:
+                data = da.pad(data.astype(np.result_type(data.dtype, float)), pad, mode="constant", constant_values=np.nan)
+                func = _nanReductions[self.sumtype]
+        data = da.coarsen(func, data, kernel, trim_excess=True)
+
         axes = []
-        for i, k in enumerate(self.kernel):
-            a = wave.axes[i]
+        for i, a in enumerate(wave.axes):
             if (a == np.array(None)).all():
                 axes.append(a)
             else:
-                axes.append(wave.axes[i][0::k])
-        res = []
-        rans = [range(k) for k in self.kernel]
-        for list in itertools.product(*rans):
-            sl = tuple([slice(x, None, step) for x, step in zip(list, self.kernel)])
-            res.append(wave.data[sl])
-        res = da.mean(da.stack(res), axis=0)
-        return DaskWave(res, *axes, **wave.note)
+                axes.append(a[0:data.shape[i] * kernel[i]:kernel[i]])
+        return DaskWave(data, *axes, **wave.note)
 
     def getParameters(self):
-        return {"kernel": self.kernel}
+        return {"kernel": self.kernel, "sumtype": self.sumtype, "edge": self.edge}
+
+
+_reductions = {"Sum": np.sum, "Mean": np.mean, "Max": np.max, "Min": np.min, "Median": np.median}
+_nanReductions = {"Sum": np.nansum, "Mean": np.nanmean, "Max": np.nanmax, "Min": np.nanmin, "Median": np.nanmedian}
 
 
 class PaddingFilter(FilterInterface):
@@ -110,13 +126,13 @@ class PaddingFilter(FilterInterface):
         s = axis_old[0]
         e = axis_old[-1]
         newlen = len(axis_old) + self.size
-        d = (e - s) / (len(axis_old) - 1) * (newlen - 1)
+        step = (e - s) / (len(axis_old) - 1)
         if self.direction == "first":
-            axis_new = np.linspace(e - d, e, newlen)
+            axis_new = LinearAxis(s - step * self.size, step, newlen)
         elif self.direction == "last":
-            axis_new = np.linspace(s, s + d, newlen)
+            axis_new = LinearAxis(s, step, newlen)
         else:
-            axis_new = np.linspace(e - d, s + d, len(axis_old) + 2 * self.size)
+            axis_new = LinearAxis(s - step * self.size, step, len(axis_old) + 2 * self.size)
         return axis_new
 
     def getParameters(self):
@@ -125,16 +141,33 @@ class PaddingFilter(FilterInterface):
 
 @filterGUI(ReduceSizeFilter)
 class _ReduceSizeSetting(FilterSettingBase):
+    _sumtypes = ["Mean", "Sum", "Max", "Min", "Median"]
+    _edges = ["trim", "pad", "partial"]
+
     def __init__(self, dimension=2):
         super().__init__(dimension)
-        self._layout = kernelSizeLayout(dimension, odd=False)
+        self._kernel = kernelSizeLayout(dimension, odd=False)
+        self._sumtype = QtWidgets.QComboBox()
+        self._sumtype.addItems(self._sumtypes)
+        self._edge = QtWidgets.QComboBox()
+        self._edge.addItems(self._edges)
+        h = QtWidgets.QHBoxLayout()
+        h.addWidget(QtWidgets.QLabel("Type"))
+        h.addWidget(self._sumtype)
+        h.addWidget(QtWidgets.QLabel("Edge"))
+        h.addWidget(self._edge)
+        self._layout = QtWidgets.QVBoxLayout()
+        self._layout.addLayout(self._kernel)
+        self._layout.addLayout(h)
         self.setLayout(self._layout)
 
     def getParameters(self):
-        return {"kernel": self._layout.getKernelSize()}
+        return {"kernel": self._kernel.getKernelSize(), "sumtype": self._sumtype.currentText(), "edge": self._edge.currentText()}
 
-    def setParameters(self, kernel):
-        self._layout.setKernelSize(kernel)
+    def setParameters(self, kernel, sumtype="Mean", edge="trim"):
+        self._kernel.setKernelSize(kernel)
+        self._sumtype.setCurrentIndex(self._sumtypes.index(sumtype))
+        self._edge.setCurrentIndex(self._edges.index(edge))
 
 
 @filterGUI(PaddingFilter)
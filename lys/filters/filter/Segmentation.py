@@ -1,7 +1,5 @@
 import numpy as np
-import dask.array as da
-from scipy.signal import medfilt
-from scipy.ndimage import gaussian_filter
+from scipy import ndimage
 
 
 from lys import DaskWave
@@ -75,14 +73,16 @@ class AdaptiveThresholdFilter(FilterInterface):
         self._axes = axes
 
     def _execute(self, wave, *args, **kwargs):
-        def f(x):
-            return _applyMask(x, self._method, self._output, self._size, self._c)
-        sig = "("
-        for i in range(len(self._axes)):
-            sig += "ijklmnopqrst"[i] + ","
-        sig = sig[:-1] + ")"
-        gumap = da.gufunc(f, signature=sig + "->" + sig, output_dtypes=float, vectorize=True, axes=[tuple(self._axes), tuple(self._axes)], allow_rechunk=True)
-        return DaskWave(gumap(wave.data), *wave.axes, **wave.note)
+        size = [self._size if i in self._axes else 0 for i in range(wave.data.ndim)]
+        data = self._applyWithHalo(_applyMask, wave.data, self._getDepth(wave), dtype=float, method=self._method, output=self._output, size=size, c=self._c)
+        return DaskWave(data, *wave.axes, **wave.note)
+
+    def _getDepth(self, wave):
+        if self._method == "Median":
+            d = int(self._size) // 2
+        else:
+            d = int(4 * self._size + 0.5)  # gaussian_filter truncates the kernel at 4 sigma
+        return [d if i in self._axes else 0 for i in range(wave.data.ndim)]
 
     def getParameters(self):
         return {"size": self._size, "c": self._c, "mode": self._method, "output": self._output, "axes": self._axes}
@@ -90,9 +90,10 @@ class AdaptiveThresholdFilter(FilterInterface):
 
 def _applyFilter(data, size, method):
     if method == 'Median':
-        return medfilt(data, kernel_size=size)
+        # zero padding as scipy.signal.medfilt
+        return ndimage.median_filter(data, size=[max(int(s), 1) for s in size], mode="constant")
     else:
-        return gaussian_filter(data, sigma=size)
+        return ndimage.gaussian_filter(data, sigma=size)
 
 
 def _applyMask(data, method, output, size, c):
@@ -1,16 +1,19 @@
-from scipy.ndimage import interpolation
 import numpy as np
 import dask.array as da
 
-from lys import DaskWave
+from lys import DaskWave, LinearAxis
 from lys.Qt import QtWidgets
 from lys.filters import FilterInterface, FilterSettingBase, filterGUI, addFilter
 from lys.widgets import ScientificSpinBox, AxisCheckLayout
 
+from .Transform import _affine, _shiftMap
+
 
 class ShiftFilter(FilterInterface):
     """
-    Shift data by scipy.ndimage.interpolation.shift.
+    Shift data with linear interpolation.
+
+    The shifted axes are transformed two at a time by the affine engine shared with the transform filters such as :class:`Rotation2DFilter`.
 
     Args:
         shift(tuple of float): The shift along the axes.
@@ -29,15 +32,32 @@ class ShiftFilter(FilterInterface):
             ax = wave.getAxis(i)
             dx = (ax[-1] - ax[0]) / (len(ax) - 1)
             shi[i] = shi[i] / dx
-        data = wave.data
-        for ax, s in enumerate(shi):
-            data = da.apply_along_axis(interpolation.shift, ax, data.astype(float), s, dtype=float, shape=(data.shape[ax],), order=order, cval=0)
+        shi = shi + [0] * (wave.data.ndim - len(shi))
+        data = wave.data.astype(float)
+        if data.ndim == 1:
+            data = _shift(data[:, np.newaxis], shi + [0], order)[:, 0]
+        else:
+            data = _shift(data, shi, order)
         return DaskWave(data, *wave.axes, **wave.note)
 
     def getParameters(self):
         return {"shift": self._s}
 
 
+def _shift(data, shift, order):
+    """Shift dask array *data* by *shift* points. Each pair of shifted axes is transformed by a single map."""
+    axes = [ax for ax, s in enumerate(shift) if s != 0]
+    if len(axes) % 2 == 1:
+        # the last shifted axis is paired with an unshifted (or already shifted) axis, preferably not chunked.
+        rest = [ax for ax in range(data.ndim) if ax not in axes] or axes[:-1]
+        axes.append(min(rest, key=lambda ax: data.numblocks[ax]))
+    shift = list(shift)
+    for ax1, ax2 in zip(axes[::2], axes[1::2]):
+        data = _affine(data, (ax1, ax2), [_shiftMap((shift[ax1], shift[ax2]))], order=order, cval=0)
+        shift[ax1] = shift[ax2] = 0
+    return data
+
+
 class ReverseFilter(FilterInterface):
     """
     Reverse data by dask.array.flip
@@ -123,9 +143,9 @@ class ReflectFilter(FilterInterface):
         end = axis[len(axis) - 1]
         d = (end - start) / (len(axis) - 1)
         if type == "last":
-            return np.linspace(start, start + d * (2 * len(axis) - 1), 2 * len(axis))
+            return LinearAxis(start, d, 2 * len(axis))
         if type == "first":
-            return np.linspace(end - d * (2 * len(axis) - 1), end, 2 * len(axis))
+            return LinearAxis(end - d * (2 * len(axis) - 1), d, 2 * len(axis))
 
     def getParameters(self):
         return {"type": self.type, "axes": self.axes}
@@ -20,18 +20,25 @@ class SimpleMathFilter(FilterInterface):
         self._type = type
         self._value = value
 
+    @property
+    def _elementwise(self):
+        return np.ndim(self._value) == 0
+
     def _execute(self, wave, *args, **kwargs):
+        return DaskWave(self._apply(wave.data), *wave.axes, **wave.note)
+
+    def _apply(self, data):
         if self._type == "+":
-            data = wave.data + self._value
+            data = data + self._value
         if self._type == "-":
-            data = wave.data - self._value
+            data = data - self._value
         if self._type == "*":
-            data = wave.data * self._value
+            data = data * self._value
         if self._type == "/":
-            data = wave.data / self._value
+            data = data / self._value
         if self._type == "**":
-            data = wave.data ** self._value
-        return DaskWave(data, *wave.axes, **wave.note)
+            data = data ** self._value
+        return data
 
     def getParameters(self):
         return {"type": self._type, "value": self._value}
@@ -45,17 +52,21 @@ class ComplexFilter(FilterInterface):
         type('absolute' or 'real' or 'imag'): operation type.
     """
 
+    _elementwise = True
+
     def __init__(self, type):
         self._type = type
 
     def _execute(self, wave, **kwargs):
+        return DaskWave(self._apply(wave.data), *wave.axes, **wave.note)
+
+    def _apply(self, data):
         if self._type == "absolute":
-            data = da.absolute(wave.data)
+            return np.absolute(data)
         if self._type == "real":
-            data = da.real(wave.data)
+            return np.real(data)
         if self._type == "imag":
-            data = da.imag(wave.data)
-        return DaskWave(data, *wave.axes, **wave.note)
+            return np.imag(data)
 
     def getParameters(self):
         return {"type": self._type}
@@ -70,6 +81,8 @@ class PhaseFilter(FilterInterface):
         unit('deg' or 'rad'): unit used to specify rotation angle.
     """
 
+    _elementwise = True
+
     def __init__(self, rot, unit="deg"):
         if unit == "rad":
             self._rot = rot / np.pi * 180
@@ -77,8 +90,10 @@ class PhaseFilter(FilterInterface):
             self._rot = rot
 
     def _execute(self, wave, **kwargs):
-        data = wave.data * np.exp(1j * self._rot / 180 * np.pi)
-        return DaskWave(data, *wave.axes, **wave.note)
+        return DaskWave(self._apply(wave.data), *wave.axes, **wave.note)
+
+    def _apply(self, data):
+        return data * np.exp(1j * self._rot / 180 * np.pi)
 
     def getParameters(self):
         return {"rot": self._rot}
@@ -92,13 +107,18 @@ class NanToNumFilter(FilterInterface):
         value(any): value by which replace np.nan.
     """
 
+    _elementwise = True
+
     def __init__(self, value):
         self._value = value
 
     def _execute(self, wave, **kwargs):
-        data = da.nan_to_num(wave.data, self._value)
+        data = da.map_blocks(self._apply, wave.data, dtype=wave.data.dtype)
         return DaskWave(data, *wave.axes, **wave.note)
 
+    def _apply(self, data):
+        return np.nan_to_num(data, nan=self._value)
+
     def getParameters(self):
         return {"value": self._value}
 
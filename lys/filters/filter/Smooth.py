@@ -1,6 +1,6 @@
 import numpy as np
 import dask.array as da
-from dask_image import ndfilters
+from scipy import ndimage
 
 from lys import DaskWave
 from lys.filters import FilterInterface, FilterSettingBase, filterGUI, addFilter
@@ -20,9 +20,12 @@ class MedianFilter(FilterInterface):
         self._kernel = kernel
 
     def _execute(self, wave, *args, **kwargs):
-        data = self._applyFunc(ndfilters.median_filter, wave.data, size=self._kernel)
+        data = self._applyWithHalo(ndimage.median_filter, wave.data, self._getDepth(wave), size=self._kernel)
         return DaskWave(data, *wave.axes, **wave.note)
 
+    def _getDepth(self, wave):
+        return [int(k) // 2 for k in np.broadcast_to(self._kernel, wave.data.ndim)]
+
     def getParameters(self):
         return {"kernel": self._kernel}
 
@@ -39,9 +42,12 @@ class AverageFilter(FilterInterface):
         self._kernel = kernel
 
     def _execute(self, wave, *args, **kwargs):
-        data = self._applyFunc(ndfilters.uniform_filter, wave.data.astype(float), size=self._kernel)
+        data = self._applyWithHalo(ndimage.uniform_filter, wave.data.astype(float), self._getDepth(wave), size=self._kernel)
         return DaskWave(data, *wave.axes, **wave.note)
 
+    def _getDepth(self, wave):
+        return [int(k) // 2 for k in np.broadcast_to(self._kernel, wave.data.ndim)]
+
     def getParameters(self):
         return {"kernel": self._kernel}
 
@@ -58,12 +64,19 @@ class GaussianFilter(FilterInterface):
         self._kernel = kernel
 
     def _execute(self, wave, *args, **kwargs):
+        data = self._applyWithHalo(ndimage.gaussian_filter, wave.data, self._getDepth(wave), sigma=self._getSigma(wave))
+        return DaskWave(data, *wave.axes, **wave.note)
+
+    def _getSigma(self, wave):
         kernel = []
         for i in range(wave.data.ndim):
             ax = wave.getAxis(i)
             kernel.append(self._kernel[i] / abs(ax[1] - ax[0]) / (2 * np.sqrt(2 * np.log(2))))
-        data = self._applyFunc(ndfilters.gaussian_filter, wave.data, sigma=kernel)
-        return DaskWave(data, *wave.axes, **wave.note)
+        return kernel
+
+    def _getDepth(self, wave):
+        # gaussian_filter truncates the kernel at 4 sigma
+        return [int(4 * s + 0.5) for s in self._getSigma(wave)]
 
     def getParameters(self):
         return {"kernel": self._kernel}
@@ -89,11 +102,14 @@ class RemoveImpulsiveNoise(FilterInterface):
         self._threshold = threshold
 
     def _execute(self, wave, *args, **kwargs):
-        median = self._applyFunc(ndfilters.median_filter, wave.data, size=self._kernel)
+        median = self._applyWithHalo(ndimage.median_filter, wave.data, self._getDepth(wave), size=self._kernel)
         diff = da.absolute(median - wave.data)
         data = da.where(diff > self._threshold, median, wave.data)
         return DaskWave(data, *wave.axes, **wave.note)
 
+    def _getDepth(self, wave):
+        return [int(k) // 2 for k in np.broadcast_to(self._kernel, wave.data.ndim)]
+
     def getParameters(self):
         return {"kernel": self._kernel, "threshold": self._threshold}
 
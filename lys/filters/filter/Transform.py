@@ -1,8 +1,10 @@
+import functools
+
 import numpy as np
 import dask.array as da
-from scipy import ndimage
+from scipy import ndimage, special
 
-from lys import DaskWave, frontCanvas
+from lys import DaskWave, LinearAxis, frontCanvas
 from lys.Qt import QtWidgets
 from lys.filters import FilterInterface, FilterSettingBase, filterGUI, addFilter
 from lys.widgets import ScientificSpinBox, AxisSelectionLayout
@@ -29,11 +31,11 @@ class SetAxisFilter(FilterInterface):
         self._type = type
 
     def _execute(self, wave, *args, **kwargs):
+        n = wave.data.shape[self._axis]
         if self._type == 'step':
-            a = np.linspace(self._val1, self._val1 + self._val2 *
-                            (wave.data.shape[self._axis] - 1), wave.data.shape[self._axis])
+            a = LinearAxis(self._val1, self._val2, n)
         else:
-            a = np.linspace(self._val1, self._val2, wave.data.shape[self._axis])
+            a = LinearAxis(self._val1, (self._val2 - self._val1) / max(n - 1, 1), n)
         axes = list(wave.axes)
         axes[self._axis] = a
         return DaskWave(wave.data, *axes, **wave.note)
@@ -107,11 +109,8 @@ class Rotation2DFilter(FilterInterface):
         self._axes = axes
 
     def _execute(self, wave, *args, **kwargs):
-        def f(x):
-            return ndimage.rotate(x, self._angle, reshape=False)
-        gumap = da.gufunc(f, signature="(i,j)->(i,j)",
-                          output_dtypes=wave.data.dtype, vectorize=True, axes=[tuple(self._axes), tuple(self._axes)], allow_rechunk=True)
-        data = gumap(wave.data)
+        center = (np.array([wave.data.shape[ax] for ax in self._axes]) - 1) / 2
+        data = _affine(wave.data, self._axes, [_rotationMap(self._angle, center)], order=3, cval=0, dtype=wave.data.dtype)
         return DaskWave(data, *wave.axes, **wave.note)
 
     def getParameters(self):
@@ -124,6 +123,8 @@ class SymmetrizeFilter(FilterInterface):
     """
     Symmetrize 2D data.
 
+    The data rotated by 360 * i / *rotation* degrees (i = 0, 1, ..., *rotation* - 1) are averaged. The points outside the original data are ignored.
+
     Args:
         rotation(int): The image is *rotation*-fold symmetrized.
         center(length 2 sequence): The central position of rotation.
@@ -136,38 +137,15 @@ class SymmetrizeFilter(FilterInterface):
         self._axes = axes
 
     def _execute(self, wave, *args, **kwargs):
-        return self._execute_dask(wave)
-
-    def _execute_dask(self, wave):
-        center = wave.posToPoint(self._center[0], self._axes[0]), wave.posToPoint(self._center[1], self._axes[1])
-        gumap = da.gufunc(_symmetrze, signature="(i,j),(),(m)->(i,j)",
-                          output_dtypes=float, vectorize=True, axes=[tuple(self._axes), (), (0,), tuple(self._axes)], allow_rechunk=True)
-        data = gumap(wave.data.astype(float), self._rotation, np.array(center))
+        center = np.array([wave.posToPoint(self._center[0], self._axes[0]), wave.posToPoint(self._center[1], self._axes[1])])
+        maps = [_rotationMap(360 / self._rotation * i, center) for i in range(self._rotation)]
+        data = _affine(wave.data, self._axes, maps, order=1, cval=np.nan)
         return DaskWave(data, *wave.axes, **wave.note)
 
     def getParameters(self):
         return {"rotation": str(self._rotation), "center": self._center, "axes": self._axes}
 
 
-def _symmetrze(data, rotation, center):
-    if len(data) <= 2:
-        return np.empty((1,))
-    s = data.shape
-    dx = (s[0] - 1) / 2 - center[0]
-    dy = (s[1] - 1) / 2 - center[1]
-    tmp = ndimage.shift(data, [dx, dy], cval=np.NaN, order=1)
-    mask = np.where(np.isnan(tmp), 0, 1)
-    tmp[np.isnan(tmp)] = 0
-    dlis = np.array([ndimage.rotate(tmp, 360 / rotation * i, reshape=False, cval=0, order=1) for i in range(rotation)])
-    mlis = np.array([ndimage.rotate(mask, 360 / rotation * i, reshape=False, cval=0, order=1) for i in range(rotation)])
-    sum = dlis.sum(axis=0)
-    m_sum = mlis.sum(axis=0)
-    sum[m_sum < 1] = np.nan
-    m_sum[m_sum < 1] = 1
-
-    return ndimage.shift(sum / m_sum, [-dx, -dy], cval=np.NaN, order=1)
-
-
 class OffsetFilter(FilterInterface):
     """
     Add offset to data.
@@ -220,44 +198,92 @@ class MirrorFilter(FilterInterface):
         self._axes = axes
         self._sum = sum
 
-    def _calcPosition(self, x0, y0, a, b, c):
-        x1 = (-a**2 * x0 - 2 * a * b * y0 - 2 * a * c + b**2 * x0) / (a**2 + b**2)
-        y1 = (a**2 * y0 - 2 * a * b * x0 - b**2 * y0 - 2 * b * c) / (a**2 + b**2)
-        return x1, y1
-
-    def _calcCoords(self, wave):
+    def _mirrorMap(self, wave):
         x, y = wave.getAxis(self._axes[0]), wave.getAxis(self._axes[1])
         dx, dy = (x[-1] - x[0]) / (len(x) - 1), (y[-1] - y[0]) / (len(y) - 1)
         pos = [[(self._pos[i][0] - x[0]) / dx, (self._pos[i][1] - y[0]) / dy] for i in range(2)]
         a, b, c = pos[1][1] - pos[0][1], -pos[1][0] + pos[0][0], pos[1][0] * pos[0][1] - pos[1][1] * pos[0][0]
-
-        xy = np.arange(wave.data.shape[self._axes[0]]), np.arange(wave.data.shape[self._axes[0]])
-        xy = np.array(np.meshgrid(*xy)).transpose(1, 2, 0)
-        xy = np.array([[self._calcPosition(x0, y0, a, b, c) for x0, y0 in tmp] for tmp in xy]).transpose(2, 1, 0)
-        return xy
+        n = np.array([a, b]) / np.hypot(a, b)
+        res = np.eye(3)
+        res[:2, :2] -= 2 * np.outer(n, n)
+        res[:2, 2] = -2 * c * n / np.hypot(a, b)
+        return res
 
     def _execute(self, wave, *args, **kwargs):
-        coords = self._calcCoords(wave)
-
-        def _mirror(data):
-            if len(data) <= 2:
-                return np.empty((1,))
-            mir = ndimage.map_coordinates(data, coords, cval=np.nan, order=1)
-            if self._sum:
-                norm = np.where(np.isnan(data), 0, 1) + np.where(np.isnan(mir), 0, 1)
-                norm[norm == 0] = 1
-                return (np.nan_to_num(data) + np.nan_to_num(mir)) / norm
-            else:
-                return mir
-
-        gumap = da.gufunc(_mirror, signature="(i,j)->(i,j)", output_dtypes=float, vectorize=True, axes=[tuple(self._axes), tuple(self._axes)], allow_rechunk=True)
-        data = gumap(wave.data)
+        maps = [self._mirrorMap(wave)]
+        if self._sum:
+            maps.insert(0, np.eye(3))
+        data = _affine(wave.data, self._axes, maps, order=1, cval=np.nan)
         return DaskWave(data, *wave.axes, **wave.note)
 
     def getParameters(self):
         return {"positions": self._pos.tolist(), "axes": self._axes, "sum": self._sum}
 
 
+def _rotationMap(angle, center):
+    """Returns the map of rotation by *angle* degrees around *center* in the same convention as scipy.ndimage.rotate."""
+    c, s = special.cosdg(angle), special.sindg(angle)
+    res = np.eye(3)
+    res[:2, :2] = [[c, s], [-s, c]]
+    res[:2, 2] = center - res[:2, :2].dot(center)
+    return res
+
+
+def _shiftMap(shift):
+    """Returns the map of shift by *shift* points in the same convention as scipy.ndimage.shift."""
+    res = np.eye(3)
+    res[:2, 2] = -np.asarray(shift, dtype=float)
+    return res
+
+
+def _affine(data, axes, maps, order=1, cval=np.nan, dtype=None):
+    """
+    Apply geometric transformations to the plane spanned by *axes* of dask array *data*.
+
+    Each map is a 3*3 matrix in homogeneous coordinates that gives the index of the input point for the index of the output point (see scipy.ndimage.affine_transform).
+    Shift, rotation, mirror, and magnification are composed by the product of the matrices.
+    If multiple maps are given, the transformed data are averaged, where the points outside the data (and NaN) are ignored.
+    """
+    if dtype is None:
+        dtype = np.result_type(data.dtype, float)
+    data = da.moveaxis(data, list(axes), [-2, -1])
+    if data.numblocks[-2:] != (1, 1):
+        data = data.rechunk(("auto",) * (data.ndim - 2) + (-1, -1))
+    func = functools.partial(_affineBlock, maps=[np.array(m, dtype=float) for m in maps], order=order, cval=cval, dtype=dtype)
+    res = data.map_blocks(func, dtype=dtype, meta=np.array((), dtype=dtype))
+    return da.moveaxis(res, [-2, -1], list(axes))
+
+
+def _affineBlock(block, maps, order, cval, dtype):
+    """Transform all planes (last two axes) of *block*. The matrices are shared by all planes."""
+    res = np.empty(block.shape, dtype=dtype)
+    if len(maps) == 1:
+        for idx in np.ndindex(block.shape[:-2]):
+            _affinePlane(block[idx], maps[0], order, cval, res[idx])
+        return res
+    buf = np.empty(block.shape[-2:], dtype=dtype)
+    num = np.empty(block.shape[-2:], dtype=int)
+    for idx in np.ndindex(block.shape[:-2]):
+        out = res[idx]
+        out[:] = 0
+        num[:] = 0
+        for m in maps:
+            _affinePlane(block[idx], m, order, cval, buf)
+            valid = ~np.isnan(buf)
+            out[valid] += buf[valid]
+            num += valid
+        out /= np.maximum(num, 1)
+        out[num == 0] = np.nan
+    return res
+
+
+def _affinePlane(plane, matrix, order, cval, output):
+    if np.array_equal(matrix, np.eye(3)):
+        output[:] = plane
+    else:
+        ndimage.affine_transform(plane, matrix[:2, :2], matrix[:2, 2], output=output, order=order, cval=cval)
+
+
 @filterGUI(SetAxisFilter)
 class _SetAxisSetting(FilterSettingBase):
     def __init__(self, dimension=2):
@@ -16,6 +16,10 @@ class FiltersGUI(QtWidgets.QTreeWidget):
         dimension(int): The dimension of the input data.
         parent(QWidget): The parent widget
     """
+    filtersChanged = QtCore.pyqtSignal(object)
+    """
+    Emitted when the filters are edited. Successive edits within a short time are notified once. The edited Filters is given as argument.
+    """
 
     def __init__(self, dimension=2, parent=None):
         super().__init__(parent=parent)
@@ -23,6 +27,10 @@ class FiltersGUI(QtWidgets.QTreeWidget):
         self.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
         self.customContextMenuRequested.connect(self._context)
         self.setHeaderLabel("Filters: Right click to edit")
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(300)
+        self._timer.timeout.connect(lambda: self.filtersChanged.emit(self.getFilters()))
 
     def setDimension(self, dimension):
         """
@@ -86,6 +94,7 @@ class FiltersGUI(QtWidgets.QTreeWidget):
         if params is not None:
             w.setParameters(**params)
         w.dimensionChanged.connect(self._update)
+        _connectEdited(w, self._timer.start)
         item = QtWidgets.QTreeWidgetItem([_getFilterGuiName(filter)])
         child = QtWidgets.QTreeWidgetItem([""])
         item.addChild(child)
@@ -124,6 +133,7 @@ class FiltersGUI(QtWidgets.QTreeWidget):
         """
         while self.topLevelItemCount() != 0:
             self.takeTopLevelItem(0)
+        self._timer.start()
 
     def _update(self):
         dim = int(self.dim)
@@ -137,7 +147,9 @@ class FiltersGUI(QtWidgets.QTreeWidget):
                 self.removeItemWidget(child, 0)
                 self.setItemWidget(child, 0, wid)
                 wid.dimensionChanged.connect(self._update)
+                _connectEdited(wid, self._timer.start)
             dim += w.GetFilter().getRelativeDimension()
+        self._timer.start()
 
     def getFilters(self):
         """
@@ -191,6 +203,19 @@ class FiltersGUI(QtWidgets.QTreeWidget):
             self.setFilters(filt)
 
 
+def _connectEdited(widget, slot):
+    """Connect signals of all input widgets in *widget* to *slot*."""
+    for w in widget.findChildren(QtWidgets.QWidget):
+        if isinstance(w, (QtWidgets.QSpinBox, QtWidgets.QDoubleSpinBox)):
+            w.valueChanged.connect(lambda *args: slot())
+        elif isinstance(w, QtWidgets.QLineEdit):
+            w.textChanged.connect(lambda *args: slot())
+        elif isinstance(w, QtWidgets.QComboBox):
+            w.currentIndexChanged.connect(lambda *args: slot())
+        elif isinstance(w, QtWidgets.QAbstractButton):
+            w.toggled.connect(lambda *args: slot())
+
+
 class _FilterSelectionDialog(QtWidgets.QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -0,0 +1,122 @@
+import sys
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+from lys import DaskWave
+
+from .interface import Filters
+
+
+class IncrementalExecutor:
+    """
+    Execute filters incrementally for the same input wave.
+
+    The result of the filters except the last one is calculated and kept in memory. When :meth:`execute` is called again,
+    the longest kept part of the filters is not executed, so that tuning parameters of the last filter is fast even for large data.
+    The rest of the filters is executed by :meth:`Filters.execute`, so that the filters are optimized and the cache is used (see :func:`enableCache`).
+
+    The kept results are released when the filters before them are changed, or in least-recently-used order when their total size exceeds *memory*.
+    If the result of the filters except the last one exceeds *memory*, it is not kept and all filters are executed in a single dask graph.
+
+    Args:
+        wave(Wave or DaskWave): The input wave.
+        memory(int): The maximum total size of the kept results in bytes.
+
+    Example::
+
+        from lys import Wave, filters
+        import numpy as np
+
+        ex = filters.IncrementalExecutor(Wave(np.random.rand(100, 100, 100)))
+        result = ex.execute(filters.GaussianFilter([3, 3, 3]) + filters.SelectIndexFilter(0, axis=2))
+        result = ex.execute(filters.GaussianFilter([3, 3, 3]) + filters.SelectIndexFilter(1, axis=2))  # GaussianFilter is not executed again.
+    """
+
+    def __init__(self, wave, memory=2**30):
+        if not isinstance(wave, DaskWave):
+            wave = DaskWave(wave)
+        self._wave = wave
+        self._memory = memory
+        self._steps = OrderedDict()
+        self._size = 0
+        self._preview = None
+
+    def execute(self, filt):
+        """
+        Execute filters.
+
+        Args:
+            filt(filter): The filter to be applied.
+
+        Returns:
+            DaskWave: The result.
+        """
+        filters = filt.getFilters() if isinstance(filt, Filters) else [filt]
+        keys = tuple(_stepKey(f) for f in filters)
+        self.__release(keys)
+
+        # start from the longest kept result
+        n, wave = 0, self._wave
+        for key in self._steps:
+            if len(key) <= len(filters) and len(key) > n:
+                n, wave = len(key), self._steps[key]
+        if n > 0:
+            self._steps.move_to_end(keys[:n])
+
+        # keep the result except the last filter if it fits memory
+        if len(filters) - n > 1:
+            prefix = self.__run(filters[n:-1], wave)
+            if prefix.data.nbytes <= self._memory:
+                prefix.persist()
+                self.__keep(keys[:-1], prefix)
+                n, wave = len(filters) - 1, prefix
+        wave = self.__run(filters[n:], wave)
+
+        result = DaskWave(wave.data, *wave.axes, **self._wave.note)
+        Filters(filters)._setNote(result)
+        return result
+
+    def __run(self, filters, wave):
+        return Filters(filters).execute(DaskWave(wave.data, *wave.axes))
+
+    def __release(self, keys):
+        """Release the results of the filters that are not the beginning of *keys*"""
+        for key in [key for key in self._steps if keys[:len(key)] != key]:
+            self._size -= self._steps.pop(key).data.nbytes
+
+    def __keep(self, key, wave):
+        self._steps[key] = wave
+        self._size += wave.data.nbytes
+        while self._size > self._memory:
+            _, w = self._steps.popitem(last=False)
+            self._size -= w.data.nbytes
+
+    def preview(self, filt, size=2**20):
+        """
+        Execute filters for the downsampled input wave.
+
+        The input wave is downsampled by the same step along all axes so that the number of points is less than *size*.
+        The result is approximate. In particular, filters that specify data by index (such as SliceFilter) give different region from :meth:`execute`.
+
+        Args:
+            filt(filter): The filter to be applied.
+            size(int): The maximum number of points of the downsampled wave.
+
+        Returns:
+            DaskWave: The result.
+        """
+        step = max(1, math.ceil((self._wave.data.size / size) ** (1 / max(self._wave.data.ndim, 1))))
+        if step == 1:
+            return self.execute(filt)
+        if self._preview is None or self._preview[0] != step:
+            sl = tuple(slice(None, None, step) for _ in range(self._wave.data.ndim))
+            wave = DaskWave(self._wave.data[sl], *[ax[s] for ax, s in zip(self._wave.axes, sl)], **self._wave.note)
+            self._preview = (step, IncrementalExecutor(wave, self._memory))
+        return self._preview[1].execute(filt)
+
+
+def _stepKey(f):
+    with np.printoptions(threshold=sys.maxsize):
+        return Filters.toString(f)
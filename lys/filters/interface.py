@@ -1,11 +1,14 @@
 import sys
+import functools
 import _pickle as cPickle
+import numpy as np
 import dask.array as da
 
-from lys import Wave, DaskWave
+from lys import Wave, DaskWave, serialization
+from lys.core import _KeepChunks
 from lys.Qt import QtCore, QtWidgets
 
-from . import getFilter
+from . import getFilter, cache
 
 
 class FilterInterface:
@@ -26,26 +29,23 @@ class FilterInterface:
 
         """
         if isinstance(wave, DaskWave):
+            if cache.isCacheEnabled() and len(args) == 0 and len(kwargs) == 0:
+                return cache._execute(self, wave)
             result = self._execute(wave, *args, **kwargs)
             self._setNote(result)
             return result
         elif isinstance(wave, Wave):
-            dw = DaskWave(wave)
-            result = self._execute(dw, *args, **kwargs)
-            self._setNote(result)
-            return result.compute()
+            return self.execute(DaskWave(wave), *args, **kwargs).compute()
         else:
             return self.execute(Wave(wave), *args, **kwargs).data
 
     def _setNote(self, wave):
         if isinstance(self, Filters):
-            return
-        if "lysFilters" in wave.note:
-            filters = wave.note["lysFilters"]
+            items = [f._toDict() for f in self._filters]
         else:
-            filters = []
-        filters.append(self._toDict())
-        wave.note["lysFilters"] = filters
+            items = [self._toDict()]
+        # The list is copied so that the note of the input wave is not changed.
+        wave.note["lysFilters"] = list(wave.note.get("lysFilters", [])) + items
 
     def _applyFunc(self, func, data, *args, **kwargs):
         if data.dtype == complex:
@@ -53,6 +53,46 @@ class FilterInterface:
         else:
             return func(data, *args, **kwargs)
 
+    def _applyAlongAxis(self, func, data, axis, dtype=None, **kwargs):
+        """
+        Apply func(block, axis=axis, **kwargs) to dask array *data*.
+
+        *data* is rechunked so that each block contains whole *axis*. Chunks along other axes are determined by dask to keep the size of blocks.
+        *func* should be picklable (not lambda) so that it can be used in distributed clusters.
+        """
+        if data.numblocks[axis] != 1:
+            data = data.rechunk({i: -1 if i == axis else "auto" for i in range(data.ndim)})
+        if dtype is None:
+            dtype = data.dtype
+        return data.map_blocks(func, dtype=dtype, axis=axis, **kwargs)
+
+    def _applyWithHalo(self, func, data, depth, dtype=None, **kwargs):
+        """
+        Apply func(block, **kwargs) to dask array *data* whose blocks are extended by *depth* points along each axis.
+
+        The overlapping region (halo) is sized by *depth*, so that neighborhood operations such as scipy.ndimage filters give the same result as for the whole array without rechunking it.
+        At the edges of *data*, the boundary condition of *func* is used. Complex data is processed separately for real and imaginary parts.
+        *func* should be picklable (not lambda) so that it can be used in distributed clusters.
+        """
+        depth = {i: min(int(d), n) if nb > 1 else 0 for i, (d, n, nb) in enumerate(zip(depth, data.shape, data.numblocks))}
+        if dtype is None:
+            dtype = data.dtype
+        return data.map_overlap(functools.partial(_applyRealImag, func, **kwargs), depth=depth, boundary="none", dtype=dtype, meta=np.array((), dtype=dtype))
+
+    def _applyToPlane(self, func, data, axes, size, dtype=None, **kwargs):
+        """
+        Apply func(block, **kwargs) to the plane spanned by *axes* of dask array *data*.
+
+        *axes* are moved to the end and flattened, so that func receives blocks of shape (..., number of points in the plane).
+        func should return array of shape (..., *size*). The new axis of the result is the last one.
+        """
+        data = da.moveaxis(data, list(axes), [-2, -1])
+        data = data.rechunk(("auto",) * (data.ndim - 2) + (-1, -1))
+        data = data.reshape(data.shape[:-2] + (data.shape[-2] * data.shape[-1],))
+        if dtype is None:
+            dtype = data.dtype
+        return data.map_blocks(func, dtype=dtype, chunks=data.chunks[:-1] + ((size,),), **kwargs)
+
     def _generalizedFunction(self, wave, func, signature, axes, output_dtypes=None, output_sizes={}):
         if output_dtypes is None:
             output_dtypes = wave.data.dtype
@@ -91,7 +131,7 @@ class FilterInterface:
         Returns:
             dict: The exported dictionary.
         """
-        d = self.getParameters()
+        d = dict(self.getParameters())
         d["filterName"] = self.__class__.__name__
         return d
 
@@ -122,6 +162,12 @@ class FilterInterface:
         f.saveAsFile(file)
 
 
+def _applyRealImag(func, block, **kwargs):
+    if np.iscomplexobj(block):
+        return func(block.real, **kwargs) + 1j * func(block.imag, **kwargs)
+    return func(block, **kwargs)
+
+
 def filterGUI(filterClass):
     """
     Decorator for filter GUI class.
@@ -218,8 +264,10 @@ class Filters(FilterInterface):
                 self._filters.append(f)
 
     def _execute(self, wave, *args, **kwargs):
-        for f in self._filters:
-            wave = f.execute(wave, *args, **kwargs)
+        # All steps are chained in a single dask graph without rechunking between steps. The note is updated once in _setNote.
+        from .optimizer import _execute
+        with _KeepChunks():
+            wave, _, _ = _execute(self._filters, wave, *args, **kwargs)
         return wave
 
     def getParameters(self):
@@ -284,7 +332,7 @@ class Filters(FilterInterface):
         Do not use this method. Use :func:`lys.filters.function.fromString`
         """
         if isinstance(data, str):
-            data = eval(data)
+            data = serialization.loads(data)
         if isinstance(data, list):
             res = Filters([FilterInterface._fromDict(f) for f in data])
         else:  # backward compability
@@ -307,12 +355,9 @@ class Filters(FilterInterface):
         """
         Do not use this method. Use :func:`lys.filters.function.fromFile`
         """
-        with open(path, 'r') as f:
-            data = f.read()
-        return Filters.fromString(data)
+        return Filters.fromString(serialization.load(path))
 
     def saveAsFile(self, path):
         if not path.endswith(".fil"):
             path = path + ".fil"
-        with open(path, 'w') as f:
-            f.write(str(self))
+        serialization.dump([f._toDict() for f in self._filters], path)
@@ -0,0 +1,244 @@
+"""
+Rule-based optimizer of :class:`lys.filters.Filters`.
+
+The optimizer rewrites the sequence of filters so that the result is not changed but the computational cost is reduced.
+The following rules are applied:
+
+1. Consecutive elementwise filters (such as SimpleMathFilter, PhaseFilter, ComplexFilter, and NanToNumFilter) are fused into a single blockwise operation.
+2. Slicing filters (SliceFilter, SelectIndexFilter, and SelectRegionFilter) are moved before elementwise filters.
+3. Slicing filters are moved before neighborhood filters (such as GaussianFilter and MedianFilter).
+   The region is enlarged by the size of the kernel, so that the neighborhood filter is applied only to the region required to calculate the final result.
+4. Consecutive slicing filters are merged into a single SliceFilter.
+
+Filters tell the optimizer what they are by the following private members.
+
+- *_elementwise* (bool): True if *_apply(data)* calculates the result of the filter elementwise.
+- *_getDepth(wave)*: Returns the number of neighboring points required for each axis.
+- *_sliceKey(wave)*: Returns the index used to slice the data.
+
+The optimization is automatically applied when :class:`lys.filters.Filters` is executed. Use :func:`optimize` to see what is rewritten.
+"""
+
+import numpy as np
+import dask.array as da
+
+from lys import Wave, DaskWave
+from lys.core import _KeepChunks
+
+from .interface import FilterInterface, Filters
+
+
+def optimize(filters, wave):
+    """
+    Optimize *filters* for *wave*.
+
+    The returned filters give the same result as *filters*, and are intended to be used for calculation, not for saving.
+
+    Args:
+        filters(Filters or list of filters): The filters to be optimized.
+        wave(Wave or DaskWave or array): The wave to which the filters are applied. The data is not calculated.
+
+    Returns:
+        tuple of length 2: The optimized filters and the list of str that describes what is rewritten.
+
+    Example::
+
+        from lys import Wave, filters
+        import numpy as np
+
+        w = Wave(np.random.rand(100, 100))
+        f = filters.Filters([filters.GaussianFilter([3, 3]), filters.SimpleMathFilter("*", 2), filters.SliceFilter([slice(10, 20), slice(None)])])
+        optimized, report = filters.optimize(f, w)
+        print(report)
+    """
+    if isinstance(filters, Filters):
+        filters = filters.getFilters()
+    if not isinstance(wave, DaskWave):
+        wave = DaskWave(wave if isinstance(wave, Wave) else Wave(wave))
+    with _KeepChunks():
+        _, result, report = _execute(filters, wave)
+    return Filters(result), report
+
+
+def _execute(filters, wave, *args, **kwargs):
+    """
+    Optimize and execute filters. Filters are optimized for each segment that is composed of known filters, because the shape of the wave after unknown filters cannot be predicted.
+
+    Returns:
+        tuple of length 3: The resulting wave, executed filters, and report.
+    """
+    rest, executed, report = list(filters), [], []
+    while len(rest) > 0:
+        n = 0
+        while n < len(rest) and _isKnown(rest[n]):
+            n += 1
+        if n == 0:
+            segment, rest = rest[:1], rest[1:]
+        else:
+            segment, rest = rest[:n], rest[n:]
+            segment, msgs = _rewrite(segment, wave)
+            report.extend(msgs)
+        for f in segment:
+            wave = f._execute(wave, *args, **kwargs)
+        executed.extend(segment)
+    return wave, executed, report
+
+
+def _isElementwise(f):
+    return getattr(f, "_elementwise", False)
+
+
+def _isNeighborhood(f):
+    return hasattr(f, "_getDepth")
+
+
+def _isSlice(f):
+    return hasattr(f, "_sliceKey")
+
+
+def _isKnown(f):
+    return _isElementwise(f) or _isNeighborhood(f) or _isSlice(f)
+
+
+def _rewrite(filters, wave):
+    report = []
+    while True:
+        res = _rewriteOnce(filters, wave)
+        if res is None:
+            return filters, report
+        filters, msg = res
+        report.append(msg)
+
+
+def _rewriteOnce(filters, wave):
+    from .filter.MatrixMath import SliceFilter
+    for i in range(len(filters) - 1):
+        f1, f2 = filters[i], filters[i + 1]
+        if _isElementwise(f1) and _isElementwise(f2):
+            n = i + 2
+            while n < len(filters) and _isElementwise(filters[n]):
+                n += 1
+            fused = _FusedFilter(sum([_flatten(f) for f in filters[i:n]], []))
+            return filters[:i] + [fused] + filters[n:], "Fused " + _names(fused._filters) + " into a single blockwise operation."
+        if not _isSlice(f2):
+            continue
+        if _isElementwise(f1):
+            return filters[:i] + [f2, f1] + filters[i + 2:], "Moved " + _names([f2]) + " before " + _names(_flatten(f1)) + "."
+        w = _inputWave(filters, i, wave)
+        if _isSlice(f1):
+            key = _composeKey(f1._sliceKey(w), f2._sliceKey(f1._execute(w)), w.data.shape)
+            if key is not None:
+                return filters[:i] + [SliceFilter(key)] + filters[i + 2:], "Merged " + _names([f1]) + " and " + _names([f2]) + " into a single SliceFilter."
+        if _isNeighborhood(f1):
+            key = f2._sliceKey(w)
+            if len(key) != w.data.ndim:
+                continue
+            depth = f1._getDepth(w)
+            keys = _expandKey(key, w.data.shape, depth)
+            if keys is None:
+                continue
+            pre, post = SliceFilter(keys[0]), SliceFilter(keys[1])
+            return filters[:i] + [pre, f1, post] + filters[i + 2:], "Moved " + _names([f2]) + " before " + _names([f1]) + " with margin " + str(list(depth)) + "."
+
+
+def _inputWave(filters, index, wave):
+    """Returns the wave given to filters[index]. Elementwise and neighborhood filters do not change shape and axes, and slicing filters are cheap."""
+    for f in filters[:index]:
+        if _isSlice(f):
+            wave = f._execute(wave)
+    return wave
+
+
+def _expandKey(key, shape, depth):
+    """
+    Split data[key] into data[pre][post] so that pre includes *depth* points around the region selected by *key*.
+
+    Returns:
+        tuple of length 2: pre and post. None is returned when pre does not reduce the size of the data.
+    """
+    pre, post = [], []
+    for k, n, d in zip(key, shape, [int(d) for d in depth]):
+        if isinstance(k, slice):
+            start, stop, step = k.indices(n)
+            if step < 0 or start >= stop:
+                return None
+            last = start + (stop - start - 1) // step * step
+        else:
+            start = last = int(k) % n
+        lo, hi = max(start - d, 0), min(last + d + 1, n)
+        if hi - lo < min(n, 2):  # some filters (such as GaussianFilter) require at least two points to calculate axis step
+            return None
+        pre.append(slice(lo, hi))
+        if isinstance(k, slice):
+            post.append(slice(start - lo, last - lo + 1, step))
+        else:
+            post.append(start - lo)
+    if all(s.stop - s.start == n for s, n in zip(pre, shape)):
+        return None
+    return pre, post
+
+
+def _composeKey(key1, key2, shape):
+    """
+    Returns key such that data[key] == data[key1][key2]. None is returned when the keys cannot be composed.
+    """
+    if len(key1) != len(shape) or len(key2) != len([k for k in key1 if isinstance(k, slice)]):
+        return None
+    key2 = iter(key2)
+    result = []
+    for k1, n in zip(key1, shape):
+        if not isinstance(k1, slice):
+            result.append(int(k1) % n)
+            continue
+        start, stop, step = k1.indices(n)
+        k2 = next(key2)
+        m = len(range(start, stop, step))
+        if step < 0 or m == 0:
+            return None
+        if isinstance(k2, slice):
+            start2, stop2, step2 = k2.indices(m)
+            count = len(range(start2, stop2, step2))
+            if step2 < 0 or count == 0:
+                return None
+            first = start + start2 * step
+            result.append(slice(first, first + (count - 1) * step * step2 + 1, step * step2))
+        else:
+            result.append(start + (int(k2) % m) * step)
+    return result
+
+
+def _flatten(f):
+    if isinstance(f, _FusedFilter):
+        return list(f._filters)
+    return [f]
+
+
+def _names(filters):
+    return ", ".join(type(f).__name__ for f in filters)
+
+
+class _FusedFilter(FilterInterface):
+    """
+    Elementwise filters fused into a single blockwise operation.
+
+    Args:
+        filters(list of filters): The elementwise filters.
+    """
+    _elementwise = True
+
+    def __init__(self, filters):
+        self._filters = filters
+
+    def _execute(self, wave, *args, **kwargs):
+        with np.errstate(all="ignore"):
+            dtype = self._apply(np.ones(1, dtype=wave.data.dtype)).dtype
+        data = da.map_blocks(self._apply, wave.data, dtype=dtype)
+        return DaskWave(data, *wave.axes, **wave.note)
+
+    def _apply(self, data):
+        for f in self._filters:
+            data = f._apply(data)
+        return data
+
+    def getParameters(self):
+        return {"filters": self._filters}
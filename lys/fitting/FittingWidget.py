@@ -1,6 +1,6 @@
 import numpy as np
 
-from lys import display
+from lys import display, serialization
 from lys.Qt import QtWidgets, QtGui, QtCore
 from lys.widgets import ScientificSpinBox
 from lys.decorators import avoidCircularReference
@@ -37,8 +37,9 @@ class _ResultController(QtCore.QObject):
             if self._fitted is None:
                 self._fitted = fitted
             else:
-                self._fitted.data = fitted.data
-                self._fitted.x = fitted.x
+                with self._fitted.batchUpdate():
+                    self._fitted.data = fitted.data
+                    self._fitted.x = fitted.x
             if self._obj is None:
                 self._obj = self._canvas.Append(self._fitted, offset=self._data.getOffset())
         else:
@@ -392,14 +393,12 @@ class FittingTree(QtWidgets.QTreeView):
         if len(path) != 0:
             if not path.endswith(".dic"):
                 path = path + ".dic"
-            with open(path, "w") as f:
-                f.write(str(self._obj.saveAsDictionary(useId=False)))
+            serialization.dump(self._obj.saveAsDictionary(useId=False), path)
 
     def __import(self):
         fname = QtWidgets.QFileDialog.getOpenFileName(self, 'Load fitting', filter="Dictionary (*.dic);;All files (*.*)")
         if fname[0]:
-            with open(fname[0], "r") as f:
-                d = eval(f.read())
+            d = serialization.load(fname[0])
             self._obj.loadFromDictionary(d)
 
     def __clear(self):
@@ -3,7 +3,7 @@ import glob
 import sys
 import traceback
 
-from lys import home
+from lys import home, serialization
 from lys.Qt import QtCore
 
 
@@ -204,8 +204,7 @@ class _CommandLog:
 
     def __load(self):
         if os.path.exists(self.__logFile):
-            with open(self.__logFile, 'r') as f:
-                log = eval(f.read())
+            log = serialization.load(self.__logFile)
         else:
             log = []
         self.__comlog = log
@@ -221,8 +220,7 @@ class _CommandLog:
         self._save()
 
     def _save(self):
-        with open(self.__logFile, 'w') as f:
-            f.write(str(self.__comlog))
+        serialization.dump(self.__comlog, self.__logFile)
 
     def get(self):
         return self.__comlog
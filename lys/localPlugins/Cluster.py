@@ -0,0 +1,132 @@
+import os
+
+from dask.utils import format_bytes
+
+from lys import glb, home, cluster
+from lys.Qt import QtWidgets, QtCore
+
+
+class ClusterWidget(QtWidgets.QWidget):
+    """
+    Widget to start, stop, and resize the local dask cluster (see :mod:`lys.cluster`).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.__initlayout()
+        self._timer = QtCore.QTimer(self)
+        self._timer.timeout.connect(self._update)
+        self._timer.start(2000)
+        self._update()
+
+    def __initlayout(self):
+        ncore = os.cpu_count()
+        self._workers = QtWidgets.QSpinBox()
+        self._workers.setRange(1, ncore * 4)
+        self._workers.setValue(ncore)
+        self._threads = QtWidgets.QSpinBox()
+        self._threads.setRange(1, ncore)
+        self._processes = QtWidgets.QCheckBox("Use processes")
+        self._processes.setChecked(True)
+        self._memory = QtWidgets.QLineEdit("auto")
+        self._memory.setToolTip("Memory limit of each worker such as 4GB, or fraction of system memory such as 0.25. Number larger than 1 is interpreted as bytes.")
+        self._directory = QtWidgets.QLineEdit(home() + "/.lys/dask")
+
+        self._fractions = []
+        for value in [0.6, 0.7, 0.8, 0.95]:
+            v = QtWidgets.QDoubleSpinBox()
+            v.setRange(0, 1)
+            v.setSingleStep(0.05)
+            v.setValue(value)
+            self._fractions.append(v)
+
+        self._adaptive = QtWidgets.QCheckBox("Adaptive")
+        self._minimum = QtWidgets.QSpinBox()
+        self._minimum.setRange(0, ncore * 4)
+        self._minimum.setValue(1)
+        self._maximum = QtWidgets.QSpinBox()
+        self._maximum.setRange(1, ncore * 4)
+        self._maximum.setValue(ncore)
+
+        grid = QtWidgets.QGridLayout()
+        grid.addWidget(QtWidgets.QLabel("Workers"), 0, 0)
+        grid.addWidget(self._workers, 0, 1)
+        grid.addWidget(QtWidgets.QLabel("Threads/worker"), 0, 2)
+        grid.addWidget(self._threads, 0, 3)
+        grid.addWidget(self._processes, 0, 4)
+        grid.addWidget(QtWidgets.QLabel("Memory/worker"), 1, 0)
+        grid.addWidget(self._memory, 1, 1)
+        grid.addWidget(QtWidgets.QLabel("Spill directory"), 1, 2)
+        grid.addWidget(self._directory, 1, 3, 1, 2)
+        for i, (name, v) in enumerate(zip(["Target", "Spill", "Pause", "Terminate"], self._fractions)):
+            grid.addWidget(QtWidgets.QLabel(name), 2 + i // 2, (i % 2) * 2)
+            grid.addWidget(v, 2 + i // 2, (i % 2) * 2 + 1)
+        grid.addWidget(self._adaptive, 4, 0)
+        grid.addWidget(QtWidgets.QLabel("Min"), 4, 1)
+        grid.addWidget(self._minimum, 4, 2)
+        grid.addWidget(QtWidgets.QLabel("Max"), 4, 3)
+        grid.addWidget(self._maximum, 4, 4)
+
+        self._start = QtWidgets.QPushButton("Start", clicked=self._startCluster)
+        self._apply = QtWidgets.QPushButton("Apply scaling", clicked=self._applyScaling)
+        self._stop = QtWidgets.QPushButton("Stop", clicked=self._stopCluster)
+        h = QtWidgets.QHBoxLayout()
+        h.addWidget(self._start)
+        h.addWidget(self._apply)
+        h.addWidget(self._stop)
+
+        self._status = QtWidgets.QLabel()
+
+        layout = QtWidgets.QVBoxLayout()
+        layout.addLayout(grid)
+        layout.addLayout(h)
+        layout.addWidget(self._status)
+        layout.addStretch()
+        self.setLayout(layout)
+
+    def _memoryLimit(self):
+        text = self._memory.text().strip()
+        try:
+            value = float(text)
+        except ValueError:
+            return text
+        if 0 < value <= 1:  # fraction of system memory
+            return value
+        return text
+
+    def _startCluster(self):
+        target, spill, pause, terminate = [v.value() for v in self._fractions]
+        try:
+            cluster.start(self._workers.value(), self._threads.value(), self._processes.isChecked(), self._memoryLimit(), self._directory.text(), target, spill, pause, terminate)
+            if self._adaptive.isChecked():
+                cluster.adapt(self._minimum.value(), self._maximum.value())
+        except Exception as e:
+            QtWidgets.QMessageBox.warning(self, "Error", "Failed to start local cluster: " + str(e))
+        self._update()
+
+    def _applyScaling(self):
+        if self._adaptive.isChecked():
+            cluster.adapt(self._minimum.value(), self._maximum.value())
+        else:
+            cluster.resize(self._workers.value())
+        self._update()
+
+    def _stopCluster(self):
+        cluster.stop()
+        self._update()
+
+    def _update(self):
+        running = cluster.isRunning()
+        self._apply.setEnabled(running)
+        self._stop.setEnabled(running)
+        if not running:
+            self._status.setText("Local cluster is not running.")
+            return
+        s = cluster.status()
+        txt = "Workers: " + str(s["workers"]) + (" (adaptive)" if s["adaptive"] else "") + ", Threads: " + str(s["threads"])
+        txt += ", Memory: " + format_bytes(s["memory"]) + " / " + format_bytes(s["memory_limit"])
+        self._status.setText(txt)
+
+
+_instance = ClusterWidget()
+glb.mainWindow().tabWidget("bottom").addTab(_instance, "Cluster")
@@ -6,6 +6,7 @@ if glb.mainWindow() is not None:  # This is required to avoid local plugins impo
 
     # Additional GUIs
     from . import Logger
+    from . import Cluster
     from . import StringEditor
     from . import WaveViewer
 
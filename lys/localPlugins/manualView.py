@@ -2,6 +2,7 @@ import webbrowser
 
 import lys
 from lys import glb
+from lys.Qt import QtWidgets
 from lys.widgets import LysSubWindow
 
 
@@ -28,7 +29,14 @@ def _register():
     proc.triggered.connect(lambda: webbrowser.open(url))
 
     proc = prog.addAction("Open dask status in browser")
-    proc.triggered.connect(lambda: webbrowser.open(lys.core.DaskWave.client.dashboard_link))
+    proc.triggered.connect(_openDashboard)
+
+
+def _openDashboard():
+    if not lys.cluster.isRunning():
+        QtWidgets.QMessageBox.information(glb.mainWindow(), "Dask status", "Local cluster is not running. Start it from the Cluster tab.")
+        return
+    webbrowser.open(lys.cluster.client().dashboard_link)
 
 
 _register()
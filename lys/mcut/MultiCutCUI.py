@@ -1,5 +1,6 @@
 import logging
 import weakref
+import psutil
 
 from lys import DaskWave, Wave, filters
 from lys.Qt import QtCore
@@ -68,6 +69,10 @@ class MultiCutCUI(QtCore.QObject):
         self._children.loadFromDictionary(d.get("children", {}), **kwargs)
 
 
+def _fitsInMemory(wave):
+    return wave.data.nbytes < psutil.virtual_memory().available / 2
+
+
 class MultiCutWave(QtCore.QObject):
     """
     This class manage wave and filter for analysis.
@@ -90,7 +95,9 @@ class MultiCutWave(QtCore.QObject):
     def __init__(self, wave):
         super().__init__()
         self._wave = self._filtered = self._load(wave)
-        self._wave.persist()
+        if _fitsInMemory(self._wave):  # Otherwise (e.g. memory-mapped or chunked store) data is read on demand
+            self._wave.persist()
+        self._executor = filters.IncrementalExecutor(self._wave)
         self._filter = None
         self._useDask = True
 
@@ -100,16 +107,22 @@ class MultiCutWave(QtCore.QObject):
         else:
             return DaskWave(Wave(data))
 
-    def applyFilter(self, filt):
+    def applyFilter(self, filt, preview=False):
         """
         Apply filter to the wave.
 
+        The results of the filters that are not changed from the previous call are reused.
+
         Args:
             filt(Filter): The filter to be applied.
+            preview(bool): If True, the filter is applied to the downsampled wave to quickly see the result. See :meth:`lys.filters.IncrementalExecutor.preview`.
         """
         self._filter = filt
         dim_old = self._filtered.ndim
-        wave = filt.execute(self._wave)
+        if preview:
+            wave = self._executor.preview(filt)
+        else:
+            wave = self._executor.execute(filt)
         wave.persist()
         if self._useDask:
             self._filtered = wave
@@ -360,10 +373,11 @@ class _ChildWave(QtCore.QObject):
         self._orig = wave
         name = str(self._filt.name)
         wave = self.__apply(wave)
-        self._filt.data = wave.data
-        self._filt.axes = wave.axes
-        self._filt.note = wave.note
-        self._filt.name = name
+        with self._filt.batchUpdate():
+            self._filt.setData(wave.data, copy=False)
+            self._filt.axes = wave.axes
+            self._filt.note = wave.note
+            self._filt.name = name
 
     def __apply(self, wave):
         post = self.postProcess()
@@ -11,22 +11,25 @@ class PrefilterTab(QtWidgets.QWidget):
         self.__initlayout__()
         self._filt.setDimension(cui.getRawWave().ndim)
         self._dim = 0
+        self._previewId = 0
         self.filterApplied.connect(self._cui.applyFilter)
 
-
     def __initlayout__(self):
         self._label = QtWidgets.QLabel()
         self.__label()
         self._filt = filters.FiltersGUI()
+        self._filt.filtersChanged.connect(self._preview)
         apply = QtWidgets.QPushButton("Apply filters", clicked=self._update)
 
         self.__useDask = QtWidgets.QCheckBox("Use dask for postprocess (recommended)", toggled=self._cui.useDask)
         self.__useDask.setChecked(True)
+        self.__live = QtWidgets.QCheckBox("Live preview (downsampled data is shown first)")
 
         layout = QtWidgets.QVBoxLayout()
         layout.addWidget(self._label)
         layout.addWidget(self._filt)
         layout.addWidget(self.__useDask)
+        layout.addWidget(self.__live)
         layout.addWidget(apply)
         self.setLayout(layout)
         self.adjustSize()
@@ -44,3 +47,16 @@ class PrefilterTab(QtWidgets.QWidget):
                 return
         self._dim = dim
         self.filterApplied.emit(self._filt.getFilters())
+
+    def _preview(self, filt):
+        if not self.__live.isChecked() or filt.getRelativeDimension() != self._dim:
+            return
+        self._previewId += 1
+        self._cui.applyFilter(filt, preview=True)
+        # Refine after the preview is drawn. The refinement is skipped if the filters are edited again in the meantime.
+        id = self._previewId
+        QtCore.QTimer.singleShot(100, lambda: self.__refine(filt, id))
+
+    def __refine(self, filt, id):
+        if id == self._previewId:
+            self.filterApplied.emit(filt)
@@ -1,6 +1,6 @@
 import os
 
-from lys import lysPath, resources
+from lys import lysPath, resources, serialization
 from lys.Qt import QtWidgets
 from lys.widgets import AxisSelectionLayout, FileSystemView
 from lys.decorators import avoidCircularReference
@@ -23,8 +23,7 @@ class TemplateDialog(QtWidgets.QDialog):
         default = lysPath(".lys/templates/" + str(dim) + "D/" + "Default")
         if not os.path.exists(default):
             d = resources.loadDefaultTemplate(dim)
-            with open(default, "w") as f:
-                f.write(str(d))
+            serialization.dump(d, default)
         return dir
 
     def __initlayout(self, dim, dir):
@@ -58,8 +57,7 @@ class TemplateDialog(QtWidgets.QDialog):
         self.adjustSize()
 
     def setTemplate(self, path):
-        with open(path, "r") as f:
-            d = eval(f.read())
+        d = serialization.load(path)
         self._template = d
         if self._template is None:
             self._check.enableChecks({})
@@ -97,8 +95,7 @@ class TemplateDialog(QtWidgets.QDialog):
             name = d.getName()
             dic = self._gui.saveAsDictionary(**d.getChecks())
             dic["TemplateChecks"] = d.getChecks()
-            with open(path + name, "w") as f:
-                f.write(str(dic))
+            serialization.dump(dic, path + name)
 
     def __export(self):
         file = self._view.selectedPath()
@@ -109,16 +106,11 @@ class TemplateDialog(QtWidgets.QDialog):
         if len(path) != 0:
             if not path.endswith('.tpl'):
                 path += '.tpl'
-            with open(file, "r") as f:
-                contents = f.read()
-            with open(path, "w") as f:
-                f.write(contents)
+            _copyTemplate(file, path)
 
     def __import(self):
         path, type = QtWidgets.QFileDialog.getOpenFileName(self, "Open Template", filter="Template (*.tpl);;All files (*.*)")
         if len(path) != 0:
-            with open(path, "r") as f:
-                contents = f.read()
             file = self._view.selectedPath() + "/" + os.path.basename(path)
             if os.path.exists(file):
                 msg = QtWidgets.QMessageBox(self)
@@ -129,8 +121,7 @@ class TemplateDialog(QtWidgets.QDialog):
                 ok = msg.exec_()
                 if ok == QtWidgets.QMessageBox.No:
                     return
-            with open(file, "w") as f:
-                f.write(contents)
+            _copyTemplate(path, file)
 
     def _ok(self):
         msg = QtWidgets.QMessageBox(self)
@@ -146,6 +137,11 @@ class TemplateDialog(QtWidgets.QDialog):
         self.accept()
 
 
+def _copyTemplate(src, dst):
+    """Copy template file. Templates in the old text format are converted to the binary format of :mod:`lys.serialization`."""
+    serialization.dump(serialization.load(src), dst)
+
+
 class _AddDialog(QtWidgets.QDialog):
     def __init__(self, parent, directory):
         super().__init__(parent)
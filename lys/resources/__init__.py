@@ -8,8 +8,8 @@ splash = {name: QtGui.QPixmap(os.path.dirname(__file__) + "/images/" + name + ".
 
 def loadDefaultTemplate(dim):
     if dim < 6:
-        with open(os.path.dirname(__file__) + "/DefaultTemplate.dic", "r") as f:
-            d = eval(f.read())
+        from lys import serialization
+        d = serialization.load(os.path.dirname(__file__) + "/DefaultTemplate.dic")
         return d[str(dim) + "D"]
     return None
 
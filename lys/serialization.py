@@ -0,0 +1,190 @@
+"""
+Binary serialization of settings and documents in lys (.dic, .grf, .fil, .tbl, and workspace files).
+
+Objects are saved in msgpack format with a short header. numpy arrays and bytes (such as npz of Wave) are stored as raw buffers,
+so that saving and loading scale linearly with data size. Files saved in the old text format (repr of python objects) can still be loaded.
+
+Example::
+
+    from lys import serialization
+
+    d = {"name": "wave1", "data": np.ones([100, 100]), "range": (0, 1)}
+    serialization.dump(d, "test.dic")
+    d2 = serialization.load("test.dic")
+"""
+
+import os
+import ast
+import struct
+import msgpack
+import numpy as np
+
+_HEADER = b"\x89LYS\x01"
+
+_EXT_TUPLE = 1
+_EXT_NDARRAY = 2
+_EXT_COMPLEX = 3
+_EXT_SLICE = 4
+
+
+def dumps(obj):
+    """
+    Serialize *obj* to bytes.
+
+    *obj* can be composed of None, bool, int, float, complex, str, bytes, list, tuple, dict, slice, and numpy arrays.
+
+    Args:
+        obj(any): The object to be serialized.
+
+    Returns:
+        bytes: The serialized object.
+    """
+    return _HEADER + msgpack.packb(obj, default=_encode, use_bin_type=True, strict_types=True)
+
+
+def loads(data):
+    """
+    Deserialize *data* created by :func:`dumps`.
+
+    If *data* does not start with the header of :func:`dumps`, it is interpreted as python literal in the old format.
+
+    Args:
+        data(bytes or str): The serialized object.
+
+    Returns:
+        any: The deserialized object.
+    """
+    if isinstance(data, bytes) and data.startswith(_HEADER):
+        return msgpack.unpackb(data[len(_HEADER):], ext_hook=_decode, raw=False, strict_map_key=False)
+    if isinstance(data, bytes):
+        data = data.decode("utf-8")
+    return _loadLegacy(data)
+
+
+def dump(obj, file):
+    """
+    Serialize *obj* and save it to *file*. See :func:`dumps`.
+
+    Args:
+        obj(any): The object to be saved.
+        file(str): The path to the file.
+    """
+    file = os.path.abspath(file)
+    os.makedirs(os.path.dirname(file), exist_ok=True)
+    with open(file, "wb") as f:
+        f.write(dumps(obj))
+
+
+def load(file):
+    """
+    Load object from *file* saved by :func:`dump` or in the old text format. See :func:`loads`.
+
+    Args:
+        file(str): The path to the file.
+
+    Returns:
+        any: The loaded object.
+    """
+    with open(file, "rb") as f:
+        return loads(f.read())
+
+
+def _encode(obj):
+    if isinstance(obj, tuple):
+        return msgpack.ExtType(_EXT_TUPLE, msgpack.packb(list(obj), default=_encode, use_bin_type=True, strict_types=True))
+    if isinstance(obj, dict):
+        return dict(obj)
+    if isinstance(obj, list):
+        return list(obj)
+    if isinstance(obj, str):
+        return str(obj)
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, int):
+        return int(obj)
+    if isinstance(obj, float):
+        return float(obj)
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return bytes(obj)
+    if isinstance(obj, complex):
+        return msgpack.ExtType(_EXT_COMPLEX, struct.pack("<dd", obj.real, obj.imag))
+    if isinstance(obj, slice):
+        return msgpack.ExtType(_EXT_SLICE, msgpack.packb([obj.start, obj.stop, obj.step], default=_encode, use_bin_type=True, strict_types=True))
+    if hasattr(obj, "__array__"):
+        obj = np.ascontiguousarray(obj)
+        if obj.dtype.hasobject:
+            raise TypeError("numpy array of object cannot be serialized.")
+        return msgpack.ExtType(_EXT_NDARRAY, msgpack.packb([obj.dtype.str, list(obj.shape), obj.tobytes()], use_bin_type=True))
+    raise TypeError("Object of type " + type(obj).__name__ + " cannot be serialized.")
+
+
+def _decode(code, data):
+    if code == _EXT_TUPLE:
+        return tuple(msgpack.unpackb(data, ext_hook=_decode, raw=False, strict_map_key=False))
+    if code == _EXT_NDARRAY:
+        dtype, shape, buf = msgpack.unpackb(data, raw=False)
+        return np.frombuffer(buf, dtype=dtype).reshape(shape).copy()
+    if code == _EXT_COMPLEX:
+        return complex(*struct.unpack("<dd", data))
+    if code == _EXT_SLICE:
+        return slice(*msgpack.unpackb(data, ext_hook=_decode, raw=False))
+    return msgpack.ExtType(code, data)
+
+
+_legacyNames = {"nan": np.nan, "inf": np.inf, "array": np.array, "slice": slice}
+_legacyNames.update({t: getattr(np, t) for t in ["bool_", "int8", "int16", "int32", "int64", "uint8", "uint16", "uint32", "uint64", "float16", "float32", "float64", "complex64", "complex128"]})
+_legacyCallables = set(_legacyNames) - {"nan", "inf"}
+
+
+def _loadLegacy(text):
+    """
+    Load the old text format. Python literals are parsed by ast.literal_eval.
+    Other expressions are parsed and only the names in _legacyNames (such as array(...) and nan) are allowed. The text is never executed.
+    """
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return _evalLegacy(ast.parse(text.strip(), mode="eval").body)
+
+
+def _evalLegacy(node):
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.Tuple):
+        return tuple(_evalLegacy(n) for n in node.elts)
+    if isinstance(node, ast.List):
+        return [_evalLegacy(n) for n in node.elts]
+    if isinstance(node, ast.Set):
+        return {_evalLegacy(n) for n in node.elts}
+    if isinstance(node, ast.Dict) and None not in node.keys:
+        return {_evalLegacy(k): _evalLegacy(v) for k, v in zip(node.keys, node.values)}
+    if _legacyName(node) is not None:
+        return _legacyNames[_legacyName(node)]
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+        value = _evalLegacy(node.operand)
+        if _isNumber(value):
+            return +value if isinstance(node.op, ast.UAdd) else -value
+    if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Sub)):  # complex numbers such as 1+2j
+        left, right = _evalLegacy(node.left), _evalLegacy(node.right)
+        if _isNumber(left) and _isNumber(right):
+            return left + right if isinstance(node.op, ast.Add) else left - right
+    if isinstance(node, ast.Call) and _legacyName(node.func) in _legacyCallables and all(k.arg is not None for k in node.keywords):
+        args = [_evalLegacy(n) for n in node.args]
+        kwargs = {k.arg: _evalLegacy(k.value) for k in node.keywords}
+        return _legacyNames[_legacyName(node.func)](*args, **kwargs)
+    raise ValueError("Unsupported expression in the old format: " + ast.unparse(node))
+
+
+def _legacyName(node):
+    """Returns the name in _legacyNames such as 'array' for array and np.array. None is returned for the other nodes."""
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id in ["np", "numpy"]:
+        name = node.attr
+    elif isinstance(node, ast.Name):
+        name = node.id
+    else:
+        return None
+    return name if name in _legacyNames else None
+
+
+def _isNumber(value):
+    return isinstance(value, (int, float, complex, np.number)) and not isinstance(value, bool)
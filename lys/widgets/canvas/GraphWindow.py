@@ -1,3 +1,4 @@
+from lys import serialization
 from lys.Qt import QtCore, QtWidgets
 from lys.errors import suppressLysWarnings
 from ..mdi import _ConservableWindow
@@ -89,8 +90,7 @@ class Graph(_SizeAdjustableWindow):
         return lysCanvas(lib)
 
     def __loadLibType(self, file):
-        with open(file, 'r') as f:
-            d = eval(f.read())
+        d = serialization.load(file)
         if 'Library' in d:
             return d["Library"]
         else:
@@ -141,12 +141,10 @@ class Graph(_SizeAdjustableWindow):
 
     def _save(self, file):
         d = self.canvas.SaveAsDictionary()
-        with open(file, 'w') as f:
-            f.write(str(d))
+        serialization.dump(d, file)
 
     def _load(self, file):
-        with open(file, 'r') as f:
-            d = eval(f.read())
+        d = serialization.load(file)
         self.canvas.LoadFromDictionary(d)
 
     def _prefix(self):
@@ -1,3 +1,4 @@
+import copy
 import warnings
 import numpy as np
 
@@ -9,7 +10,7 @@ from .RectAnnotation import RectAnnotation
 from .RegionAnnotation import RegionAnnotation, FreeRegionAnnotation
 from .CrossAnnotation import CrossAnnotation
 from .TextAnnotation import TextAnnotation
-from .CanvasBase import CanvasPart, saveCanvas
+from .CanvasBase import CanvasPart, saveCanvas, _loadLiteral
 
 
 class CanvasAnnotation(CanvasPart):
@@ -120,7 +121,7 @@ class CanvasAnnotation(CanvasPart):
             pos = data.getPosition()
             dic[i]['Position0'] = list(pos[0])
             dic[i]['Position1'] = list(pos[1])
-            dic[i]['Appearance'] = str(data.saveAppearance())
+            dic[i]['Appearance'] = copy.deepcopy(data.saveAppearance())
             dic[i]['Axis'] = data.getAxis()
         dictionary['annot_lines'] = dic
 
@@ -132,7 +133,7 @@ class CanvasAnnotation(CanvasPart):
                 p0 = dic[i]['Position0']
                 p1 = dic[i]['Position1']
                 p = (p0, p1)
-                appearance = eval(dic[i]['Appearance'])
+                appearance = _loadLiteral(dic[i]['Appearance'])
                 axis = self._axisDict[dic[i]['Axis']]
                 self.addLineAnnotation(p, axis, **appearance)
                 i += 1
@@ -176,7 +177,7 @@ class CanvasAnnotation(CanvasPart):
             pos = data.getPosition()
             dic[i]['Position'] = pos
             dic[i]['Type'] = data.getOrientation()
-            dic[i]['Appearance'] = str(data.saveAppearance())
+            dic[i]['Appearance'] = copy.deepcopy(data.saveAppearance())
             dic[i]['Axis'] = data.getAxis()
         dictionary['annot_infiniteLines'] = dic
 
@@ -187,7 +188,7 @@ class CanvasAnnotation(CanvasPart):
             while i in dic:
                 p = dic[i]['Position']
                 t = dic[i]['Type']
-                appearance = eval(dic[i]['Appearance'])
+                appearance = _loadLiteral(dic[i]['Appearance'])
                 axis = self._axisDict[dic[i]['Axis']]
                 self.addInfiniteLineAnnotation(p, t, axis, **appearance)
                 i += 1
@@ -231,7 +232,7 @@ class CanvasAnnotation(CanvasPart):
             dic[i]['Position'] = data.getPosition()
             dic[i]['Size'] = data.getSize()
             dic[i]['Axis'] = data.getAxis()
-            dic[i]['Appearance'] = str(data.saveAppearance())
+            dic[i]['Appearance'] = copy.deepcopy(data.saveAppearance())
         dictionary['annot_rect'] = dic
 
     def __loadRect(self, dictionary):
@@ -241,7 +242,7 @@ class CanvasAnnotation(CanvasPart):
             while i in dic:
                 p = dic[i]['Position']
                 s = dic[i]['Size']
-                appearance = eval(dic[i]['Appearance'])
+                appearance = _loadLiteral(dic[i]['Appearance'])
                 axis = self._axisDict[dic[i]['Axis']]
                 self.addRectAnnotation(p, s, axis, **appearance)
                 i += 1
@@ -285,7 +286,7 @@ class CanvasAnnotation(CanvasPart):
             dic[i]['Position'] = data.getRegion()
             dic[i]['Type'] = data.getOrientation()
             dic[i]['Axis'] = data.getAxis()
-            dic[i]['Appearance'] = str(data.saveAppearance())
+            dic[i]['Appearance'] = copy.deepcopy(data.saveAppearance())
         dictionary['annot_region'] = dic
 
     def __loadRegion(self, dictionary):
@@ -295,7 +296,7 @@ class CanvasAnnotation(CanvasPart):
             while i in dic:
                 p = dic[i]['Position']
                 t = dic[i]['Type']
-                appearance = eval(dic[i]['Appearance'])
+                appearance = _loadLiteral(dic[i]['Appearance'])
                 axis = self._axisDict[dic[i]['Axis']]
                 self.addRegionAnnotation(p, t, axis, **appearance)
                 i += 1
@@ -335,7 +336,7 @@ class CanvasAnnotation(CanvasPart):
             dic[i] = {}
             dic[i]['Position'] = data.getPosition()
             dic[i]['Axis'] = data.getAxis()
-            dic[i]['Appearance'] = str(data.saveAppearance())
+            dic[i]['Appearance'] = copy.deepcopy(data.saveAppearance())
         dictionary['annot_cross'] = dic
 
     def __loadCross(self, dictionary):
@@ -344,7 +345,7 @@ class CanvasAnnotation(CanvasPart):
             i = 0
             while i in dic:
                 p = dic[i]['Position']
-                appearance = eval(dic[i]['Appearance'])
+                appearance = _loadLiteral(dic[i]['Appearance'])
                 axis = self._axisDict[dic[i]['Axis']]
                 self.addCrossAnnotation(p, axis, **appearance)
                 i += 1
@@ -393,7 +394,7 @@ class CanvasAnnotation(CanvasPart):
             dic[i]['Position0'] = list(pos[0])
             dic[i]['Position1'] = list(pos[1])
             dic[i]['Width'] = data.getWidth()
-            dic[i]['Appearance'] = str(data.saveAppearance())
+            dic[i]['Appearance'] = copy.deepcopy(data.saveAppearance())
             dic[i]['Axis'] = data.getAxis()
         dictionary['annot_freeRegion'] = dic
 
@@ -406,7 +407,7 @@ class CanvasAnnotation(CanvasPart):
                 p1 = dic[i]['Position1']
                 p = (p0, p1)
                 w = dic[i]['Width']
-                appearance = eval(dic[i]['Appearance'])
+                appearance = _loadLiteral(dic[i]['Appearance'])
                 axis = self._axisDict[dic[i]['Axis']]
                 self.addFreeRegionAnnotation(p, w, axis, **appearance)
                 i += 1
@@ -445,7 +446,7 @@ class CanvasAnnotation(CanvasPart):
             dic[i] = {}
             dic[i]['Text'] = data.getText()
             dic[i]['Position'] = data.getPosition()
-            dic[i]['Appearance'] = str(data.saveAppearance())
+            dic[i]['Appearance'] = copy.deepcopy(data.saveAppearance())
             dic[i]['Axis'] = data.getAxis()
         dictionary['Textlist'] = dic
 
@@ -455,7 +456,7 @@ class CanvasAnnotation(CanvasPart):
             i = 0
             while i in dic:
                 t = dic[i]['Text']
-                appearance = eval(dic[i]['Appearance'])
+                appearance = _loadLiteral(dic[i]['Appearance'])
                 axis = self._axisDict[dic[i]['Axis']]
                 pos = dic[i].get('Position', 'auto')
                 self.addText(t, pos, axis=axis, **appearance)
@@ -1,10 +1,20 @@
 import functools
 import weakref
 
+from lys import serialization
 from lys.Qt import QtCore
 from lys.errors import suppressLysWarnings
 
 
+def _loadLiteral(value):
+    """
+    Values in the dictionary saved by old versions of lys are strings of python literals, which are parsed without evaluation.
+    """
+    if isinstance(value, str):
+        return serialization.loads(value)
+    return value
+
+
 def saveCanvas(func):
     """
     When methods of :class:`CanvasBase` or :class:'CanvasPart' that is decorated by *saveCanvas* is called, then *updated* signal of the canvas is emitted. 
@@ -1,3 +1,4 @@
+import copy
 import warnings
 import io
 import numpy as np
@@ -7,7 +8,7 @@ from lys import Wave, filters, load
 from lys.Qt import QtCore
 from lys.errors import NotImplementedWarning, suppressLysWarnings
 
-from .CanvasBase import CanvasPart, saveCanvas
+from .CanvasBase import CanvasPart, saveCanvas, _loadLiteral
 from .WaveData import WaveData
 from .Line import LineData
 from .Image import ImageData
@@ -197,8 +198,8 @@ class CanvasData(CanvasPart):
             data.getWave().export(b)
             dic[i]['Wave_npz'] = b.getvalue()
             dic[i]['Axis'] = data.getAxis()
-            dic[i]['Appearance'] = str(data.saveAppearance())
-            dic[i]['Offset'] = str(data.getOffset())
+            dic[i]['Appearance'] = copy.deepcopy(data.saveAppearance())
+            dic[i]['Offset'] = data.getOffset()
             dic[i]['ZOrder'] = data.getZOrder()
             dic[i]['Contour'] = isinstance(data, ContourData)
             dic[i]['Vector'] = isinstance(data, VectorData)
@@ -227,12 +228,12 @@ class CanvasData(CanvasPart):
         if 'ZOrder' in d:
             obj.setZOrder(d['ZOrder'])
         if 'Offset' in d:
-            obj.setOffset(eval(d['Offset']))
+            obj.setOffset(_loadLiteral(d['Offset']))
         filter = d.get('Filter', None)
         if filter is not None:
             obj.setFilter(filters.fromString(filter))
         if 'Appearance' in d:
-            obj.loadAppearance(eval(d['Appearance']))
+            obj.loadAppearance(_loadLiteral(d['Appearance']))
 
     def __loadWave(self, d):
         w = d['File']
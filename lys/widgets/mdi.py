@@ -4,7 +4,7 @@ import traceback
 import shutil
 from pathlib import Path
 
-from lys import home, load, lysPath
+from lys import home, load, lysPath, serialization
 from lys.Qt import QtCore, QtWidgets, QtGui
 from lys.resources import lysIcon
 from lys.decorators import avoidCircularReference
@@ -51,8 +51,7 @@ class _MdiAreaBase(QtWidgets.QMdiArea):
         # load dict to restore
         os.makedirs(self._windir, exist_ok=True)
         if os.path.exists(self._dicFile):
-            with open(self._dicFile, 'r') as f:
-                dic = eval(f.read())
+            dic = serialization.load(self._dicFile)
         else:
             dic = {}
         self._restore(dic)
@@ -63,8 +62,7 @@ class _MdiAreaBase(QtWidgets.QMdiArea):
 
     def _update(self):
         dic = self._saveAsDict()
-        with open(self._dicFile, 'w') as f:
-            f.write(str(dic))
+        serialization.dump(dic, self._dicFile)
 
     def _saveAsDict(self):
         return {"Name": self._name}
@@ -346,10 +344,7 @@ class LysSubWindow(QtWidgets.QMdiSubWindow):
         """
         data = _save(self)
         self.saved.emit(data)
-        file = os.path.abspath(file)
-        os.makedirs(os.path.dirname(file), exist_ok=True)
-        with open(file, 'w') as f:
-            f.write(str(data))
+        serialization.dump(data, file)
 
     def restoreSettings(self, file):
         """
@@ -357,8 +352,7 @@ class LysSubWindow(QtWidgets.QMdiSubWindow):
         User input on various widgets are easily exported to file by :meth:`saveSettings`.
         """
         if os.path.exists(file):
-            with open(file, 'r') as f:
-                data = eval(f.read())
+            data = serialization.load(file)
             _restore(self, data)
             self.loaded.emit(data)
 
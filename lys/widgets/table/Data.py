@@ -1,5 +1,5 @@
 import io
-from lys import Wave, load
+from lys import Wave, load, serialization
 from lys.Qt import QtCore
 
 
@@ -118,8 +118,9 @@ class TableData(QtCore.QObject):
         Save the contents of the table to file or Wave depending on the argument of :meth:`setData`.
         """
         if isinstance(self._original, Wave):
-            self._original.data = self._wave.data
-            self._original.axes = self._wave.axes
+            with self._original.batchUpdate():
+                self._original.data = self._wave.data
+                self._original.axes = self._wave.axes
         elif isinstance(self._original, str):
             self._wave.export(self._original)
         self.dataSaved.emit()
@@ -133,7 +134,7 @@ class TableData(QtCore.QObject):
         b = io.BytesIO()
         self.getData().export(b)
         d['Wave'] = b.getvalue()
-        d['Slice'] = str(self._slice)
+        d['Slice'] = self._slice
 
     def __loadTable(self, d):
         self._wave = Wave(io.BytesIO(d['Wave']))
@@ -141,5 +142,7 @@ class TableData(QtCore.QObject):
             self._original = self._wave.duplicate()
         elif d["type"] == "File":
             self._original = d["File"]
-        self._slice = eval(d["Slice"])
+        self._slice = d["Slice"]
+        if isinstance(self._slice, str):  # backward compatibility
+            self._slice = serialization.loads(self._slice)
         self.updated.emit()
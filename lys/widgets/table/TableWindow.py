@@ -1,4 +1,4 @@
-from lys import Wave, lysPath
+from lys import Wave, lysPath, serialization
 from lys.Qt import QtWidgets
 
 from ..mdi import _AutoSavedWindow
@@ -61,15 +61,13 @@ class Table(_AutoSavedWindow):
 
     def _save(self, file):
         d = self._etable.saveAsDictionary()
-        with open(file, 'w') as f:
-            f.write(str(d))
+        serialization.dump(d, file)
 
     def _savePosition(self, d):
         d['Table'] = {'Position': [self.pos().x(), self.pos().y()], 'Size': [self.size().width(), self.size().height()]}
 
     def _load(self, file):
-        with open(file, 'r') as f:
-            d = eval(f.read())
+        d = serialization.load(file)
         self._etable.loadFromDictionary(d)
 
     def _loadPosition(self, d):
@@ -22,4 +22,5 @@ setup(
     url="https://github.com/lys-devel/lys",
     license="GNU GPLv3",
     install_requires=open('requirements.txt').read().splitlines(),
+    extras_require={"zarr": ["zarr"]},
 )
@@ -4,7 +4,9 @@ import warnings
 import shutil
 
 import numpy as np
-from scipy import signal
+import dask
+import dask.array as da
+from scipy import signal, ndimage, interpolate
 
 from numpy.testing import assert_array_equal, assert_array_almost_equal
 
@@ -66,6 +68,128 @@ class Filters_test(unittest.TestCase):
         f2 = filters.fromWave(result1)
         self.assertEqual(str(f2), str(fs))
 
+    def test_FiltersGraph(self):
+        w = Wave(np.ones([8, 6, 4]), lysFilters=[{"filterName": "DummyFilter"}])
+        d = DaskWave(w, chunks=(2, 3, 4))
+        fs = filters.Filters([filters.SimpleMathFilter("+", 1), filters.SimpleMathFilter("*", 2), filters.IntegralAllFilter(axes=[2], sumtype="Sum")])
+
+        # the chain is compiled into a single graph without rechunking
+        result = fs.execute(d)
+        self.assertEqual(result.data.chunks, d.data.chunks[:2])
+        assert_array_equal(result.compute().data, np.full([8, 6], 16))
+        self.assertFalse(any(name.startswith("rechunk") for name in result.data.dask.layers))
+
+        # all steps are recorded once, and the note of the input is not changed
+        self.assertEqual([f["filterName"] for f in result.note["lysFilters"]], ["DummyFilter", "SimpleMathFilter", "SimpleMathFilter", "IntegralAllFilter"])
+        self.assertEqual(len(w.note["lysFilters"]), 1)
+        self.assertEqual(len(d.note["lysFilters"]), 1)
+
+    def test_optimize(self):
+        w = Wave(np.random.rand(50, 40) + 1j * np.random.rand(50, 40), np.linspace(0, 1, 50), np.linspace(0, 2, 40))
+        fs = filters.Filters([filters.GaussianFilter([0.05, 0.1]), filters.SimpleMathFilter("*", 2), filters.PhaseFilter(30), filters.ComplexFilter("real"), filters.SelectRegionFilter([(0.2, 0.4), (0.5, 1.0)]), filters.SelectIndexFilter(3, axis=1)])
+
+        # elementwise filters are fused, and slicing is applied before GaussianFilter
+        optimized, report = filters.optimize(fs, w)
+        self.assertTrue(any(r.startswith("Fused") for r in report))
+        self.assertTrue(any(r.startswith("Moved SelectRegionFilter before GaussianFilter") for r in report))
+        names = [type(f).__name__ for f in optimized.getFilters()]
+        self.assertEqual(names, ["SliceFilter", "GaussianFilter", "SliceFilter", "_FusedFilter"])
+
+        # the result is not changed
+        expected = w
+        for f in fs.getFilters():
+            expected = f.execute(expected)
+        result = fs.execute(w)
+        assert_array_almost_equal(result.data, expected.data)
+        assert_array_almost_equal(result.x, expected.x)
+        self.assertEqual(str(filters.fromWave(result)), str(fs))
+
+    def test_cache(self):
+        w = Wave(np.random.rand(20, 30), name="wave")
+        f1 = filters.Filters([filters.GaussianFilter([2, 2]), filters.SimpleMathFilter("*", 2), filters.SimpleMathFilter("+", 1)])
+        f2 = filters.Filters([filters.GaussianFilter([2, 2]), filters.SimpleMathFilter("*", 2), filters.SimpleMathFilter("+", 2)])
+        f3 = filters.Filters([filters.GaussianFilter([2, 2]), filters.SimpleMathFilter("*", 2), filters.SelectIndexFilter(1, axis=1)])
+        expected, expected3 = f2.execute(w), f3.execute(w)
+
+        def files():
+            return os.listdir(self.path + "/cache") if os.path.exists(self.path + "/cache") else []
+
+        filters.enableCache(path=self.path + "/cache")
+        try:
+            f1.execute(w)
+            # the result without the last filter is reused
+            self.assertEqual(len(filters.cache._cache._items), 2)
+            result = f2.execute(w)
+            self.assertEqual(len(filters.cache._cache._items), 3)
+            assert_array_almost_equal(result.data, expected.data)
+            self.assertEqual(str(filters.fromWave(result)), str(f2))
+            # results in memory are not written to disk
+            self.assertEqual(len(files()), 0)
+
+            # the result without the last filter is not cached if the last filter reduces the data
+            filters.clearCache()
+            assert_array_almost_equal(f3.execute(w).data, expected3.data)
+            self.assertEqual(len(filters.cache._cache._items), 1)
+
+            # cached data is not changed by users
+            result.data[0] = 100
+            assert_array_almost_equal(f2.execute(w).data, expected.data)
+
+            # results evicted from memory are written to disk
+            filters.clearCache()
+            filters.enableCache(memory=w.data.nbytes, path=self.path + "/cache")
+            f2.execute(w)
+            self.assertEqual(len(filters.cache._cache._items), 1)
+            self.assertEqual(len(files()), 1)
+
+            # results on disk are used after the memory is cleared
+            filters.enableCache(memory=0, path=self.path + "/cache")
+            assert_array_almost_equal(f2.execute(w).data, expected.data)
+            self.assertEqual(len(files()), 2)
+            filters.clearCache()
+            self.assertEqual(len(files()), 0)
+
+            # results larger than the memory cache are written to disk without calculation in memory
+            result = f2.execute(DaskWave(w, chunks=(10, 10)))
+            assert_array_almost_equal(result.compute().data, expected.data)
+            self.assertEqual(len(files()), 2)
+            cached = [Wave(f.path) for f in os.scandir(self.path + "/cache")]
+            self.assertTrue(all(isinstance(c.data, np.memmap) for c in cached))
+            self.assertTrue(any(np.allclose(c.data, expected.data) for c in cached))
+        finally:
+            filters.disableCache()
+
+    def test_incremental(self):
+        w = Wave(np.random.rand(40, 30, 20), name="wave")
+        f1 = filters.Filters([filters.GaussianFilter([2, 2, 2]), filters.SimpleMathFilter("*", 2), filters.SelectIndexFilter(0, axis=2)])
+        f2 = filters.Filters([filters.GaussianFilter([2, 2, 2]), filters.SimpleMathFilter("*", 2), filters.SelectIndexFilter(1, axis=2)])
+
+        ex = filters.IncrementalExecutor(w)
+        ex.execute(f1)
+        steps = list(ex._steps.values())
+        result = ex.execute(f2)
+
+        # results of unchanged filters are reused
+        self.assertEqual(len(ex._steps), 1)
+        self.assertIs(list(ex._steps.values())[0], steps[0])
+        assert_array_almost_equal(result.compute().data, f2.execute(w).data)
+        self.assertEqual(str(filters.fromWave(result)), str(f2))
+
+        # kept results are released when the filters before them are changed
+        f3 = filters.Filters([filters.GaussianFilter([1, 1, 1]), filters.SelectIndexFilter(1, axis=2)])
+        assert_array_almost_equal(ex.execute(f3).compute().data, f3.execute(w).data)
+        self.assertEqual(len(ex._steps), 1)
+        self.assertIsNot(list(ex._steps.values())[0], steps[0])
+
+        # results larger than the memory are not kept
+        ex = filters.IncrementalExecutor(w, memory=w.data.nbytes - 1)
+        assert_array_almost_equal(ex.execute(f1).compute().data, f1.execute(w).data)
+        self.assertEqual(len(ex._steps), 0)
+
+        # preview for downsampled data
+        preview = ex.preview(filters.GaussianFilter([2, 2, 2]), size=3000)
+        self.assertEqual(preview.shape, (20, 15, 10))
+
     def _check(self, f, w, data=None, x=None, y=None):
         f1 = type(f)(**f.getParameters())
         w.name = "wave"
@@ -118,6 +242,23 @@ class Filters_test(unittest.TestCase):
         f = filters.LaplacianFilter()
         self._check(f, w, data=np.gradient(np.gradient(x**2, x), x))
 
+        # chunked data
+        data = np.random.rand(20, 30)
+        x, y = np.linspace(0, 1, 20), np.linspace(0, 2, 30)**2
+        w = DaskWave(da.from_array(data, chunks=(7, 8)), x, y)
+        f = filters.GradientFilter(axes=[0, 1])  # mixed partial derivative
+        self._check(f, w, data=np.gradient(np.gradient(data, x, axis=0), y, axis=1), x=x, y=y)
+        f = filters.NablaFilter()
+        self._check(f, w, data=[np.gradient(data, x, axis=0), np.gradient(data, y, axis=1)], y=x)
+        f = filters.LaplacianFilter()
+        ans = np.gradient(np.gradient(data, x, axis=0), x, axis=0) + np.gradient(np.gradient(data, y, axis=1), y, axis=1)
+        self._check(f, w, data=ans, x=x, y=y)
+
+        # gradient along axis of length 1 is zero
+        w = Wave(np.ones([1, 4]))
+        f = filters.GradientFilter(axes=[0])
+        self._check(f, w, data=np.zeros([1, 4]))
+
     def test_freeline(self):
         w = Wave([[1, 2, 3], [2, 3, 4], [3, 4, 5]], [1, 2, 3], [1, 2, 3], name="wave")
         f = filters.FreeLineFilter(axes=[0, 1], range=[(1, 2), (3, 2)], width=1)
@@ -126,6 +267,13 @@ class Filters_test(unittest.TestCase):
         f2 = filters.FreeLineFilter(axes=[0, 1], range=[(1, 1), (3, 3)], width=1)
         self._check(f2, w, data=[1, 3, 5], x=[0, np.sqrt(2), 2 * np.sqrt(2)])
 
+        f3 = filters.FreeLineFilter(axes=[0, 1], range=[(1, 1), (3, 1), (3, 3)], width=1)
+        self._check(f3, w, data=[1, 2, 3, 4, 5], x=[0, 1, 2, 3, 4])
+
+        w = Wave(np.ones([2, 3, 3]), None, [1, 2, 3], [1, 2, 3])
+        f4 = filters.FreeLineFilter(axes=[1, 2], range=[(1, 2), (3, 2)], width=3)
+        self._check(f4, w, data=[[3, 3, 3], [3, 3, 3]])
+
     def test_freqency(self):
         # prepare data
         x = np.linspace(0, 100, 100)
@@ -154,6 +302,14 @@ class Filters_test(unittest.TestCase):
         # check original wave is not modified
         assert_array_equal(w.data, x)
 
+        # chunked integer data along several axes
+        data = np.random.randint(0, 100, size=(40, 50))
+        w = DaskWave(da.from_array(data, chunks=(15, 20)))
+        f = filters.LowPassFilter(order=3, cutoff=0.1, axes=[0, 1])
+        b, a = signal.butter(3, 0.1)
+        result = self._check(f, w, data=signal.filtfilt(b, a, signal.filtfilt(b, a, data, axis=0), axis=1))
+        self.assertEqual(result.dtype, float)
+
     def test_fft(self):
         w = Wave(np.ones([3, 3]), [0, 1, 2], [0, 1, 2])
         f = filters.FourierFilter(axes=[0, 1])
@@ -161,6 +317,16 @@ class Filters_test(unittest.TestCase):
         ans[1, 1] = 9
         self._check(f, w, data=ans, x=[-1 / 3, 0, 1 / 3])
 
+        # chunked real data
+        data = np.random.rand(4, 6, 7)
+        w = DaskWave(da.from_array(data, chunks=(2, 3, 3)))
+        for process, func in [("absolute", np.abs), ("real", np.real), ("complex", lambda x: x)]:
+            f = filters.FourierFilter(axes=[2, 1], process=process)
+            self._check(f, w, data=np.roll(func(np.fft.fftn(data, axes=(2, 1))), (3, 3), axis=(2, 1)))
+        f = filters.FourierFilter(axes=[0, 1], type="backward", process="complex", window="Hann", roll=False)
+        window = np.hanning(4)[:, np.newaxis, np.newaxis] * np.hanning(6)[np.newaxis, :, np.newaxis]
+        self._check(f, w, data=np.fft.ifftn(data * window, axes=(0, 1)))
+
     def test_integral(self):
         # IntegralAllFilter
         w = Wave(np.ones([3, 4]), [1, 2, 3], [1, 2, 3, 4])
@@ -172,7 +338,40 @@ class Filters_test(unittest.TestCase):
         f = filters.IntegralFilter([(1, 4), (2, 4), None], sumtype="Sum")
         self._check(f, w, data=[6, 6, 6, 6, 6], x=[2, 3, 4, 5, 6])
 
-        # IntegralCircleFilter TODO
+        # Median and percentile
+        data = np.random.randn(3, 40, 50)
+        data[0, 0, 0] = np.nan
+        w = Wave(data, None, None, [1, 2, 3, 4, 5] * 10)
+        ans = np.nanpercentile(data, 30, axis=(0, 1))
+        f = filters.IntegralAllFilter(axes=[0, 1], sumtype="Percentile", percentile=30)
+        self._check(f, w, data=ans, x=w.z)
+        f = filters.IntegralAllFilter(axes=[0, 1], sumtype="Median")
+        self._check(f, w, data=np.nanmedian(data, axis=(0, 1)))
+        with dask.config.set({"array.chunk-size": "1kiB"}):  # streaming reductions
+            f = filters.IntegralAllFilter(axes=[0, 1], sumtype="Percentile", percentile=30)
+            self._check(f, DaskWave(da.from_array(data, chunks=(2, 16, 16))), data=ans)
+            f = filters.IntegralAllFilter(axes=[0, 1], sumtype="Percentile", percentile=30, accuracy=1e-3)
+            result = f.execute(DaskWave(da.from_array(data, chunks=(2, 16, 16)))).compute()
+            self.assertTrue(np.all(np.abs(result.data - ans) <= 1e-3 * (np.nanmax(data) - np.nanmin(data))))
+
+        # IntegralCircleFilter
+        x = np.linspace(-1, 1, 101)
+        r = np.sqrt(x[:, np.newaxis]**2 + x[np.newaxis, :]**2)
+        w = Wave(np.array([r, 2 * r]), [0, 1], x, x)
+        w.data[:, 50, 50] = np.nan
+        f = filters.IntegralCircleFilter(center=(0, 0), radiuses=(1, 0.2), axes=(1, 2))
+        res = f.execute(w)
+        self.assertEqual(res.shape, (2, 5))
+        assert_array_almost_equal(res.y, [0.1, 0.3, 0.5, 0.7, 0.9])
+        a, b = np.arange(5) * 0.2, np.arange(1, 6) * 0.2
+        ans = 2 / 3 * (b**3 - a**3) / (b**2 - a**2)  # mean of r in annulus
+        assert_array_almost_equal(res.data, [ans, 2 * ans], decimal=2)
+
+        f = filters.IntegralCircleFilter(center=(0, 0), radiuses=(1, 0.5), axes=(1, 2), phi=4)
+        res = f.execute(Wave(np.arctan2(np.ones([2, 1, 1]) * x[np.newaxis, :], x[:, np.newaxis]), [0, 1], x, x))
+        self.assertEqual(res.shape, (2, 2, 4))
+        assert_array_almost_equal(res.z, [-135, -45, 45, 135])
+        assert_array_almost_equal(np.degrees(res.data[0, 1, 1:]), [-45, 45, 135], decimal=0)  # first bin includes the branch cut of arctan2
 
     def test_interp(self):
         # InterpFilter
@@ -182,6 +381,27 @@ class Filters_test(unittest.TestCase):
         result = self._check(f, w, x=np.linspace(0, 100, 200))
         assert_array_almost_equal(result.data, result.x**2)
 
+        # chunked data with non-uniform axis
+        x, y = np.sort(np.random.rand(30)) * 10, np.linspace(-1, 1, 20)
+        data = np.random.rand(30, 20)
+        w = DaskWave(da.from_array(data, chunks=(7, 6)), x, y)
+        x2 = np.linspace(x[0], x[-1], 45)
+        f = filters.InterpFilter(size=(0, 13), mode="linear", axes=[x2, None])
+        result = self._check(f, w, x=x2, y=np.linspace(-1, 1, 13))
+        assert_array_almost_equal(result.data, interpolate.interpn((x, y), data, np.stack(np.meshgrid(x2, result.y, indexing="ij"), axis=-1)))
+
+        # default mode is quadratic spline for one axis and cubic spline for two axes
+        x2, y2 = np.linspace(x[0], x[-1], 45), np.linspace(-1, 1, 13)
+        result = filters.InterpFilter(size=(0,), axes=[x2]).execute(Wave(data[:, 0], x))
+        assert_array_almost_equal(result.data, interpolate.make_interp_spline(x, data[:, 0], k=2)(x2))
+        result = filters.InterpFilter(size=(0, 13), axes=[x2, None]).execute(w)
+        spline = interpolate.RectBivariateSpline(x, y, data, kx=3, ky=3, s=0)
+        assert_array_almost_equal(result.data, spline(x2, y2))
+
+        # points outside the axis are NaN
+        f = filters.InterpFilter(size=(0,), mode="nearest", axes=[[-1, 1.2, 200]])
+        self._check(f, Wave([1, 2, 3], [0, 1, 2]), data=[np.nan, 2, np.nan])
+
     def test_index(self):
         # SelectIndexFilter
         w = Wave([[1, 2, 3], [4, 5, 6]], [7, 8], [9, 10, 11])
@@ -217,6 +437,16 @@ class Filters_test(unittest.TestCase):
         f = filters.ReferenceNormalizeFilter(axis=1, type="Divide", refIndex=0)
         self._check(f, w, data=np.ones([5, 5]))
 
+        # ReferenceNormalizeFilter with reference region and running reference
+        data = np.random.rand(6, 8) + 1
+        w2 = DaskWave(da.from_array(data, chunks=(4, 3)))
+        f = filters.ReferenceNormalizeFilter(axis=1, type="Divide", refIndex=-1)
+        self._check(f, w2, data=data / data[:, -1:])
+        f = filters.ReferenceNormalizeFilter(axis=1, type="Diff", refIndex=(2, 5))
+        self._check(f, w2, data=data - data[:, 2:5].mean(axis=1, keepdims=True))
+        f = filters.ReferenceNormalizeFilter(axis=1, type="Divide", refIndex=0, window=3)
+        self._check(f, w2, data=data / ndimage.uniform_filter1d(data, 3, axis=1, mode="nearest"))
+
         # SelectRegionFilter
         w = Wave(np.ones([5, 5]), [1, 2, 3, 4, 5], [1, 2, 3, 4, 5])
         f = filters.SelectRegionFilter(range=[(2, 4), (1, 4)])
@@ -227,6 +457,13 @@ class Filters_test(unittest.TestCase):
         w = Wave(np.ones([6, 6]), [0, 1, 2, 3, 4, 5], [0, 1, 2, 3, 4, 5])
         f = filters.ReduceSizeFilter(kernel=(2, 2))
         self._check(f, w, data=np.ones([3, 3]), x=[0, 2, 4])
+        w = DaskWave(da.from_array(np.arange(10.), chunks=3), np.arange(10))
+        f = filters.ReduceSizeFilter(kernel=(4,), sumtype="Sum")
+        self._check(f, w, data=[6, 22], x=[0, 4])
+        f = filters.ReduceSizeFilter(kernel=(4,), sumtype="Sum", edge="pad")
+        self._check(f, w, data=[6, 22, 17], x=[0, 4, 8])
+        f = filters.ReduceSizeFilter(kernel=(4,), sumtype="Mean", edge="partial")
+        self._check(f, w, data=[1.5, 5.5, 8.5], x=[0, 4, 8])
 
         # PaddingFilter
         w = Wave([1, 2, 3], [0, 1, 2])
@@ -277,6 +514,14 @@ class Filters_test(unittest.TestCase):
         result = self._check(f, w)
         assert_array_almost_equal(result.data, result.data.T)
 
+        # chunked data
+        data = np.random.rand(20, 20, 3)
+        w = DaskWave(da.from_array(data, chunks=(7, 6, 2)))
+        f = filters.ShiftFilter(shift=[1.5, -2.2, 0])
+        self._check(f, w, data=ndimage.shift(data, [1.5, -2.2, 0], order=1, cval=0))
+        f = filters.MirrorFilter(positions=[(0, 0), (1, 1)], sum=False)
+        self._check(f, w, data=data.transpose(1, 0, 2))
+
     def test_math(self):
         # simple math
         w = Wave([1, 2, 3], [1, 2, 3])
@@ -328,6 +573,15 @@ class Filters_test(unittest.TestCase):
         f = filters.GaussianFilter(kernel=[0.5])
         self._check(f, w, data=[1, 2, 2], x=[1, 2, 3])
 
+        # chunked data is processed with overlap
+        data = np.random.rand(20, 30)
+        w = DaskWave(da.from_array(data, chunks=(7, 8)))
+        for f, ans in [(filters.MedianFilter(kernel=[3, 5]), ndimage.median_filter(data, size=[3, 5])),
+                       (filters.GaussianFilter(kernel=[3, 3]), ndimage.gaussian_filter(data, 3 / (2 * np.sqrt(2 * np.log(2))))),
+                       (filters.SobelFilter(axes=[0, 1]), ndimage.sobel(data, 0) + ndimage.sobel(data, 1))]:
+            result = self._check(f, w, data=ans)
+            self.assertEqual(result.data.chunks, w.data.chunks)
+
     def test_axis(self):
         # SetAxisFilter
         w = Wave([1, 2, 3], [1, 2, 3])
@@ -51,6 +51,11 @@ class Graph_test(unittest.TestCase):
 
             self.__lineStyles(line)
 
+            d = {}
+            c.SaveAsDictionary(d)
+            c.LoadFromDictionary(d)
+            self.assertEqual(c.getLineAnnotations()[-1].getLineColor(), '#ff0000')
+
     def test_InfiniteLineAnnotation(self):
         for g in self.graphs:
             c = g.canvas
@@ -63,6 +63,22 @@ class Graph_test(unittest.TestCase):
             #self.assertEqual(len(c.getContours()), 1)
             self.assertEqual(len(c.getRGBs()), 1)
 
+            # appearance and offset are saved as structured values
+            c.getLines()[0].setOffset((1, 2, 3, 4))
+            c.getLines()[0].setColor('#ff0000')
+            c.SaveAsDictionary(d)
+            self.assertEqual(d['Datalist'][0]['Offset'], (1, 2, 3, 4))
+            c.LoadFromDictionary(d)
+            self.assertEqual(c.getLines()[0].getOffset(), (1, 2, 3, 4))
+            self.assertEqual(c.getLines()[0].getColor(), '#ff0000')
+
+            # dictionary saved by old versions is parsed without evaluation
+            d['Datalist'][0]['Offset'] = "(0, 0, 2, 2)"
+            d['Datalist'][0]['Appearance'] = str(d['Datalist'][0]['Appearance'])
+            c.LoadFromDictionary(d)
+            self.assertEqual(c.getLines()[0].getOffset(), (0, 0, 2, 2))
+            self.assertEqual(c.getLines()[0].getColor(), '#ff0000')
+
             c.Clear()
             self.assertEqual(len(c.getWaveData()), 0)
 
@@ -98,6 +98,29 @@ class mcut_test(unittest.TestCase):
         fline.setWidth(2)
         assert_array_almost_equal(w2.getFilteredWave().data, np.ones((101, 21)) * 20)
 
+    def test_template(self):
+        from lys import resources, serialization
+        from lys.mcut.MultiCutGUIs.Template import _copyTemplate
+        path = home() + "/.lys/test_template"
+        os.makedirs(path, exist_ok=True)
+        d = resources.loadDefaultTemplate(3)
+        d["TemplateChecks"] = {"useGrid": True, "useRange": False}
+
+        # export and import of binary template
+        serialization.dump(d, path + "/template1")
+        _copyTemplate(path + "/template1", path + "/template1.tpl")
+        _copyTemplate(path + "/template1.tpl", path + "/template2")
+        self.assertEqual(serialization.load(path + "/template2"), d)
+
+        # template in the old text format is converted
+        with open(path + "/old.tpl", "w") as f:
+            f.write(str({"TemplateChecks": {"useGrid": False}, "range": (0, 1)}))
+        _copyTemplate(path + "/old.tpl", path + "/template3")
+        with open(path + "/template3", "rb") as f:
+            self.assertEqual(f.read(4), b"\x89LYS")
+        self.assertEqual(serialization.load(path + "/template3"), {"TemplateChecks": {"useGrid": False}, "range": (0, 1)})
+        shutil.rmtree(path)
+
     def test_memory(self):
         cui = MultiCutCUI(np.ones((100, 100, 100)))
         self.assertEqual(sys.getrefcount(cui), 2)
@@ -32,6 +32,11 @@ class Graph_test(unittest.TestCase):
         t2.loadFromDictionary(d)
         assert_array_equal(t.getData().data, t2.getData().data)
 
+        # edit cell of loaded table
+        model = t2._model
+        model.setData(model.index(3, 0), "5")
+        self.assertEqual(t2.getData().data[3], 5)
+
     def test_Data(self):
         t = lysTable()
 
@@ -90,6 +95,12 @@ class Graph_test(unittest.TestCase):
         t.save()
         self.assertEqual(w.data[0], 1)
 
+        # edit cell and save
+        t._model.setData(t._model.index(1, 0), "3")
+        self.assertEqual(d.data[1], 3)
+        t.save()
+        self.assertEqual(w.data[1], 3)
+
         # file
         w = Wave(np.random.rand(100))
         w.export(self.path + "/table.npz")
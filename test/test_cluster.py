@@ -0,0 +1,50 @@
+import unittest
+import shutil
+
+import numpy as np
+import dask
+
+from lys import cluster, filters, DaskWave
+
+
+class cluster_test(unittest.TestCase):
+    path = "test/Cluster"
+
+    def tearDown(self):
+        cluster.stop()
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def test_cluster(self):
+        self.assertFalse(cluster.isRunning())
+        self.assertIsNone(cluster.status())
+        with self.assertRaises(RuntimeError):
+            cluster.resize(2)
+
+        # start
+        client = cluster.start(n_workers=1, processes=False, memory_limit="1GB", directory=self.path, target=0.5)
+        self.assertEqual(dask.config.get("distributed.worker.memory.target"), 0.5)
+        self.assertTrue(cluster.isRunning())
+        self.assertEqual(cluster.status()["workers"], 1)
+        self.assertEqual(cluster.status()["memory_limit"], 10**9)
+        self.assertIs(DaskWave.client, client)
+        with self.assertRaises(AttributeError):
+            DaskWave(np.ones(3)).client = None
+
+        # filters are calculated by the cluster
+        w = DaskWave(np.ones([20, 20]), chunks=(10, 10))
+        result = filters.SimpleMathFilter("+", 1).execute(w).compute()
+        self.assertTrue((result.data == 2).all())
+
+        # resize and adaptive scaling
+        cluster.resize(2)
+        client.wait_for_workers(2)
+        self.assertEqual(cluster.status()["workers"], 2)
+        cluster.adapt(minimum=1, maximum=2)
+        self.assertTrue(cluster.status()["adaptive"])
+        cluster.resize(1)
+        self.assertFalse(cluster.isAdaptive())
+
+        # stop
+        cluster.stop()
+        self.assertFalse(cluster.isRunning())
+        self.assertIsNone(DaskWave.client)
@@ -1,4 +1,6 @@
 import unittest
+import importlib
+import timeit
 import os
 import io
 import shutil
@@ -6,7 +8,9 @@ import _pickle as cPickle
 import numpy as np
 import dask.array as da
 
-from lys.core import SettingDict, Wave, DaskWave
+from lys.Qt import QtCore
+from lys import serialization
+from lys.core import SettingDict, Wave, DaskWave, LinearAxis
 from numpy.testing import assert_array_equal, assert_array_almost_equal
 
 
@@ -33,6 +37,32 @@ class core_test(unittest.TestCase):
         d3 = SettingDict(self.path + "/test.dic")
         self.assertEqual(d3["test1"], "test2")
 
+        # old text format can be loaded
+        with open(self.path + "/old.dic", "w") as f:
+            f.write(str({"test1": (1, 2), "test2": b"bytes"}))
+        d4 = SettingDict(self.path + "/old.dic")
+        self.assertEqual(d4["test1"], (1, 2))
+        self.assertEqual(d4["test2"], b"bytes")
+
+    def test_serialization(self):
+        obj = {"tuple": (1, 2.5, None), 1: [True, "str", b"\x00"], "complex": 1 + 2j, "slice": [slice(None, 3), 0], "array": np.arange(6).reshape(2, 3), "scalar": np.float32(1.5)}
+        res = serialization.loads(serialization.dumps(obj))
+        assert_array_equal(res.pop("array"), obj.pop("array"))
+        self.assertEqual(res, obj)
+        self.assertEqual(serialization.loads(str(obj)), obj)
+        with self.assertRaises(TypeError):
+            serialization.dumps({"func": print})
+
+        # old text format is parsed without executing it
+        old = "{'a': array([1., nan]), 'b': np.float32(1.5), 'c': slice(None, 3, None), 'd': -inf, 'e': 1-2j, 'f': array([1, 2], dtype=int16)}"
+        res = serialization.loads(old)
+        assert_array_equal(res["a"], [1, np.nan])
+        self.assertEqual((res["b"], res["c"], res["d"], res["e"]), (1.5, slice(None, 3), -np.inf, 1 - 2j))
+        self.assertEqual(res["f"].dtype, np.int16)
+        for code in ["__import__('os').system('echo')", "().__class__.__base__.__subclasses__()", "array.__globals__", "open('x')", "[x for x in ()]", "nan()"]:
+            with self.assertRaises(ValueError):
+                serialization.loads(code)
+
     def test_WaveAxes(self):
         # without specifing axes
         noaxes = Wave([[1, 2], [3, 4]])
@@ -62,6 +92,10 @@ class core_test(unittest.TestCase):
         self.assertTrue(w.posToPoint((2, 4)) == (1, 1))
         self.assertTrue(w.posToPoint((1, 2, 3), axis=0) == (0, 1, 2))
         self.assertTrue(w.posToPoint(2, axis=0) == 1)
+        for x in [np.linspace(0, 1, 11), np.linspace(1, 0, 11), np.sort(np.random.rand(11)), np.random.rand(11)]:
+            w = Wave(np.ones(11), x)
+            pos = np.concatenate([np.random.uniform(-1, 2, 100), (x[1:] + x[:-1]) / 2])
+            assert_array_equal(w.posToPoint(pos, axis=0), [np.abs(x - p).argmin() for p in pos])
 
         # pointToPos method
         w = Wave(np.ones([3, 2]), [1, 2, 3], [3, 4, 5])
@@ -69,6 +103,30 @@ class core_test(unittest.TestCase):
         self.assertTrue(w.pointToPos((0, 1, 2), axis=0) == (1, 2, 3))
         self.assertTrue(w.pointToPos(1, axis=0) == 2)
 
+        # default axes are LinearAxis
+        w = Wave(np.ones([4, 3]), LinearAxis(1, 0.5, 4))
+        self.assertTrue(isinstance(w.y, LinearAxis))
+        assert_array_equal(w.x, [1, 1.5, 2, 2.5])
+        self.assertEqual(repr(w.x[1::2]), "LinearAxis(start=1.5, step=1.0, n=2)")
+        self.assertEqual(w.x[-1], 2.5)
+        assert_array_equal(w.x[[0, -1]], [1, 2.5])
+        assert_array_equal(w.x * 2, [2, 3, 4, 5])
+        self.assertTrue(isinstance(w[1:3].x, LinearAxis))
+        self.assertEqual(w.posToPoint(1.8, axis=0), 2)
+        with self.assertRaises(ValueError):
+            w.x[0] = 1
+        self.assertFalse(w.x.flags.writeable)
+        assert_array_equal(np.stack(Wave(np.ones([2, 2]), LinearAxis(1, 0.5, 2)).axes), [[1, 1.5], [0, 1]])
+        assert_array_equal(np.concatenate(w.axes), [1, 1.5, 2, 2.5, 0, 1, 2])
+        b = io.BytesIO()
+        w.export(b)
+        self.assertEqual(repr(Wave(b).x), repr(w.x))
+
+        # LinearAxis is saved without pickling lys classes
+        b.seek(0)
+        with np.load(b, allow_pickle=False) as f:
+            assert_array_equal(f["linearAxes"], [[1, 0.5, 4], [0, 1, 3]])
+
     def test_WaveNote(self):
         w = Wave([1, 2, 3], name="wave1", key1="item1")
         self.assertEqual(w.note["key1"], "item1")
@@ -86,6 +144,29 @@ class core_test(unittest.TestCase):
         self.assertTrue((w2.axes[0] == [4, 5]).all())
         self.assertTrue((w2.axes[1] == [0, 1, 2]).all())
 
+        # QObject is created only when modified signal is used
+        w = Wave([1, 2, 3])
+        self.assertFalse(isinstance(w, QtCore.QObject))
+        self.assertIsNone(w._signals)
+        w.data = [2, 3, 4]
+        self.assertIsNone(w._signals)
+        with self.assertRaises(AttributeError):
+            w.unknown
+
+        # arbitrary attributes and QObject methods
+        w.foo = 1
+        self.assertEqual(w.foo, 1)
+        self.assertIsNone(w._signals)
+        w.setObjectName("wave1")
+        self.assertEqual(w.objectName(), "wave1")
+        self.b = 0
+        w.modified.connect(lambda w: setattr(self, "b", self.b + 1))
+        w.blockSignals(True)
+        w.update()
+        w.blockSignals(False)
+        w.update()
+        self.assertEqual(self.b, 1)
+
         # modification
         self.b = 0
 
@@ -100,6 +181,28 @@ class core_test(unittest.TestCase):
         w.update()
         self.assertEqual(self.b, 3)
 
+        # batch update emits modified once
+        with w.batchUpdate():
+            w.data = [3, 4]
+            w.x = [1, 2]
+            with w.batchUpdate():
+                w[0] = 5
+            self.assertEqual(self.b, 3)
+        self.assertEqual(self.b, 4)
+        with w.batchUpdate():
+            pass
+        self.assertEqual(self.b, 4)
+
+        # rate-limited update
+        w.setUpdateInterval(10)
+        for i in range(5):
+            w[1] = i
+        self.assertEqual(self.b, 4)
+        loop = QtCore.QEventLoop()
+        QtCore.QTimer.singleShot(100, loop.quit)
+        loop.exec_()
+        self.assertEqual(self.b, 5)
+
         # check save &" load
         path = self.path + "/wave1.npz"
         path2 = self.path + "/wave2.npz"
@@ -128,6 +231,31 @@ class core_test(unittest.TestCase):
         w2 = Wave.importFrom(txt)
         self.assertTrue((w.data == w2.data).all())
 
+        # multi-dimensional text is written slice by slice with progress
+        progress = []
+        w5 = Wave(np.random.rand(2, 3, 4))
+        w5.export(csv, type="csv", progress=progress.append)
+        self.assertEqual(progress[-1], 1)
+        w2 = Wave.importFrom(csv, dtype=float, progress=progress.append)
+        assert_array_equal(w5.data, w2.data)
+        w5 = Wave(np.arange(6).reshape(2, 3) * (1 + 1j))
+        w5.export(txt, type="txt")
+        assert_array_equal(w5.data, Wave.importFrom(txt, dtype=complex).data)
+        open(txt, "w").close()
+        self.assertEqual(Wave.importFrom(txt).data.shape, (0,))
+
+        # uncompressed npz is memory-mapped
+        w.export(path2, type="npz_uncompressed")
+        w2 = Wave(path2)
+        self.assertTrue(isinstance(w2.data, np.memmap))
+        assert_array_equal(w.data, w2.data)
+        assert_array_equal(w.x, w2.x)
+        self.assertEqual(w.name, w2.name)
+        w2[0, 0] = 2
+        self.assertFalse(isinstance(w2.data, np.memmap))
+        w2.export(path2, type="npz_uncompressed")
+        assert_array_equal(Wave(path2).data, w2.data)
+
         w3 = Wave([1, 2, 3])
         w3.x = [2, 3, 4]
         w3.export(path2)
@@ -142,6 +270,35 @@ class core_test(unittest.TestCase):
         self.assertTrue((w.axes[1] == w2.axes[1]).all())
         self.assertTrue(w.name == w2.name)
 
+        # both waves remain writable after duplicate
+        w = Wave([1, 2, 3], name="wave1")
+        w2 = w.duplicate()
+        w.data[1] = 5
+        w.data *= 2
+        w2.data[0] = 0
+        assert_array_equal(w.data, [2, 10, 6])
+        assert_array_equal(w2.data, [0, 2, 3])
+
+        # read-only data is shared and copied on write
+        arr = np.array([1, 2, 3])
+        arr.flags.writeable = False
+        w = Wave(arr, copy=False)
+        w2 = w.duplicate()
+        self.assertTrue(np.shares_memory(w.data, w2.data))
+        w2[0] = 0
+        assert_array_equal(w.data, [1, 2, 3])
+        assert_array_equal(w2.data, [0, 2, 3])
+
+        # copy policy
+        arr = np.array([1, 2, 3])
+        self.assertFalse(np.shares_memory(Wave(arr).data, arr))
+        self.assertTrue(np.shares_memory(Wave(arr, copy=False).data, arr))
+        w = Wave()
+        w.setData(arr, copy=False)
+        self.assertTrue(np.shares_memory(w.data, arr))
+        w.data = arr
+        self.assertFalse(np.shares_memory(w.data, arr))
+
         # pickle
         w = Wave([1, 2, 3], None, name="name")
         data = cPickle.dumps(w)
@@ -208,3 +365,49 @@ class core_test(unittest.TestCase):
         # duplicate
         dw = dw.duplicate()
         self.assertTrue((dw.compute().data == [7, 8, 9]).all())
+
+        # pickle
+        dw = cPickle.loads(cPickle.dumps(DaskWave(w)))
+        assert_array_equal(dw.compute().data, [1, 2, 3])
+        self.assertEqual(dw.name, "wave1")
+        with self.assertRaises(AttributeError):
+            dw.unknown
+        dw.foo = 1
+        self.assertEqual(dw.foo, 1)
+
+    def test_attributeDispatch(self):
+        # micro-benchmark: members of data, axes, and note should be accessed as fast as w.data.shape
+        w = Wave(np.ones(3), name="wave1")
+        dw = DaskWave(w)
+        direct = min(timeit.repeat("w.data.shape", globals=locals(), number=10000, repeat=5))
+        for expr in ["w.shape", "w.x", "w.name", "dw.shape", "dw.x", "dw.name"]:
+            t = min(timeit.repeat(expr, globals=locals(), number=10000, repeat=5))
+            self.assertLess(t, direct * 4, expr)
+
+        # delegation keeps the priority of data, axes, and note
+        self.assertEqual(w.name, "wave1")
+        w.name = "wave2"
+        self.assertEqual(w.note["name"], "wave2")
+        self.assertEqual(dw.name, "wave1")
+        self.assertTrue(isinstance(w.copy(), np.ndarray))
+
+    @unittest.skipIf(importlib.util.find_spec("zarr") is None, "zarr is not installed")
+    def test_DaskWave_store(self):
+        path = self.path + "/wave.zarr"
+        dw = DaskWave(np.random.rand(6, 5, 4), [1, 2, 3, 4, 5, 6], None, [1, 3, 5, 7], chunks=(2, 5, 4), name="wave1")
+        dw.save(path)
+
+        dw2 = DaskWave.open(path)
+        self.assertEqual(dw2.data.chunks, dw.data.chunks)
+        assert_array_equal(dw2.compute().data, dw.compute().data)
+        assert_array_equal(dw2.x, dw.x)
+        assert_array_equal(dw2.z, dw.z)
+        self.assertEqual(dw2.name, "wave1")
+
+        # irregular chunks and non-json note
+        dw = DaskWave(da.from_array(np.ones([5, 5]), chunks=((2, 3), (5,))), key=slice(1, 2))
+        dw.save(path, chunks=(3, 3))
+        dw2 = DaskWave.open(path)
+        self.assertEqual(dw2.data.chunks, ((3, 2), (3, 2)))
+        assert_array_equal(dw2.compute().data, np.ones([5, 5]))
+        self.assertEqual(dw2.note["key"], slice(1, 2))